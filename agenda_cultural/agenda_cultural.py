@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 from rxconfig import config
 
 from .backend.models import Movie
+from .backend.services.tmdb_service import keep_image_config_fresh
 from .frontend.pages import about, home
 
 # Carga variables de entorno para saber si está en producción o local
@@ -46,3 +47,6 @@ app = rx.App(
     style=BASE_STYLE,
     head_components=head_comps,
 )
+
+# Los tamaños de póster de TMDB se refrescan en segundo plano, no al cargar una página
+app.register_lifespan_task(keep_image_config_fresh)
@@ -18,7 +18,10 @@ load_dotenv()
 
 # Configuración TMDB
 TMDB_BASE_URL: str = "https://api.themoviedb.org/3"
-TMDB_IMAGE_BASE_URL: str = "https://image.tmdb.org/t/p/w342"
+# Base de imágenes y tamaño por defecto del póster. Los tamaños disponibles se
+# leen de /configuration (ver `tmdb_service.get_image_config`)
+TMDB_IMAGE_BASE_URL: str = "https://image.tmdb.org/t/p/"
+TMDB_POSTER_SIZE: str = "w342"
 
 # Evaluamos si hay token
 _token = os.getenv("TMDB_TOKEN")
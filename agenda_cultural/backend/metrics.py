@@ -0,0 +1,69 @@
+"""
+Métricas de ejecución del pipeline de scraping.
+
+Registro en memoria de contadores simples (lanzamientos de navegador, contextos
+abiertos, etc.) que los distintos componentes incrementan durante una corrida, y
+de mediciones individuales (la latencia de cada consulta) de las que se leen
+percentiles. El orquestador los reinicia al comenzar y publica el resumen en el
+log al terminar.
+"""
+
+import math
+from collections import Counter, defaultdict
+
+_counters: Counter[str] = Counter()
+_samples: defaultdict[str, list[float]] = defaultdict(list)
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Suma `value` al contador `name` (lo crea si no existe)."""
+    _counters[name] += value
+
+
+def get(name: str) -> int:
+    """Devuelve el valor actual del contador `name` (0 si nunca se incrementó)."""
+    return _counters[name]
+
+
+def observe(name: str, value: float) -> None:
+    """Registra una medición individual de `name` (p. ej. la latencia de una consulta)."""
+    _samples[name].append(value)
+
+
+def samples(name: str) -> list[float]:
+    """Copia de las mediciones de `name`, en el orden en que se registraron."""
+    return list(_samples.get(name, []))
+
+
+def percentile(name: str, q: float) -> float | None:
+    """
+    Percentil `q` (0-100) de las mediciones de `name`, por rango más cercano,
+    o None si no hay ninguna.
+    """
+    values = sorted(_samples.get(name, []))
+    if not values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+def snapshot() -> dict[str, int]:
+    """Devuelve una copia ordenada de todos los contadores de la corrida."""
+    return dict(sorted(_counters.items()))
+
+
+def reset() -> None:
+    """Reinicia contadores y mediciones. Se llama al inicio de cada corrida."""
+    _counters.clear()
+    _samples.clear()
+
+
+def format_summary() -> str:
+    """Representación en una línea de los contadores, pensada para el log."""
+    if not _counters and not _samples:
+        return "sin métricas registradas"
+    parts = [f"{name}={value}" for name, value in snapshot().items()]
+    for name in sorted(_samples):
+        parts.append(f"{name}.p50={percentile(name, 50):.0f}")
+        parts.append(f"{name}.p95={percentile(name, 95):.0f}")
+    return ", ".join(parts)
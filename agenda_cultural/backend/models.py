@@ -9,7 +9,7 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 import reflex as rx
-from sqlmodel import Field
+from sqlmodel import Field, Index, UniqueConstraint
 
 
 def get_peruvian_time():
@@ -24,8 +24,25 @@ def get_peruvian_time():
 class Movie(rx.Model, table=True):  # ty: ignore[unsupported-base]
     """
     Representa una película en cartelera dentro de la base de datos.
+
+    La firma (centro, título, fecha) es única: una misma función no puede
+    guardarse dos veces, aunque dos corridas se solapen. Los índices por fecha
+    y por (centro, fecha) permiten que la limpieza, la cartelera y las funciones
+    conocidas de cada centro lean solo el rango de fechas que les toca.
+
+    En Postgres la tabla está particionada por mes de `date` (migración
+    `e4b7d91a2c6f`) y su PK es (id, date). Aquí el PK sigue siendo solo `id`:
+    SQLite solo autoincrementa una PK entera simple, y `id` sigue siendo único
+    (sale de `movie_id_seq`). Alembic no compara PKs y alembic/env.py excluye
+    las tablas de cada mes del autogenerate; ver `services.movie_partitions`.
     """
 
+    __table_args__ = (
+        UniqueConstraint("center", "title", "date", name="uq_movie_signature"),
+        Index("ix_movie_date", "date"),
+        Index("ix_movie_center_date", "center", "date"),
+    )
+
     # --- Campos Obligatorios ---
     # Título limpio de la película
     title: str
@@ -43,6 +60,9 @@ class Movie(rx.Model, table=True):  # ty: ignore[unsupported-base]
     # Dirección URL del póster de la película
     poster_url: str | None = None
 
+    # Ruta del póster en TMDB (ej: "/abc.jpg"), para armar el srcset por tamaños
+    poster_path: str | None = None
+
     # URL original del evento
     source_url: str | None = None
 
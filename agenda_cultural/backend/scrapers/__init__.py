@@ -1,11 +1,22 @@
-# from .alianza_francesa import get_af_movies
-from .bnp import get_bnp_movies
-from .ccpucp import get_ccpucp_movies
-from .lum import get_lum_movies
+# from .alianza_francesa import af_scraper
+from .base_scraper import ScraperInterface
+from .bnp import bnp_scraper
+from .browser_pool import BrowserPool
+from .ccpucp import ccpucp_scraper
+from .http_engine import HttpFetcher, ScraperEngine
+from .lum import lum_scraper
 
-all_scrapers: list = [
-    # get_af_movies,
-    get_bnp_movies,
-    get_ccpucp_movies,
-    get_lum_movies,
+all_scrapers: list[ScraperInterface] = [
+    # af_scraper,
+    bnp_scraper,
+    ccpucp_scraper,
+    lum_scraper,
+]
+
+__all__ = [
+    "BrowserPool",
+    "HttpFetcher",
+    "ScraperEngine",
+    "ScraperInterface",
+    "all_scrapers",
 ]
@@ -1,5 +1,6 @@
 from .scraper import AlianzaFrancesaScraper
 
-get_af_movies = AlianzaFrancesaScraper().get_movies
+af_scraper = AlianzaFrancesaScraper()
+get_af_movies = af_scraper.get_movies
 
-__all__ = ["get_af_movies"]
+__all__ = ["af_scraper", "get_af_movies"]
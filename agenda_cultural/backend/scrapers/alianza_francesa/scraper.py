@@ -1,24 +1,78 @@
+"""
+Módulo de Scraping para la Alianza Francesa de Lima.
+
+TARGET URL: https://aflima.org.pe/eventos/?post_type=evento&categoria[]=cine
+
+ESTRATEGIA DE NAVEGACIÓN:
+1. En la agenda de cine se buscan las secciones con "Ingreso libre".
+2. Se entra a cada sección y se vuelve al listado tras extraer sus funciones.
+
+ESTRATEGIA DE EXTRACCIÓN (PARSING):
+Cada función es una caja `.cajas_cont_item` con el título y dos bloques
+`.cajas__info_fecha2` (fecha y sede). En lugar de pedir cada dato al navegador
+por separado (varios viajes por película a través del driver de Playwright),
+todo el listado se serializa en una sola llamada `eval_on_selector_all` que
+devuelve una lista de registros planos. El parseo de fechas y sedes se hace
+después, en Python, sobre esa lista.
+"""
+
 import re
-from typing import override, ClassVar
-from playwright.async_api import async_playwright, Page
-from playwright.async_api import Locator
 from datetime import datetime
+from typing import ClassVar, Pattern, TypedDict, override
+
+from playwright.async_api import Locator, Page
 
+from agenda_cultural.backend.log_config import get_task_logger
 from agenda_cultural.backend.models import Movie
 from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
-from agenda_cultural.backend.services.tmdb_service import get_movie_poster
+from agenda_cultural.backend.scrapers.browser_pool import BrowserPool
+from agenda_cultural.backend.scrapers.http_engine import HttpFetcher
+
+logger = get_task_logger("alianza_francesa_scraper", "scraping.log")
+
+
+class ListingRecord(TypedDict):
+    """Registro plano de una caja del listado, tal como lo devuelve el navegador."""
+
+    title: str | None
+    info: list[str]
 
 
 class AlianzaFrancesaScraper(ScraperInterface):
+    CENTER_SLUG: ClassVar[str] = "alianza_francesa"
     START_URL: ClassVar[str] = (
         "https://aflima.org.pe/eventos/?post_type=evento&categoria[]=cine"
     )
+    DEFAULT_LOCATION: ClassVar[str] = "Alianza Francesa"
+
+    MOVIE_BOX: ClassVar[str] = ".cajas_cont_item"
+
+    # Serializa todas las cajas del listado en una sola llamada al navegador
+    LISTING_JS: ClassVar[str] = """
+        boxes => boxes.map(box => ({
+            title: box.querySelector(".cajas_cont_item_fecha .cajas__fecha_txt")
+                ?.textContent ?? null,
+            info: Array.from(
+                box.querySelectorAll(".cajas_cont_item_info .cajas__info_fecha2")
+            ).map(block => block.textContent ?? ""),
+        }))
+    """
+
+    # Explicación del regex:
+    # \(([^,]+)   -> Grupo 1: Busca paréntesis y captura todo hasta la coma (Avenida)
+    # ,\s*        -> Busca una coma y espacios opcionales (los ignora)
+    # ([^)]+)     -> Grupo 2: Captura todo lo que no sea paréntesis de cierre (Distrito)
+    LOCATION_PATTERN: ClassVar[Pattern[str]] = re.compile(r"\(([^,]+),\s*([^)]+)\)")
 
     @override
-    async def get_movies(self) -> list[Movie]:
-        async with async_playwright() as p:
-            browser, page = await self.setup_browser_and_open_page(p)
-
+    async def get_movies(
+        self,
+        browser_pool: BrowserPool | None = None,
+        http_fetcher: HttpFetcher | None = None,
+    ) -> list[Movie]:
+        movies_info: list[Movie] = []
+
+        async with self.setup_browser_and_open_page(browser_pool) as page:
             try:
                 _ = await page.goto(self.START_URL, wait_until="domcontentloaded")
 
@@ -26,83 +80,74 @@ class AlianzaFrancesaScraper(ScraperInterface):
                 free_movies = page.locator(".ctbtn", has_text="Ingreso libre")
                 cine_locators = await free_movies.count()
 
-                movies_info: list[Movie] = []
-
                 for locator in range(cine_locators):
                     await self._enter_movie_page(locator, page, free_movies)
 
-                    movies = await page.locator(".cajas_cont_item").count()
-
-                    for movie in range(movies):
-                        if movie_info := await self._get_movies_info(movie, page):
+                    for record in await self._extract_listing_records(page):
+                        if movie_info := self._build_movie_from_record(
+                            record, page.url
+                        ):
                             movies_info.append(movie_info)
+                            self.collect_partial(movie_info)
 
                     _ = await page.go_back(wait_until="domcontentloaded")
 
-                return self._order_movies(movies_info)
-
             except Exception as e:
-                print(e)
-                return []
+                self.record_failure()
+                logger.error(f"Error en Alianza Francesa Scraper: {e}", exc_info=True)
+
+        return self._order_movies(movies_info)
+
+    async def _extract_listing_records(self, page: Page) -> list[ListingRecord]:
+        """Serializa todas las cajas del listado en una única llamada al navegador."""
+        return await page.eval_on_selector_all(self.MOVIE_BOX, self.LISTING_JS)
+
+    def _build_movie_from_record(
+        self, record: ListingRecord, source_url: str
+    ) -> Movie | None:
+        """
+        Construye la película a partir de un registro del listado (Python puro).
+
+        El primer bloque de información es la fecha y el segundo la sede. Una
+        caja sin fecha se descarta aquí, como antes la quitaba `_order_movies`
+        al final, para que tampoco llegue a `collect_partial`.
+
+        Returns:
+            Movie | None: La película, o None si falta el título o la fecha es inválida.
+        """
+        raw_title = (record.get("title") or "").replace("\n", " ").strip()
+        if not raw_title:
+            return None
 
-            finally:
-                await browser.close()
+        movie_date: datetime | None = None
+        location = self.DEFAULT_LOCATION
 
-    async def _get_movies_info(self, movie: int, page: Page):
-        try:
-            movie_obj = Movie()
-            movie_box = page.locator(".cajas_cont_item").nth(movie)
-
-            blocks = await movie_box.locator(
-                ".cajas_cont_item_info .cajas__info_fecha2"
-            ).count()
-
-            keys = ["date", "location"]
-            for block in range(blocks):
-                if (
-                    raw_info := await movie_box.locator(
-                        ".cajas_cont_item_info .cajas__info_fecha2"
-                    )
-                    .nth(block)
-                    .text_content()
-                ):
-                    info = raw_info.replace("\n", " ").strip()
-                    if info == "":
-                        continue
-
-                    if keys[block] == "date":
-                        date_obj = self._parse_date_string(info)
-
-                        if date_obj is None:
-                            continue
-
-                        movie_obj.date = date_obj
-                    else:
-                        # Explicación del regex:
-                        # \(([^,]+)   -> Grupo 1: Busca paréntesis y captura todo hasta la coma (Avenida)
-                        # ,\s* -> Busca una coma y espacios opcionales (los ignora)
-                        # ([^)]+)     -> Grupo 2: Captura todo lo que no sea paréntesis de cierre (Distrito)
-                        if match := re.search(r"\(([^,]+),\s*([^)]+)\)", info):
-                            avenue = match.group(1).strip()
-                            district = match.group(2).strip()
-                            movie_obj.location = (
-                                f"Alianza Francesa de {district} - {avenue}"
-                            )
-
-            if raw_title := await movie_box.locator(
-                ".cajas_cont_item_fecha .cajas__fecha_txt"
-            ).text_content():
-                clean_title = raw_title.replace("\n", " ").strip()
-                poster_url = get_movie_poster(clean_title)
-                movie_obj.title = clean_title
-                movie_obj.poster_url = poster_url
-
-            movie_obj.center = "alianza_francesa"
-            movie_obj.source_url = page.url
-
-            return movie_obj
-        except Exception as e:
-            print(e)
+        for key, raw_info in zip(("date", "location"), record.get("info", [])):
+            info = raw_info.replace("\n", " ").strip()
+            if not info:
+                continue
+
+            if key == "date":
+                movie_date = self._parse_date_string(info)
+            elif match := self.LOCATION_PATTERN.search(info):
+                avenue = match.group(1).strip()
+                district = match.group(2).strip()
+                location = f"Alianza Francesa de {district} - {avenue}"
+
+        if movie_date is None:
+            return None
+
+        known = self.known_movie(raw_title, movie_date)
+
+        return Movie(
+            title=raw_title,
+            location=location,
+            date=movie_date,
+            center=self.CENTER_SLUG,
+            poster_url=known.poster_url if known else None,
+            poster_path=known.poster_path if known else None,
+            source_url=source_url,
+        )
 
     @staticmethod
     async def _enter_movie_page(locator: int, page: Page, free_movies: Locator):
@@ -1,12 +1,42 @@
+import asyncio
 import os
 from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timedelta
 from typing import ClassVar
 
-from playwright.async_api import Browser, Page, Playwright
+from playwright.async_api import BrowserContext, Page
 
+from agenda_cultural.backend import metrics
 from agenda_cultural.backend.constants import MAPA_MESES
+from agenda_cultural.backend.log_config import get_task_logger
 from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.scrapers import har_archive
+from agenda_cultural.backend.scrapers.browser_pool import BrowserPool
+from agenda_cultural.backend.scrapers.har_archive import ScraperMode, scraper_mode
+from agenda_cultural.backend.scrapers.known_movies import (
+    NO_KNOWN_MOVIES,
+    KnownMovies,
+    Signature,
+)
+from agenda_cultural.backend.scrapers.listing_cache import (
+    ListingCache,
+    listing_cache,
+    listing_cache_enabled,
+)
+from agenda_cultural.backend.scrapers.http_engine import (
+    HttpFetcher,
+    NeedsBrowserError,
+    ScraperEngine,
+    engine_mode,
+)
+from agenda_cultural.backend.scrapers.resource_policy import (
+    TEXT_ONLY_POLICY,
+    ResourcePolicy,
+)
+
+logger = get_task_logger("base_scraper", "scraping.log")
 
 
 class ScraperInterface(ABC):
@@ -18,20 +48,6 @@ class ScraperInterface(ABC):
     e implementar el método `get_movies`.
     """
 
-    # Argumentos para optimizar Chromium en entornos Docker/Headless
-    CHROMIUM_ARGS: ClassVar[list[str]] = [
-        "--disable-dev-shm-usage",
-        "--disable-extensions",
-        "--disable-features=TranslateUI",
-        "--disable-ipc-flooding-protection",
-        "--no-sandbox",
-        "--disable-setuid-sandbox",
-        "--disable-background-timer-throttling",
-        "--disable-backgrounding-occluded-windows",
-        "--disable-renderer-backgrounding",
-        "--disable-blink-features=AutomationControlled",
-    ]
-
     # User Agent genérico de Chrome en Windows para evitar bloqueos simples
     USER_AGENT: ClassVar[str] = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -39,45 +55,426 @@ class ScraperInterface(ABC):
         "Chrome/120.0.0.0 Safari/537.36"
     )
 
+    # Identificador/Slug del centro cultural (se guarda en Movie.center)
+    CENTER_SLUG: ClassVar[str] = ""
+
+    # Qué recursos se bloquean y si se ejecuta JavaScript en el contexto del scraper.
+    # Cada scraper puede sobrescribirla según lo que realmente necesite su sitio.
+    RESOURCE_POLICY: ClassVar[ResourcePolicy] = TEXT_ONLY_POLICY
+
+    # Motores con los que sabe trabajar el scraper. Los que incluyen HTTP deben
+    # implementar `get_movies_via_http`; Playwright queda como respaldo.
+    SUPPORTED_ENGINES: ClassVar[frozenset[ScraperEngine]] = frozenset(
+        {ScraperEngine.BROWSER}
+    )
+
+    # Tiempo máximo (en segundos) que el servicio de scraping le da al centro en
+    # cada corrida. Se puede ajustar con SCRAPER_TIMEOUT_<SLUG> o, para todos los
+    # centros a la vez, con SCRAPER_CENTER_TIMEOUT.
+    TIME_BUDGET_SECONDS: ClassVar[float] = 300.0
+
+    # Si el motor HTTP valida el certificado TLS del sitio. Solo se apaga en el
+    # scraper de un sitio que sirve una cadena incompleta (el navegador ya las
+    # acepta con ignore_https_errors); ese centro usa su propio cliente HTTP.
+    VERIFY_TLS: ClassVar[bool] = True
+
+    # Caché de listados compartida por todos los scrapers del proceso
+    listing_cache: ListingCache = listing_cache
+
+    # Funciones del centro ya guardadas en la BD (las asigna el servicio de scraping)
+    known_movies: KnownMovies = NO_KNOWN_MOVIES
+
+    # Películas que el scraper ya extrajo en la corrida en curso. Si se agota su
+    # tiempo, el servicio de scraping devuelve estas en lugar de nada.
+    _partial_results: list[Movie] | None = None
+
+    # Fallos técnicos de la corrida en curso (el listado o una página de detalle
+    # que no cargó). Con alguno, lo extraído no es la cartelera completa: el
+    # centro no cuenta como completo y su listado no se guarda en la caché.
+    _failures: int = 0
+
+    # Cola por la que `iter_movies` recibe lo que se registra con `collect_partial`
+    _arrivals: asyncio.Queue[Movie | None] | None = None
+
     @abstractmethod
-    async def get_movies(self) -> list[Movie]:
+    async def get_movies(
+        self,
+        browser_pool: BrowserPool | None = None,
+        http_fetcher: HttpFetcher | None = None,
+    ) -> list[Movie]:
         """
         Método abstracto principal que debe implementar cada scraper hijo.
 
+        Args:
+            browser_pool (BrowserPool, optional): Pool de navegadores compartido
+                por todos los scrapers de la corrida.
+            http_fetcher (HttpFetcher, optional): Cliente HTTP compartido, para
+                los scrapers que soportan el motor HTTP.
+
         Returns:
             list[Movie]: La lista de películas validadas y listas para guardar.
         """
         pass
 
-    async def setup_browser_and_open_page(self, p: Playwright) -> tuple[Browser, Page]:
+    def time_budget(self) -> float:
+        """Segundos que tiene el centro para terminar, según el entorno o la clase."""
+        slug = (self.CENTER_SLUG or type(self).__name__).upper()
+        for name in (f"SCRAPER_TIMEOUT_{slug}", "SCRAPER_CENTER_TIMEOUT"):
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                continue
+        return self.TIME_BUDGET_SECONDS
+
+    def reset_partial_results(self) -> None:
+        """Vacía lo parcial y los fallos; se llama al comenzar cada corrida."""
+        self._partial_results = []
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Anota un fallo técnico que dejó fuera películas de la corrida."""
+        self._failures += 1
+        metrics.increment(f"failures.{self.CENTER_SLUG or type(self).__name__}")
+
+    @property
+    def failures(self) -> int:
+        """Fallos técnicos registrados en la corrida en curso."""
+        return self._failures
+
+    def collect_partial(self, *movies: Movie) -> None:
+        """Registra películas ya extraídas, por si la corrida se cancela a medias."""
+        if self._partial_results is None:
+            self._partial_results = []
+        self._partial_results.extend(movies)
+        if self._arrivals is not None:
+            for movie in movies:
+                self._arrivals.put_nowait(movie)
+
+    @property
+    def partial_results(self) -> list[Movie]:
+        """Copia de las películas extraídas hasta ahora en la corrida en curso."""
+        return list(self._partial_results or [])
+
+    async def iter_movies(
+        self,
+        browser_pool: BrowserPool | None = None,
+        http_fetcher: HttpFetcher | None = None,
+    ) -> AsyncGenerator[Movie]:
         """
-        Configura e inicia una instancia de Chromium optimizada para scraping.
+        Protocolo de streaming: entrega cada película en cuanto se extrae.
+
+        La implementación por defecto ejecuta `get_movies` en una tarea y emite lo
+        que el scraper registra con `collect_partial` mientras trabaja; al terminar,
+        emite las películas del resultado final que aún no salieron (por ejemplo,
+        las reutilizadas de la caché de listados). Nunca emite dos veces la misma
+        firma (centro, título, fecha). Un scraper puede sobrescribirlo si tiene una
+        forma más directa de producir sus películas.
+
+        Si el consumidor se cancela (por ejemplo, al agotarse el tiempo del
+        centro), se cancela también la tarea y el scraper cierra su contexto.
+
+        Yields:
+            Movie: Películas validadas, listas para guardar.
+        """
+        arrivals: asyncio.Queue[Movie | None] = asyncio.Queue()
+        self._arrivals = arrivals
+        task = asyncio.create_task(self.get_movies(browser_pool, http_fetcher))
+        # None marca el final: llega después de todo lo registrado por la tarea
+        task.add_done_callback(lambda _: arrivals.put_nowait(None))
+        emitted: set[Signature] = set()
+
+        try:
+            while (movie := await arrivals.get()) is not None:
+                if self._mark_emitted(movie, emitted):
+                    yield movie
+
+            for movie in task.result():
+                if self._mark_emitted(movie, emitted):
+                    yield movie
+        finally:
+            self._arrivals = None
+            if not task.done():
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+
+    @staticmethod
+    def _mark_emitted(movie: Movie, emitted: set[Signature]) -> bool:
+        """True la primera vez que se ve la firma de la película."""
+        signature = (movie.center, movie.title, movie.date)
+        if signature in emitted:
+            return False
+        emitted.add(signature)
+        return True
+
+    async def get_movies_via_http(self, http_fetcher: HttpFetcher) -> list[Movie]:
+        """
+        Extrae las películas sin navegador. Solo lo implementan los scrapers que
+        declaran `ScraperEngine.HTTP` en `SUPPORTED_ENGINES`.
+
+        Raises:
+            NeedsBrowserError: Si la página no se puede leer sin JavaScript.
+        """
+        raise NeedsBrowserError(f"{type(self).__name__} no tiene motor HTTP.")
+
+    async def try_http_engine(
+        self, http_fetcher: HttpFetcher | None = None
+    ) -> list[Movie] | None:
+        """
+        Intenta extraer las películas con el motor HTTP.
+
+        Si no se recibe un cliente compartido se crea uno propio para la llamada.
+        En SCRAPER_MODE=record|replay se usa siempre un cliente propio del centro,
+        que graba o reproduce su HAR HTTP.
+
+        Returns:
+            list[Movie] | None: Las películas obtenidas por HTTP, o None si hay que
+                usar Playwright (el scraper no soporta HTTP, SCRAPER_ENGINE=browser,
+                no hay HAR HTTP que reproducir o el motor HTTP falló en modo auto).
+        """
+        mode = engine_mode()
+        if mode == "browser" or ScraperEngine.HTTP not in self.SUPPORTED_ENGINES:
+            return None
+
+        slug = self.CENTER_SLUG or type(self).__name__
+
+        if scraper_mode() is not ScraperMode.LIVE:
+            transport = har_archive.http_transport(slug, verify=self.VERIFY_TLS)
+            if transport is None:
+                logger.info(f"[{slug}] Sin HAR HTTP que reproducir; se usa Playwright.")
+                return None
+            async with HttpFetcher(
+                user_agent=self.USER_AGENT, transport=transport
+            ) as archived_fetcher:
+                return await self._run_http_engine(archived_fetcher, mode)
+
+        if http_fetcher is None or not self.VERIFY_TLS:
+            async with HttpFetcher(
+                user_agent=self.USER_AGENT, verify=self.VERIFY_TLS
+            ) as own_fetcher:
+                return await self._run_http_engine(own_fetcher, mode)
+
+        return await self._run_http_engine(http_fetcher, mode)
+
+    async def _run_http_engine(
+        self, http_fetcher: HttpFetcher, mode: str
+    ) -> list[Movie] | None:
+        """Ejecuta `get_movies_via_http`; en modo auto, un fallo devuelve None."""
+        slug = self.CENTER_SLUG or type(self).__name__
+
+        try:
+            movies = await self.get_movies_via_http(http_fetcher)
+        except Exception as e:
+            if mode == "http":
+                raise
+            # Playwright vuelve a extraer todo: lo parcial (y los fallos) del motor
+            # HTTP sobra
+            self.reset_partial_results()
+            metrics.increment(f"engine.{slug}.fallback")
+            logger.warning(f"[{slug}] Motor HTTP falló ({e}); se usa Playwright.")
+            return None
 
-        Aplica flags específicos para mejorar el rendimiento
+        metrics.increment(f"engine.{slug}.http")
+        logger.info(f"[{slug}] {len(movies)} películas obtenidas por HTTP.")
+        return movies
+
+    @property
+    def active_listing_cache(self) -> ListingCache | None:
+        """
+        La caché de listados, o None si está desactivada en esta corrida
+        (también en las corridas completas periódicas).
+        """
+        if self.known_movies.full_refresh or not listing_cache_enabled():
+            return None
+        return self.listing_cache
+
+    def partition_known_urls(self, urls: list[str]) -> tuple[list[Movie], list[str]]:
+        """
+        Separa las páginas de detalle ya guardadas en la BD de las nuevas.
+
+        Returns:
+            tuple[list[Movie], list[str]]: Las funciones guardadas de las URLs
+                conocidas y las URLs que sí hay que visitar.
+        """
+        known: list[Movie] = []
+        pending: list[str] = []
+
+        for url in urls:
+            if (stored := self.known_movies.movies_for_url(url)) is not None:
+                known.extend(stored)
+            else:
+                pending.append(url)
+
+        self.collect_partial(*known)
+        skipped = len(urls) - len(pending)
+        if skipped:
+            slug = self.CENTER_SLUG or type(self).__name__
+            metrics.increment(f"known.{slug}.skipped_details", skipped)
+            logger.info(
+                f"[{slug}] {skipped} de {len(urls)} páginas de detalle ya están en "
+                "la BD; solo se visitan las nuevas."
+            )
+        return known, pending
+
+    def known_movie(self, title: str, date: datetime) -> Movie | None:
+        """
+        La función guardada con la firma (centro, título, fecha), si existe.
+        Sirve para reutilizar su póster guardado en lugar de volver a resolverlo.
+        """
+        stored = self.known_movies.movie_for_signature(self.CENTER_SLUG, title, date)
+        if stored is not None:
+            metrics.increment(f"known.{self.CENTER_SLUG}.tmdb_skipped")
+        return stored
+
+    def reuse_unchanged_listing(
+        self, url: str, listing_hash: str | None = None
+    ) -> list[Movie] | None:
+        """
+        Devuelve las películas de la corrida anterior si el listado no cambió.
 
         Args:
-            p (Playwright): Objeto gestor de Playwright.
+            url: URL que identifica el listado en la caché.
+            listing_hash: Hash del contenido extraído del listado. None significa
+                que el servidor respondió 304 Not Modified.
 
         Returns:
-            tuple[Browser, Page]: Una tupla conteniendo la instancia del navegador
-            y la página (tab) creada.
-        """
-        is_headless = (
-            os.getenv("SCRAPER_HEADLESS", "true").lower() == "true"
-        )  # Determina si es parte de debugging o producción
-        browser = await p.chromium.launch(
-            headless=is_headless,
-            args=self.CHROMIUM_ARGS,
+            list[Movie] | None: Las películas guardadas (sin las ya pasadas), o None
+                si el listado cambió y hay que hacer la fase de detalle.
+        """
+        cache = self.active_listing_cache
+        if cache is None:
+            return None
+
+        slug = self.CENTER_SLUG or type(self).__name__
+        not_modified = listing_hash is None
+
+        if listing_hash is not None and not cache.is_unchanged(url, listing_hash):
+            metrics.increment(f"listing_cache.{slug}.miss")
+            return None
+
+        movies = cache.reuse(url, self.reference_now())
+        metrics.increment(f"listing_cache.{slug}.hit")
+        metrics.increment(f"listing_cache.{slug}.reused_movies", len(movies))
+        logger.info(
+            f"[{slug}] Listado sin cambios ({'304' if not_modified else 'mismo hash'}): "
+            f"se omite el detalle y se reutilizan {len(movies)} películas de {url}."
         )
+        return movies
+
+    def remember_listing(
+        self, url: str, listing_hash: str, movies: list[Movie]
+    ) -> None:
+        """
+        Guarda el hash del listado y sus películas para la próxima corrida.
+
+        Si la corrida registró fallos, las películas están incompletas: no se
+        guardan, para que la próxima corrida vuelva a extraer el detalle.
+        """
+        cache = self.active_listing_cache
+        if cache is None:
+            return
+
+        if self.failures:
+            slug = self.CENTER_SLUG or type(self).__name__
+            metrics.increment(f"listing_cache.{slug}.not_stored")
+            logger.warning(
+                f"[{slug}] {self.failures} fallo(s) en la corrida: el listado de "
+                f"{url} no se guarda en la caché."
+            )
+            return
+
+        cache.store(url, listing_hash, movies)
+
+    @asynccontextmanager
+    async def setup_browser_and_open_page(
+        self, browser_pool: BrowserPool | None = None
+    ) -> AsyncIterator[Page]:
+        """
+        Abre una página (tab) dentro de un contexto aislado del pool de navegadores.
+
+        Si no se recibe un pool (por ejemplo, al depurar un scraper de forma aislada)
+        se crea uno propio que vive solo mientras dure la página. El contexto y,
+        en su caso, el pool propio se cierran al salir del bloque `async with`.
+
+        Sobre el contexto se instala la `RESOURCE_POLICY` del scraper; al cerrar
+        se registran las peticiones bloqueadas y los bytes ahorrados.
+
+        Con SCRAPER_MODE=record el tráfico del contexto se archiva en el HAR del
+        centro; con SCRAPER_MODE=replay se sirve desde ese HAR y cualquier petición
+        que no esté archivada se aborta (la red queda deshabilitada).
+
+        Args:
+            browser_pool (BrowserPool, optional): Pool compartido de la corrida.
 
-        context = await browser.new_context(
+        Yields:
+            Page: La página lista para navegar.
+        """
+        if browser_pool is None:
+            async with BrowserPool() as own_pool:
+                async with self.setup_browser_and_open_page(own_pool) as page:
+                    yield page
+            return
+
+        slug = self.CENTER_SLUG or type(self).__name__
+        mode = scraper_mode()
+        har_path = har_archive.archive_path(slug, ScraperEngine.BROWSER)
+        har_options = {}
+
+        if mode is ScraperMode.RECORD and har_path is not None:
+            har_path.parent.mkdir(parents=True, exist_ok=True)
+            har_options = {
+                "record_har_path": str(har_path),
+                "record_har_content": "embed",
+            }
+        elif mode is ScraperMode.REPLAY and (har_path is None or not har_path.exists()):
+            raise FileNotFoundError(f"No hay HAR archivado para '{slug}' ({har_path}).")
+
+        async with browser_pool.new_context(
             user_agent=self.USER_AGENT,
             ignore_https_errors=True,
             locale="es-PE",
             timezone_id="America/Lima",
-        )
-        page = await context.new_page()
-        return browser, page
+            **self.RESOURCE_POLICY.context_options(),
+            **har_options,
+        ) as context:
+            resource_stats = await self.RESOURCE_POLICY.install(context)
+            if mode is ScraperMode.REPLAY and har_path is not None:
+                # Registrada después de la política, tiene prioridad sobre ella
+                await context.route_from_har(har_path, not_found="abort")
+                logger.info(f"[{slug}] Reproduciendo {har_path} sin red.")
+            await self.prepare_context(context)
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                metrics.increment(f"engine.{slug}.browser")
+                metrics.increment(
+                    f"resources.{slug}.blocked", resource_stats.blocked_requests
+                )
+                metrics.increment(
+                    f"resources.{slug}.bytes_loaded", resource_stats.loaded_bytes
+                )
+                metrics.increment(
+                    f"resources.{slug}.bytes_saved",
+                    resource_stats.estimated_bytes_saved,
+                )
+                logger.info(f"[{slug}] Recursos: {resource_stats.summary()}")
+
+    async def prepare_context(self, context: BrowserContext) -> None:
+        """
+        Hook para que cada scraper ajuste su contexto antes de abrir la página
+        (por ejemplo, aplicar evasiones anti-bot). Por defecto no hace nada.
+        """
+        return None
+
+    def reference_now(self) -> datetime:
+        """
+        Fecha y hora de referencia para decidir qué funciones ya pasaron.
+
+        Es la hora actual, salvo al reproducir un HAR: entonces es la fecha en que
+        se archivó, para que la reproducción dé siempre el mismo resultado.
+        """
+        return har_archive.reference_now(self.CENTER_SLUG or type(self).__name__)
 
     def validate_and_build_date(
         self,
@@ -135,7 +532,7 @@ class ScraperInterface(ABC):
                 return None
 
             # 3. Determinar Año
-            now = datetime.now()
+            now = self.reference_now()
 
             if explicit_year:
                 # Caso A: La web dice explícitamente el año
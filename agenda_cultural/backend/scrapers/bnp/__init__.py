@@ -1,6 +1,7 @@
 from .scraper import BnpScraper
 
-get_bnp_movies = BnpScraper().get_movies
+bnp_scraper = BnpScraper()
+get_bnp_movies = bnp_scraper.get_movies
 
 
-__all__ = ["get_bnp_movies"]
+__all__ = ["bnp_scraper", "get_bnp_movies"]
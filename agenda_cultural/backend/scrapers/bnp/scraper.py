@@ -7,13 +7,20 @@ desde la agenda oficial de Bibliocine de la BNP.
 TARGET URL: https://eventos.bnp.gob.pe/externo/inicio
 
 ESTRATEGIA DE NAVEGACIÓN:
-1. Acceso a la página principal de eventos de la BNP.
+1. Acceso a la página principal de eventos de la BNP (en un contexto del pool
+   de navegadores compartido).
 2. Filtrado: Selecciona la categoría "Bibliocine" mediante un dropdown.
 3. Espera dinámica: El sitio carga los eventos vía JavaScript tras aplicar el filtro.
 4. Navegación por película: Abre cada película en una nueva pestaña para extraer
    detalles completos (título, fecha, ubicación). Esta estrategia evita perder el
    estado del filtro aplicado, ya que al volver a la página principal se resetearía
    el dropdown y habría que reaplicar el filtro en cada iteración.
+5. Scraping incremental: Si la URL de la pestaña ya está guardada en la BD con
+   una función futura, se cierra sin esperar su carga.
+6. Concurrencia acotada: Los clics sobre el listado se hacen de uno en uno (cada
+   clic debe emparejarse con su pestaña), pero la carga y extracción de hasta
+   `detail_concurrency` pestañas ocurre en paralelo. Los resultados se devuelven
+   en el orden del listado y el fallo de una película no afecta a las demás.
 
 ESTRATEGIA DE EXTRACCIÓN (PARSING):
 El HTML de la BNP presenta los eventos de forma estructurada:
@@ -31,20 +38,38 @@ LÓGICA DE PROCESAMIENTO:
   la información relevante de la biblioteca/sala.
 """
 
+import asyncio
+import os
 import re
 from datetime import datetime
 from typing import ClassVar, Pattern, override
 
-from playwright.async_api import Page, async_playwright
+from playwright.async_api import Page
 
+from agenda_cultural.backend import metrics
 from agenda_cultural.backend.log_config import get_task_logger
 from agenda_cultural.backend.models import Movie
 from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
-from agenda_cultural.backend.services.tmdb_service import get_movie_poster
+from agenda_cultural.backend.scrapers.browser_pool import BrowserPool
+from agenda_cultural.backend.scrapers.http_engine import HttpFetcher
+from agenda_cultural.backend.scrapers.listing_cache import content_hash
+from agenda_cultural.backend.scrapers.resource_policy import (
+    TEXT_ONLY_POLICY,
+    ResourcePolicy,
+)
 
 logger = get_task_logger("bnp_scraper", "scraping.log")
 
 
+def detail_concurrency_from_env() -> int:
+    """Pestañas de detalle abiertas a la vez: BNP_DETAIL_CONCURRENCY (4)."""
+    try:
+        return int(os.getenv("BNP_DETAIL_CONCURRENCY", "4"))
+    except ValueError:
+        logger.warning("BNP_DETAIL_CONCURRENCY no es un entero; se usa 4.")
+        return 4
+
+
 class BnpScraper(ScraperInterface):
     """
     Scraper especializado para extraer información de proyecciones de
@@ -76,26 +101,54 @@ class BnpScraper(ScraperInterface):
         r"biblioteca|bnp", re.IGNORECASE
     )
 
+    # Sitio ASP.NET: el filtro y la apertura de pestañas dependen de JavaScript,
+    # así que solo se bloquean imágenes, fuentes, videos y analítica.
+    RESOURCE_POLICY: ClassVar[ResourcePolicy] = TEXT_ONLY_POLICY
+
+    def __init__(self, detail_concurrency: int | None = None):
+        """
+        Args:
+            detail_concurrency (int, optional): Número máximo de pestañas de detalle
+                abiertas a la vez. Por defecto BNP_DETAIL_CONCURRENCY (4).
+                Con 1 se obtiene el recorrido secuencial de siempre.
+        """
+        self.detail_concurrency = max(
+            1, detail_concurrency or detail_concurrency_from_env()
+        )
+
     @override
-    async def get_movies(self) -> list[Movie]:
+    async def get_movies(
+        self,
+        browser_pool: BrowserPool | None = None,
+        http_fetcher: HttpFetcher | None = None,
+    ) -> list[Movie]:
         """
         Orquesta el proceso completo de scraping de Bibliocine.
 
         Flujo:
-        1. Inicializa el navegador y carga la página principal.
+        1. Abre una página en el pool de navegadores y carga la página principal.
         2. Aplica el filtro de categoría "Bibliocine".
-        3. Itera sobre cada bloque de película encontrado.
-        4. Extrae la información detallada de cada película.
+        3. Si el listado filtrado es idéntico al de la corrida anterior, reutiliza
+           sus películas y omite la fase de detalle.
+        4. Recorre los bloques de película encontrados.
+        5. Extrae la información detallada de cada película, con hasta
+           `detail_concurrency` pestañas en paralelo.
+
+        Solo usa Playwright: el listado filtrado es un postback de ASP.NET y las
+        páginas de detalle se abren desde JavaScript, así que `http_fetcher` se
+        ignora.
+
+        Args:
+            browser_pool: Pool de navegadores compartido de la corrida.
+            http_fetcher: No se usa (la BNP no soporta el motor HTTP).
 
         Returns:
             list[Movie]: Lista de películas extraídas y validadas.
                          Retorna lista vacía si ocurre un error crítico.
         """
-        async with async_playwright() as p:
-            browser, page = await self.setup_browser_and_open_page(p)
-
-            movies_extracted: list[Movie] = []
+        movies_extracted: list[Movie] = []
 
+        async with self.setup_browser_and_open_page(browser_pool) as page:
             try:
                 logger.info("Iniciando scraping en BNP.")
                 await page.goto(self.START_URL, wait_until="domcontentloaded")
@@ -107,23 +160,63 @@ class BnpScraper(ScraperInterface):
                         "No se pudo aplicar el filtro de Bibliocine. La página retornó None"
                     )
 
-                movies = await page.locator(self.MOVIE_BLOCK).count()
+                # Una sola llamada: el texto de todos los bloques identifica el listado
+                listing = await page.locator(self.MOVIE_BLOCK).all_inner_texts()
+                listing_hash = content_hash(listing)
 
-                for movie in range(movies):
-                    if movie_info := await self._extract_movie_info(movie, page):
-                        movies_extracted.append(movie_info)
+                if (
+                    cached := self.reuse_unchanged_listing(self.START_URL, listing_hash)
+                ) is not None:
+                    return cached
+
+                movies_extracted = await self._extract_all_movies(len(listing), page)
+                self.remember_listing(self.START_URL, listing_hash, movies_extracted)
 
                 logger.info("Scraping terminado en BNP. Retornando películas.")
 
             except Exception as e:
+                self.record_failure()
                 logger.error(f"Error en BNP Scraper: {e}", exc_info=True)
 
-            finally:
-                await browser.close()
+        return movies_extracted
+
+    async def _extract_all_movies(self, movies: int, page: Page) -> list[Movie]:
+        """
+        Extrae el detalle de todas las películas del listado con concurrencia acotada.
 
-            return movies_extracted
+        Un semáforo limita las pestañas en vuelo y un candado serializa los clics
+        sobre el listado, para que cada clic quede emparejado con la pestaña que abre.
 
-    async def _extract_movie_info(self, movie: int, page: Page) -> Movie | None:
+        Args:
+            movies: Número de bloques de película en el listado.
+            page: Página principal del listado de eventos.
+
+        Returns:
+            list[Movie]: Películas válidas, en el mismo orden que el listado.
+        """
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+        click_lock = asyncio.Lock()
+
+        async def extract(movie: int) -> list[Movie]:
+            async with semaphore:
+                try:
+                    movie_info = await self._extract_movie_info(movie, page, click_lock)
+                except Exception as e:
+                    # Aislamos el fallo: una película rota no tumba al resto
+                    self.record_failure()
+                    logger.warning(f"Error extrayendo la película {movie} en BNP: {e}")
+                    return []
+                self.collect_partial(*movie_info)
+                return movie_info
+
+        # gather conserva el orden de las corrutinas, es decir, el orden del listado
+        results = await asyncio.gather(*(extract(movie) for movie in range(movies)))
+
+        return [movie_info for movie_infos in results for movie_info in movie_infos]
+
+    async def _extract_movie_info(
+        self, movie: int, page: Page, click_lock: asyncio.Lock
+    ) -> list[Movie]:
         """
         Extrae la información completa de una película individual.
 
@@ -131,44 +224,62 @@ class BnpScraper(ScraperInterface):
         - Título limpio y año (opcional).
         - Fecha y hora de proyección.
         - Ubicación de la sala.
-        - URL del póster (vía API externa).
+        - URL del póster, solo si la función ya está en la BD (el resto lo
+          resuelve la etapa de pósters del pipeline).
 
         Args:
             movie: Índice de la película en la lista de resultados.
             page: Página principal del listado de eventos.
+            click_lock: Candado que serializa los clics sobre el listado.
 
         Returns:
-            Movie | None: Objeto Movie con los datos completos si la extracción
-                         fue exitosa. None si falta información crítica o la
-                         fecha es inválida.
+            list[Movie]: La función extraída o, si la URL de la página ya está
+                         en la BD, todas las funciones guardadas con esa URL.
+                         Vacía si falta información crítica o la fecha es inválida.
         """
 
-        movie_page = await self._open_movie_page(movie, page)
+        async with click_lock:
+            movie_page = await self._open_movie_page(movie, page)
         if not movie_page:
-            return None
+            return []
 
         try:
-            title_data = await self._extract_title(movie_page)
-            if not title_data:
-                return None
-            movie_title, poster_url = title_data
+            # La carga de la pestaña ocurre fuera del candado, en paralelo con otras.
+            # Antes de cargar, la pestaña puede seguir en about:blank.
+            await movie_page.wait_for_load_state("domcontentloaded")
+
+            # Si la URL ya está en la BD no se vuelve a extraer: se devuelven
+            # todas sus funciones guardadas
+            if (stored := self.known_movies.movies_for_url(movie_page.url)) is not None:
+                metrics.increment(f"known.{self.CENTER_SLUG}.skipped_details")
+                return stored
+
+            movie_title = await self._extract_title(movie_page)
+            if not movie_title:
+                return []
 
             movie_date = await self._extract_date(movie_page, movie_title)
             if not movie_date:
-                return None
+                return []
 
             location = await self._extract_location(movie_page, movie_title)
             if not location:
-                return None
-
-            return Movie(
-                title=movie_title,
-                location=location,
-                date=movie_date,
-                center=self.CENTER_SLUG,
-                poster_url=poster_url,
-                source_url=movie_page.url,
-            )
+                return []
+
+            # El póster de las funciones nuevas lo resuelve la etapa de pósters
+            known = self.known_movie(movie_title, movie_date)
+
+            return [
+                Movie(
+                    title=movie_title,
+                    location=location,
+                    date=movie_date,
+                    center=self.CENTER_SLUG,
+                    poster_url=known.poster_url if known else None,
+                    poster_path=known.poster_path if known else None,
+                    source_url=movie_page.url,
+                )
+            ]
         finally:
             await movie_page.close()
 
@@ -240,31 +351,27 @@ class BnpScraper(ScraperInterface):
             )
             return None
 
-    async def _extract_title(self, movie_page: Page) -> tuple[str, str | None] | None:
+    async def _extract_title(self, movie_page: Page) -> str | None:
         """
-        Extrae el título, año y URL del póster de la película.
+        Extrae el título limpio de la película.
 
-        Obtiene el texto del título desde el selector correspondiente,
-        lo parsea para extraer el título limpio y el año opcional,
-        y consulta la API externa para obtener la URL del póster.
+        Obtiene el texto del título desde el selector correspondiente y
+        lo parsea para quedarse con el título limpio (sin el año).
 
         Args:
             movie_page: Página de detalle de la película.
 
         Returns:
-            tuple[str, str | None] | None: Tupla con (título_limpio, url_póster)
-                                           si la extracción fue exitosa. El url_póster
-                                           es opcional.
-                                           Retorna None si no se pudo extraer el título.
+            str | None: El título limpio si la extracción fue exitosa.
+                        Retorna None si no se pudo extraer el título.
         """
         if raw_title := await movie_page.locator(self.MOVIE_TITLE).text_content():
             title_result = self._parse_title_and_year(raw_title)
             if title_result is None:
                 logger.warning(f"No se pudo extraer el título del texto: {raw_title}")
                 return None
-            clean_title, movie_year = title_result
-            poster_url = get_movie_poster(clean_title)
-            return clean_title, poster_url
+            clean_title, _movie_year = title_result
+            return clean_title
         else:
             logger.warning("No se encontró el título.")
             return None
@@ -274,7 +381,8 @@ class BnpScraper(ScraperInterface):
         Abre la página de detalle de una película en una nueva pestaña.
 
         Hace clic en el bloque de película especificado y espera a que
-        se abra una nueva pestaña con la página de detalles.
+        se abra una nueva pestaña con la página de detalles. No espera a que
+        la pestaña cargue, para liberar cuanto antes el listado.
 
         Args:
             movie: Índice de la película en la lista de resultados.
@@ -286,13 +394,11 @@ class BnpScraper(ScraperInterface):
         """
         try:
             # Promesa de que al hacer clic en la página se abrirá una nueva pestaña.
-            # Luego espera a que el DOM cargue por completo para luego interactuar.
             async with page.context.expect_page() as new_page:
                 await page.locator(self.MOVIE_BLOCK).nth(movie).click()
-            movie_page = await new_page.value
-            await movie_page.wait_for_load_state("domcontentloaded")
-            return movie_page
+            return await new_page.value
         except Exception as e:
+            self.record_failure()
             logger.warning(f"Error al abrir la página de la película {movie}: {e}")
             return None
 
@@ -0,0 +1,204 @@
+"""
+Pool de navegadores Chromium compartido entre scrapers.
+
+En lugar de que cada scraper arranque su propio driver de Playwright y su propio
+Chromium (un arranque en frío por centro cultural en cada corrida), el servicio de
+scraping crea un único `BrowserPool` y cada scraper le pide un contexto aislado
+(cookies, caché y almacenamiento propios) sobre uno de los navegadores vivos.
+
+Los navegadores se lanzan de forma perezosa, se reutilizan entre contextos y se
+reciclan (cierran y relanzan) tras servir un número máximo de contextos o si se
+desconectan, para evitar que la memoria de Chromium crezca sin control.
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.log_config import get_task_logger
+
+logger = get_task_logger("browser_pool", "scraping.log")
+
+
+@dataclass
+class _BrowserSlot:
+    """Navegador vivo del pool junto con su contabilidad de uso."""
+
+    browser: Browser
+    active: int = 0  # Contextos abiertos en este momento
+    served: int = 0  # Contextos entregados desde que se lanzó
+
+
+class BrowserPool:
+    """
+    Pool de uno o pocos navegadores Chromium de larga duración.
+
+    Se usa como context manager asíncrono; al salir se cierran todos los
+    navegadores y se detiene el driver de Playwright:
+
+        async with BrowserPool() as pool:
+            async with pool.new_context(locale="es-PE") as context:
+                page = await context.new_page()
+    """
+
+    # Argumentos para optimizar Chromium en entornos Docker/Headless
+    CHROMIUM_ARGS: ClassVar[list[str]] = [
+        "--disable-dev-shm-usage",
+        "--disable-extensions",
+        "--disable-features=TranslateUI",
+        "--disable-ipc-flooding-protection",
+        "--no-sandbox",
+        "--disable-setuid-sandbox",
+        "--disable-background-timer-throttling",
+        "--disable-backgrounding-occluded-windows",
+        "--disable-renderer-backgrounding",
+        "--disable-blink-features=AutomationControlled",
+    ]
+
+    def __init__(
+        self,
+        size: int | None = None,
+        max_contexts_per_browser: int | None = None,
+    ):
+        """
+        Args:
+            size (int, optional): Número máximo de navegadores simultáneos.
+                Por defecto se lee de SCRAPER_BROWSER_POOL_SIZE (1).
+            max_contexts_per_browser (int, optional): Contextos que sirve un navegador
+                antes de reciclarse. Por defecto SCRAPER_BROWSER_MAX_CONTEXTS (50).
+        """
+        self.size = max(1, size or int(os.getenv("SCRAPER_BROWSER_POOL_SIZE", "1")))
+        self.max_contexts_per_browser = max(
+            1,
+            max_contexts_per_browser
+            or int(os.getenv("SCRAPER_BROWSER_MAX_CONTEXTS", "50")),
+        )
+
+        # Estadísticas de la corrida
+        self.launches = 0
+        self.contexts = 0
+
+        self._playwright: Playwright | None = None
+        self._slots: list[_BrowserSlot] = []
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "BrowserPool":
+        self._playwright = await async_playwright().start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Cierra todos los navegadores del pool y detiene Playwright."""
+        async with self._lock:
+            for slot in self._slots:
+                await self._close_browser(slot)
+            self._slots.clear()
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    @asynccontextmanager
+    async def new_context(self, **options: Any) -> AsyncIterator[BrowserContext]:
+        """
+        Entrega un contexto aislado sobre uno de los navegadores del pool.
+
+        El contexto se cierra al salir del bloque `async with`, incluso si el
+        scraper falla o es cancelado.
+
+        Args:
+            **options: Argumentos que se pasan tal cual a `Browser.new_context`.
+
+        Yields:
+            BrowserContext: Contexto listo para abrir páginas.
+        """
+        slot = await self._acquire_slot()
+        try:
+            context = await slot.browser.new_context(**options)
+        except BaseException:
+            await self._release_slot(slot)
+            raise
+
+        self.contexts += 1
+        metrics.increment("browser_pool.contexts")
+
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"El contexto ya estaba cerrado: {e}")
+            await self._release_slot(slot)
+
+    async def _acquire_slot(self) -> _BrowserSlot:
+        """
+        Elige el navegador con menos contextos activos, lanzando uno nuevo si
+        el pool aún no llegó a su tamaño o si todos están agotados.
+        """
+        async with self._lock:
+            # Descartamos navegadores caídos o gastados que ya no tienen contextos
+            for slot in [s for s in self._slots if not s.active]:
+                if not self._is_usable(slot):
+                    await self._close_browser(slot)
+                    self._slots.remove(slot)
+
+            available = [slot for slot in self._slots if self._is_usable(slot)]
+
+            if not available or len(self._slots) < self.size:
+                slot = _BrowserSlot(browser=await self._launch_browser())
+                self._slots.append(slot)
+            else:
+                slot = min(available, key=lambda s: s.active)
+
+            slot.active += 1
+            slot.served += 1
+            return slot
+
+    async def _release_slot(self, slot: _BrowserSlot) -> None:
+        """Devuelve el contexto al pool y recicla el navegador si ya está gastado."""
+        async with self._lock:
+            slot.active -= 1
+            if slot.active == 0 and not self._is_usable(slot):
+                await self._close_browser(slot)
+                self._slots.remove(slot)
+
+    def _is_usable(self, slot: _BrowserSlot) -> bool:
+        """Un navegador se puede seguir usando si está conectado y no está gastado."""
+        return (
+            slot.browser.is_connected() and slot.served < self.max_contexts_per_browser
+        )
+
+    async def _launch_browser(self) -> Browser:
+        """Lanza una nueva instancia de Chromium con los flags del pool."""
+        if self._playwright is None:
+            raise RuntimeError("El BrowserPool debe usarse dentro de 'async with'.")
+
+        is_headless = (
+            os.getenv("SCRAPER_HEADLESS", "true").lower() == "true"
+        )  # Determina si es parte de debugging o producción
+
+        browser = await self._playwright.chromium.launch(
+            headless=is_headless,
+            args=self.CHROMIUM_ARGS,
+        )
+
+        self.launches += 1
+        metrics.increment("browser_pool.launches")
+        logger.debug(f"Chromium lanzado (#{self.launches}) en el pool.")
+        return browser
+
+    @staticmethod
+    async def _close_browser(slot: _BrowserSlot) -> None:
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            logger.debug(f"El navegador ya estaba cerrado: {e}")
@@ -1,5 +1,6 @@
 from .scraper import CcpucpScraper
 
-get_ccpucp_movies = CcpucpScraper().get_movies
+ccpucp_scraper = CcpucpScraper()
+get_ccpucp_movies = ccpucp_scraper.get_movies
 
-__all__ = ["get_ccpucp_movies"]
+__all__ = ["ccpucp_scraper", "get_ccpucp_movies"]
@@ -1,93 +1,428 @@
+"""
+Módulo de Scraping para el Centro Cultural PUCP (CCPUCP).
+
+TARGET URL: https://centrocultural.pucp.edu.pe/cine.html
+
+MOTOR:
+Sitio Joomla renderizado en el servidor: el recorrido se hace primero con el motor
+HTTP (httpx + BeautifulSoup) y solo si falla se repite con Playwright.
+
+ESTRATEGIA DE NAVEGACIÓN:
+1. Cosecha de enlaces: En una sola pasada sobre el DOM del listado de cine se
+   recogen las URLs de todas las categorías (ciclos) y, en cada categoría, las
+   URLs y títulos de todas las películas.
+2. Detalle en paralelo: Las páginas de detalle se visitan directamente por URL con
+   un pequeño pool de páginas concurrentes (`detail_concurrency`). No se hace clic
+   ni se vuelve atrás en el historial, así que el tiempo depende del número de
+   películas y no de recargar el listado tras cada una. Con el motor HTTP la
+   concurrencia es la de peticiones en vuelo.
+
+3. Caché de listados: Si los enlaces cosechados (URL y título de cada película)
+   son los mismos que en la corrida anterior, se reutilizan sus películas y no
+   se visita ninguna página de detalle.
+4. Scraping incremental: Las páginas de detalle cuya URL ya está en la BD con una
+   función futura no se visitan; se devuelve la copia guardada.
+
+ESTRATEGIA DE EXTRACCIÓN (PARSING):
+- Se descartan las funciones con venta de "ENTRADAS" (solo interesan las gratuitas).
+- La fecha se toma del bloque "FUNCIONES" con formato "lunes 12 de enero | 7:00 p.m.".
+"""
+
+import asyncio
+import os
 import re
+from collections.abc import Awaitable, Callable
 from datetime import datetime
-from typing import override
-from playwright.async_api import async_playwright, Page
+from typing import ClassVar, Pattern, override
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from playwright.async_api import BrowserContext, Page
+
+from agenda_cultural.backend.log_config import get_task_logger
 from agenda_cultural.backend.models import Movie
 from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
-from agenda_cultural.backend.services.tmdb_service import get_movie_poster
+from agenda_cultural.backend.scrapers.browser_pool import BrowserPool
+from agenda_cultural.backend.scrapers.http_engine import (
+    HttpFetcher,
+    NeedsBrowserError,
+    ScraperEngine,
+)
+from agenda_cultural.backend.scrapers.listing_cache import content_hash
+from agenda_cultural.backend.scrapers.resource_policy import (
+    STATIC_SITE_POLICY,
+    ResourcePolicy,
+)
+
+logger = get_task_logger("ccpucp_scraper", "scraping.log")
 
-CCPUCP = "https://centrocultural.pucp.edu.pe/cine.html"
-MOVIE_TITLE_SELECTOR = ".catItemTitle a"
+
+def detail_concurrency_from_env() -> int:
+    """Páginas que se cargan en paralelo: CCPUCP_DETAIL_CONCURRENCY (4)."""
+    try:
+        return int(os.getenv("CCPUCP_DETAIL_CONCURRENCY", "4"))
+    except ValueError:
+        logger.warning("CCPUCP_DETAIL_CONCURRENCY no es un entero; se usa 4.")
+        return 4
 
 
 class CcpucpScraper(ScraperInterface):
+    """
+    Scraper de la cartelera de cine gratuita del Centro Cultural PUCP.
+    """
+
+    START_URL: ClassVar[str] = "https://centrocultural.pucp.edu.pe/cine.html"
+    CENTER_SLUG: ClassVar[str] = "ccpucp"
+    CENTER_LOCATION: ClassVar[str] = "CCPUCP - Av. Camino Real 1075 (San Isidro)"
+
+    # Sitio Joomla renderizado en el servidor: la navegación es por enlaces, así que
+    # no necesita JavaScript, y sin imágenes el evento "load" llega mucho antes.
+    RESOURCE_POLICY: ClassVar[ResourcePolicy] = STATIC_SITE_POLICY
+    SUPPORTED_ENGINES: ClassVar[frozenset[ScraperEngine]] = frozenset(
+        {ScraperEngine.HTTP, ScraperEngine.BROWSER}
+    )
+
+    # Selectores del listado y de las categorías
+    CATEGORY_LINK: ClassVar[str] = "a.subCategoryImage"
+    MOVIE_TITLE_SELECTOR: ClassVar[str] = ".catItemTitle a"
+
+    # Selectores de la página de detalle
+    TICKETS_SELECTOR: ClassVar[str] = 'p:has(span b:has-text("ENTRADAS"))'
+    SCHEDULE_SELECTOR: ClassVar[str] = 'p:has(span strong:text("FUNCIONES")) span'
+    TICKETS_KEYWORD: ClassVar[str] = "ENTRADAS"
+    SCHEDULE_KEYWORD: ClassVar[str] = "FUNCIONES"
+    SCHEDULE_PATTERN: ClassVar[Pattern[str]] = re.compile(
+        r"(lunes|martes|miércoles|jueves|viernes|sábado|domingo)\s+\d{1,2}\s+de\s+\w+"
+    )
+
+    # Serializa en el navegador los enlaces de un selector en una sola llamada
+    HARVEST_LINKS_JS: ClassVar[str] = """
+        elements => elements.map(e => ({
+            href: e.href,
+            text: (e.textContent || "").trim(),
+        }))
+    """
+
+    def __init__(self, detail_concurrency: int | None = None):
+        """
+        Args:
+            detail_concurrency (int, optional): Número de páginas que se cargan en
+                paralelo. Por defecto CCPUCP_DETAIL_CONCURRENCY (4).
+        """
+        self.detail_concurrency = max(
+            1, detail_concurrency or detail_concurrency_from_env()
+        )
+
     @override
-    async def get_movies(self):
-        async with async_playwright() as p:
-            browser, page = await self.setup_browser_and_open_page(p)
+    async def get_movies(
+        self,
+        browser_pool: BrowserPool | None = None,
+        http_fetcher: HttpFetcher | None = None,
+    ) -> list[Movie]:
+        """
+        Orquesta el scraping del CCPUCP: cosecha de enlaces y detalle en paralelo.
+
+        Args:
+            browser_pool: Pool de navegadores compartido de la corrida.
+            http_fetcher: Cliente HTTP compartido de la corrida.
+
+        Returns:
+            list[Movie]: Películas gratuitas con fecha vigente. Lista vacía si
+                         ocurre un error crítico.
+        """
+        if (movies_http := await self.try_http_engine(http_fetcher)) is not None:
+            return movies_http
 
+        movies: list[Movie] = []
+
+        async with self.setup_browser_and_open_page(browser_pool) as page:
             try:
-                _ = await page.goto(CCPUCP, wait_until="load")
+                logger.info("Iniciando scraping en CCPUCP.")
+                await page.goto(self.START_URL, wait_until="domcontentloaded")
 
-                movies_block = await page.locator("a.subCategoryImage").count()
+                category_urls = [
+                    link["href"]
+                    for link in await self._harvest_links(page, self.CATEGORY_LINK)
+                ]
 
-                movies_info: list[Movie] = []
+                detail_links = await self._harvest_detail_links(
+                    page.context, category_urls
+                )
+                logger.info(
+                    f"CCPUCP: {len(detail_links)} películas en "
+                    f"{len(category_urls)} categorías."
+                )
 
-                for movie_block in range(movies_block):
-                    await page.locator("a.subCategoryImage").nth(movie_block).click()
-                    await page.wait_for_load_state("load")
-                    movies = await page.locator(MOVIE_TITLE_SELECTOR).count()
+                listing_hash = content_hash(detail_links)
+                if (
+                    cached := self.reuse_unchanged_listing(self.START_URL, listing_hash)
+                ) is not None:
+                    return cached
 
-                    for movie in range(movies):
-                        if movie_info := await self._get_movies_info(movie, page):
-                            movies_info.append(movie_info)
-                        _ = await page.go_back(wait_until="load")
+                known, pending = self._pending_detail_links(detail_links)
 
-                    _ = await page.go_back(wait_until="load")
+                results = await self._visit_concurrently(
+                    page.context,
+                    [link["href"] for link in pending],
+                    lambda detail_page, index: self._extract_movie_info(
+                        detail_page, pending[index]["text"]
+                    ),
+                )
+                movies = known + [movie for movie in results if movie]
+                self.remember_listing(self.START_URL, listing_hash, movies)
 
-                return movies_info
+                logger.info("Scraping terminado en CCPUCP. Retornando películas.")
 
             except Exception as e:
-                print(e)
-                return [Movie()]
+                self.record_failure()
+                logger.error(f"Error en CCPUCP Scraper: {e}", exc_info=True)
 
-            finally:
-                await browser.close()
+        return movies
 
-    async def _get_movies_info(self, movie: int, page: Page):
-        try:
-            movie_obj = Movie()
+    @override
+    async def get_movies_via_http(self, http_fetcher: HttpFetcher) -> list[Movie]:
+        """
+        Mismo recorrido que con el navegador (listado, categorías y detalle),
+        descargando cada página con el cliente HTTP compartido.
+        """
+        logger.info("Iniciando scraping en CCPUCP (HTTP).")
+        listing = await http_fetcher.get_html(self.START_URL)
 
-            movie_title = (
-                await page.locator(MOVIE_TITLE_SELECTOR).nth(movie).inner_text()
+        category_urls = [
+            link["href"]
+            for link in self._links_from_html(
+                listing, self.CATEGORY_LINK, self.START_URL
             )
-            await page.locator(MOVIE_TITLE_SELECTOR).nth(movie).click()
-            await page.wait_for_load_state("load")
+        ]
+        if not category_urls:
+            raise NeedsBrowserError("El listado del CCPUCP llegó sin categorías.")
 
-            # Verificar si la película es con entradas
-            if await page.locator('p:has(span b:has-text("ENTRADAS"))').count() > 0:
-                return None
+        per_category = await self._fetch_concurrently(
+            http_fetcher,
+            category_urls,
+            lambda soup, index: self._links_from_html(
+                soup, self.MOVIE_TITLE_SELECTOR, category_urls[index]
+            ),
+        )
+        detail_links = self._dedupe_links(
+            [link for links in per_category if links for link in links]
+        )
+        logger.info(
+            f"CCPUCP: {len(detail_links)} películas en {len(category_urls)} categorías."
+        )
 
-            fecha_locator = page.locator(
-                'p:has(span strong:text("FUNCIONES")) span'
-            ).filter(
-                has_text=re.compile(
-                    r"(lunes|martes|miércoles|jueves|viernes|sábado|domingo)\s+\d{1,2}\s+de\s+\w+"
-                )
-            )
-            if date_exist := await fecha_locator.text_content():
-                date_object = self._parse_date_string(date_exist)
-
-                if date_object:
-                    clean_title = self._clean_title(movie_title)
-                    poster_url = get_movie_poster(clean_title)
-                    movie_obj.date = date_object
-                    movie_obj.title = clean_title
-                    movie_obj.location = "CCPUCP - Av. Camino Real 1075 (San Isidro)"
-                    movie_obj.center = "ccpucp"
-                    movie_obj.poster_url = poster_url
-                    movie_obj.source_url = page.url
-
-                    return movie_obj
-                else:
+        listing_hash = content_hash(detail_links)
+        if (
+            cached := self.reuse_unchanged_listing(self.START_URL, listing_hash)
+        ) is not None:
+            return cached
+
+        known, pending = self._pending_detail_links(detail_links)
+
+        results = await self._fetch_concurrently(
+            http_fetcher,
+            [link["href"] for link in pending],
+            lambda soup, index: self._movie_from_html(
+                soup, pending[index]["text"], pending[index]["href"]
+            ),
+        )
+        movies = known + [movie for movie in results if movie]
+        self.remember_listing(self.START_URL, listing_hash, movies)
+        return movies
+
+    async def _fetch_concurrently[T](
+        self,
+        http_fetcher: HttpFetcher,
+        urls: list[str],
+        parse: Callable[[BeautifulSoup, int], T],
+    ) -> list[T | None]:
+        """
+        Descarga una lista de URLs con a lo sumo `detail_concurrency` peticiones en
+        vuelo y aplica `parse` a cada una. Un fallo devuelve None en su posición.
+
+        Returns:
+            list[T | None]: Resultados en el mismo orden que `urls`.
+        """
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+
+        async def run(index: int, url: str) -> T | None:
+            async with semaphore:
+                try:
+                    return parse(await http_fetcher.get_html(url), index)
+                except Exception as e:
+                    self.record_failure()
+                    logger.warning(f"Error descargando {url} en CCPUCP: {e}")
                     return None
-            else:
+
+        return await asyncio.gather(
+            *(run(index, url) for index, url in enumerate(urls))
+        )
+
+    @staticmethod
+    def _links_from_html(
+        soup: BeautifulSoup, selector: str, base_url: str
+    ) -> list[dict[str, str]]:
+        """Equivalente de `_harvest_links` sobre HTML ya descargado (href absoluto)."""
+        return [
+            {
+                "href": urljoin(base_url, str(element.get("href", ""))),
+                "text": element.get_text().strip(),
+            }
+            for element in soup.select(selector)
+            if element.get("href")
+        ]
+
+    def _movie_from_html(
+        self, soup: BeautifulSoup, movie_title: str, source_url: str
+    ) -> Movie | None:
+        """Equivalente de `_extract_movie_info` sobre HTML ya descargado."""
+        # Verificar si la película es con entradas
+        if any(
+            self.TICKETS_KEYWORD in bold.get_text().upper()
+            for bold in soup.select("p span b")
+        ):
+            return None
+
+        for paragraph in soup.select("p"):
+            if not any(
+                self.SCHEDULE_KEYWORD in strong.get_text().upper()
+                for strong in paragraph.select("span strong")
+            ):
+                continue
+
+            for span in paragraph.select("span"):
+                raw_date = span.get_text()
+                if self.SCHEDULE_PATTERN.search(raw_date):
+                    return self._build_movie(raw_date, movie_title, source_url)
+
+        return None
+
+    async def _harvest_links(self, page: Page, selector: str) -> list[dict[str, str]]:
+        """
+        Recoge en una sola llamada al navegador los enlaces (href y texto) de un selector.
+        """
+        return await page.eval_on_selector_all(selector, self.HARVEST_LINKS_JS)
+
+    async def _harvest_detail_links(
+        self, context: BrowserContext, category_urls: list[str]
+    ) -> list[dict[str, str]]:
+        """
+        Visita las categorías en paralelo y devuelve los enlaces de detalle de
+        todas ellas, sin duplicados y en el orden en que aparecen.
+        """
+        per_category = await self._visit_concurrently(
+            context,
+            category_urls,
+            lambda category_page, _: self._harvest_links(
+                category_page, self.MOVIE_TITLE_SELECTOR
+            ),
+        )
+
+        return self._dedupe_links(
+            [link for links in per_category if links for link in links]
+        )
+
+    async def _visit_concurrently[T](
+        self,
+        context: BrowserContext,
+        urls: list[str],
+        visit: Callable[[Page, int], Awaitable[T]],
+    ) -> list[T | None]:
+        """
+        Visita una lista de URLs con un pool de páginas reutilizables.
+
+        Se abren a lo sumo `detail_concurrency` páginas; cada una toma la siguiente
+        URL pendiente, navega y ejecuta `visit`. Un fallo en una URL se registra y
+        se devuelve None en su posición, sin afectar a las demás.
+
+        Returns:
+            list[T | None]: Resultados en el mismo orden que `urls`.
+        """
+        if not urls:
+            return []
+
+        pages: asyncio.Queue[Page] = asyncio.Queue()
+        for _ in range(min(self.detail_concurrency, len(urls))):
+            pages.put_nowait(await context.new_page())
+
+        async def run(index: int, url: str) -> T | None:
+            page = await pages.get()
+            try:
+                await page.goto(url, wait_until="domcontentloaded")
+                return await visit(page, index)
+            except Exception as e:
+                self.record_failure()
+                logger.warning(f"Error visitando {url} en CCPUCP: {e}")
                 return None
+            finally:
+                pages.put_nowait(page)
+
+        try:
+            return await asyncio.gather(
+                *(run(index, url) for index, url in enumerate(urls))
+            )
+        finally:
+            while not pages.empty():
+                await pages.get_nowait().close()
 
-        except Exception as e:
-            print(e)
+    async def _extract_movie_info(self, page: Page, movie_title: str) -> Movie | None:
+        """
+        Extrae la función de una página de detalle ya cargada.
+
+        Args:
+            page: Página de detalle de la película.
+            movie_title: Título crudo tomado del listado de la categoría.
+
+        Returns:
+            Movie | None: La película si es gratuita y tiene una fecha vigente.
+        """
+        # Verificar si la película es con entradas
+        if await page.locator(self.TICKETS_SELECTOR).count() > 0:
+            return None
+
+        schedule = (
+            page.locator(self.SCHEDULE_SELECTOR)
+            .filter(has_text=self.SCHEDULE_PATTERN)
+            .first
+        )
+        if not await schedule.count():
+            return None
+
+        raw_date = await schedule.text_content()
+        if not raw_date:
+            return None
+
+        return self._build_movie(raw_date, movie_title, page.url)
+
+    def _build_movie(
+        self, raw_date: str, movie_title: str, source_url: str
+    ) -> Movie | None:
+        """Construye la película a partir del horario crudo; None si ya pasó."""
+        date_object = self._parse_date_string(raw_date)
+        if not date_object:
+            return None
+
+        clean_title = self._clean_title(movie_title)
+        known = self.known_movie(clean_title, date_object)
+
+        movie = Movie(
+            title=clean_title,
+            location=self.CENTER_LOCATION,
+            date=date_object,
+            center=self.CENTER_SLUG,
+            poster_url=known.poster_url if known else None,
+            poster_path=known.poster_path if known else None,
+            source_url=source_url,
+        )
+        self.collect_partial(movie)
+        return movie
 
     def _parse_date_string(self, date_str: str) -> datetime | None:
+        """
+        Parsea fechas con formato "lunes 12 de enero | 7:00 p.m.".
+
+        Retorna None si el texto no tiene ese formato o la fecha ya pasó.
+        """
         parts = date_str.split("|")
         if len(parts) != 2:
             return None
@@ -95,12 +430,40 @@ class CcpucpScraper(ScraperInterface):
         fecha_tokens = parts[0].split()
         hora_str = parts[1]
 
+        if len(fecha_tokens) < 4:
+            return None
+
         return self.validate_and_build_date(
             day=int(fecha_tokens[1]), month_str=fecha_tokens[3], time_str=hora_str
         )
 
+    def _pending_detail_links(
+        self, detail_links: list[dict[str, str]]
+    ) -> tuple[list[Movie], list[dict[str, str]]]:
+        """
+        Separa los detalles ya guardados en la BD (se devuelven sus funciones)
+        de los que hay que visitar.
+        """
+        known, pending_urls = self.partition_known_urls(
+            [link["href"] for link in detail_links]
+        )
+        pending = set(pending_urls)
+        return known, [link for link in detail_links if link["href"] in pending]
+
+    @staticmethod
+    def _dedupe_links(links: list[dict[str, str]]) -> list[dict[str, str]]:
+        """Elimina enlaces repetidos (por href) conservando el primer orden de aparición."""
+        seen: set[str] = set()
+        unique: list[dict[str, str]] = []
+        for link in links:
+            if link["href"] and link["href"] not in seen:
+                seen.add(link["href"])
+                unique.append(link)
+        return unique
+
     @staticmethod
-    def _clean_title(movie_title: str):
+    def _clean_title(movie_title: str) -> str:
+        """Pasa el título (que viene en mayúsculas) a formato oración."""
         movie = movie_title.lower()
         movie_words = movie.split()
         movie_words[0] = movie_words[0].capitalize()
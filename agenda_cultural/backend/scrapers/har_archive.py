@@ -0,0 +1,245 @@
+"""
+Archivo HAR para corridas de scraping reproducibles sin red.
+
+La variable SCRAPER_MODE define cómo se relacionan los scrapers con la red:
+    live    -> Corrida normal contra los sitios reales (por defecto).
+    record  -> Igual que live, pero se archiva todo el tráfico en un HAR por centro.
+    replay  -> Se sirve el HAR archivado y la red queda deshabilitada: cualquier
+               petición que no esté en el archivo se aborta.
+
+Los archivos se versionan por centro y fecha dentro de SCRAPER_HAR_DIR (har/):
+
+    har/<centro>/<AAAA-MM-DD>.har        Tráfico del navegador (Playwright)
+    har/<centro>/<AAAA-MM-DD>.http.har   Tráfico del motor HTTP (httpx)
+
+En replay se usa la fecha de SCRAPER_HAR_DATE o, si no está definida, la más
+reciente archivada para el centro. Esa fecha también hace de "hoy" al validar
+las funciones, para que el resultado no cambie según el día en que se reproduce.
+"""
+
+import base64
+import json
+import os
+import re
+from datetime import UTC, date, datetime
+from enum import StrEnum
+from pathlib import Path
+
+import httpx
+
+from agenda_cultural.backend.log_config import get_task_logger
+from agenda_cultural.backend.scrapers.http_engine import ScraperEngine
+
+logger = get_task_logger("har_archive", "scraping.log")
+
+HAR_FILE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})(\.http)?\.har$")
+
+
+class ScraperMode(StrEnum):
+    """Relación de los scrapers con la red durante la corrida."""
+
+    LIVE = "live"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+def scraper_mode() -> ScraperMode:
+    """Modo configurado en SCRAPER_MODE (live por defecto)."""
+    try:
+        return ScraperMode(os.getenv("SCRAPER_MODE", "live").strip().lower())
+    except ValueError:
+        return ScraperMode.LIVE
+
+
+def har_root() -> Path:
+    """Directorio raíz del archivo HAR."""
+    return Path(os.getenv("SCRAPER_HAR_DIR", "har"))
+
+
+def archive_date(center: str) -> date | None:
+    """
+    Fecha del archivo que se graba o reproduce para un centro.
+
+    En record es la de hoy (o SCRAPER_HAR_DATE). En replay es SCRAPER_HAR_DATE o
+    la más reciente archivada; None si el centro no tiene nada archivado.
+    """
+    if explicit := os.getenv("SCRAPER_HAR_DATE"):
+        return date.fromisoformat(explicit)
+
+    if scraper_mode() is not ScraperMode.REPLAY:
+        return date.today()
+
+    center_dir = har_root() / center
+    if not center_dir.is_dir():
+        return None
+
+    dates = [
+        match.group(1)
+        for entry in center_dir.iterdir()
+        if (match := HAR_FILE_PATTERN.match(entry.name))
+    ]
+    return date.fromisoformat(max(dates)) if dates else None
+
+
+def archive_path(center: str, engine: ScraperEngine) -> Path | None:
+    """Ruta del HAR de un centro y motor para la fecha de la corrida."""
+    day = archive_date(center)
+    if day is None:
+        return None
+
+    suffix = ".http.har" if engine is ScraperEngine.HTTP else ".har"
+    return har_root() / center / f"{day.isoformat()}{suffix}"
+
+
+def reference_now(center: str) -> datetime:
+    """
+    El "ahora" con el que se validan las fechas de las funciones.
+
+    En replay es la medianoche de la fecha archivada; en otro caso, la hora actual.
+    """
+    if scraper_mode() is ScraperMode.REPLAY and (day := archive_date(center)):
+        return datetime(day.year, day.month, day.day)
+    return datetime.now()
+
+
+def http_transport(center: str, verify: bool = True) -> httpx.AsyncBaseTransport | None:
+    """
+    Transporte de httpx que graba o reproduce el HAR HTTP del centro. Al grabar,
+    `verify` indica si se validan los certificados TLS (ver `HttpFetcher`).
+
+    Returns:
+        httpx.AsyncBaseTransport | None: None en live, o en replay si el centro
+            no tiene tráfico HTTP archivado (hay que usar el navegador).
+    """
+    mode = scraper_mode()
+    if mode is ScraperMode.LIVE:
+        return None
+
+    path = archive_path(center, ScraperEngine.HTTP)
+    if path is None:
+        return None
+
+    if mode is ScraperMode.RECORD:
+        return HarRecordingTransport(path, verify=verify)
+
+    if not path.exists():
+        return None
+    return HarReplayTransport(path)
+
+
+def _headers_to_har(headers: httpx.Headers) -> list[dict[str, str]]:
+    return [{"name": name, "value": value} for name, value in headers.multi_items()]
+
+
+class HarRecordingTransport(httpx.AsyncBaseTransport):
+    """Transporte que hace las peticiones reales y escribe un HAR al cerrarse."""
+
+    def __init__(
+        self,
+        path: Path,
+        inner: httpx.AsyncBaseTransport | None = None,
+        verify: bool = True,
+    ):
+        self.path = path
+        self._inner = inner or httpx.AsyncHTTPTransport(verify=verify)
+        self._entries: list[dict] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = datetime.now(UTC)
+        response = await self._inner.handle_async_request(request)
+
+        # Cuerpo tal como llegó (comprimido si aplica); httpx lo decodifica después
+        body = await response.aread()
+        await response.aclose()
+
+        self._entries.append(
+            {
+                "startedDateTime": started.isoformat(),
+                "time": (datetime.now(UTC) - started).total_seconds() * 1000,
+                "request": {
+                    "method": request.method,
+                    "url": str(request.url),
+                    "httpVersion": "HTTP/1.1",
+                    "headers": _headers_to_har(request.headers),
+                    "queryString": [],
+                    "cookies": [],
+                    "headersSize": -1,
+                    "bodySize": len(request.content),
+                },
+                "response": {
+                    "status": response.status_code,
+                    "statusText": response.reason_phrase,
+                    "httpVersion": "HTTP/1.1",
+                    "headers": _headers_to_har(response.headers),
+                    "cookies": [],
+                    "content": {
+                        "size": len(body),
+                        "mimeType": response.headers.get("content-type", ""),
+                        "text": base64.b64encode(body).decode("ascii"),
+                        "encoding": "base64",
+                    },
+                    "redirectURL": response.headers.get("location", ""),
+                    "headersSize": -1,
+                    "bodySize": len(body),
+                },
+                "cache": {},
+                "timings": {"send": 0, "wait": 0, "receive": 0},
+            }
+        )
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "agenda-cultural", "version": "1"},
+                "entries": self._entries,
+            }
+        }
+        self.path.write_text(json.dumps(har, ensure_ascii=False))
+        logger.info(f"HAR grabado: {self.path} ({len(self._entries)} peticiones).")
+
+
+class HarReplayTransport(httpx.AsyncBaseTransport):
+    """Transporte que responde desde un HAR y nunca sale a la red."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        entries = json.loads(path.read_text())["log"]["entries"]
+        # Si una URL se pidió varias veces, se conserva la primera respuesta
+        self._responses: dict[tuple[str, str], dict] = {}
+        for entry in entries:
+            key = (entry["request"]["method"], entry["request"]["url"])
+            self._responses.setdefault(key, entry["response"])
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        recorded = self._responses.get((request.method, str(request.url)))
+        if recorded is None:
+            raise httpx.ConnectError(
+                f"{request.url} no está en {self.path} (red deshabilitada).",
+                request=request,
+            )
+
+        content = recorded["content"]
+        text = content.get("text", "")
+        body = (
+            base64.b64decode(text)
+            if content.get("encoding") == "base64"
+            else text.encode("utf-8")
+        )
+
+        return httpx.Response(
+            status_code=recorded["status"],
+            headers=[(h["name"], h["value"]) for h in recorded["headers"]],
+            content=body,
+            request=request,
+        )
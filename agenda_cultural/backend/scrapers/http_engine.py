@@ -0,0 +1,209 @@
+"""
+Motor HTTP de los scrapers: `httpx` + parser HTML, sin navegador.
+
+Varios centros culturales publican su cartelera en HTML renderizado en el
+servidor (el Drupal del LUM, el Joomla del CCPUCP). Para leer ese texto no hace
+falta arrancar Chromium: basta una petición HTTP y un parser. Este módulo ofrece:
+
+- `ScraperEngine`: los motores con los que un scraper declara que sabe trabajar.
+- `HttpFetcher`: un `httpx.AsyncClient` con pool de conexiones compartido por
+  todos los scrapers de la corrida, que devuelve el HTML ya parseado.
+- `NeedsBrowserError`: la señal de que una página necesita JavaScript y hay
+  que volver a intentarlo con Playwright.
+- `inner_text`: equivalente aproximado del `innerText` del navegador.
+
+La elección del motor se controla con SCRAPER_ENGINE:
+    auto     -> HTTP primero y Playwright como respaldo (por defecto).
+    http     -> Solo HTTP, sin respaldo (útil para medir el motor).
+    browser  -> Solo Playwright.
+"""
+
+import os
+import re
+from enum import StrEnum
+from typing import ClassVar
+
+import httpx
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import Comment
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.log_config import get_task_logger
+from agenda_cultural.backend.scrapers.listing_cache import ListingCache
+
+logger = get_task_logger("http_engine", "scraping.log")
+
+
+class ScraperEngine(StrEnum):
+    """Motores con los que un scraper puede obtener sus páginas."""
+
+    HTTP = "http"
+    BROWSER = "browser"
+
+
+class NeedsBrowserError(Exception):
+    """La página no trae el contenido esperado sin ejecutar JavaScript."""
+
+
+def engine_mode() -> str:
+    """Modo de selección de motor configurado en SCRAPER_ENGINE (auto por defecto)."""
+    mode = os.getenv("SCRAPER_ENGINE", "auto").strip().lower()
+    return mode if mode in ("auto", "http", "browser") else "auto"
+
+
+def max_connections_from_env() -> int:
+    """Conexiones simultáneas del cliente HTTP: SCRAPER_HTTP_MAX_CONNECTIONS (10)."""
+    try:
+        return int(os.getenv("SCRAPER_HTTP_MAX_CONNECTIONS", "10"))
+    except ValueError:
+        logger.warning("SCRAPER_HTTP_MAX_CONNECTIONS no es un entero; se usa 10.")
+        return 10
+
+
+class HttpFetcher:
+    """
+    Cliente HTTP compartido que descarga y parsea páginas HTML.
+
+    Se usa como context manager asíncrono; al salir se cierran las conexiones:
+
+        async with HttpFetcher() as fetcher:
+            soup = await fetcher.get_html("https://lum.cultura.pe/actividades")
+    """
+
+    DEFAULT_HEADERS: ClassVar[dict[str, str]] = {
+        "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "es-PE,es;q=0.9",
+    }
+
+    def __init__(
+        self,
+        user_agent: str | None = None,
+        max_connections: int | None = None,
+        timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        verify: bool = True,
+    ):
+        """
+        Args:
+            user_agent (str, optional): User-Agent de las peticiones.
+            max_connections (int, optional): Conexiones simultáneas del pool.
+                Por defecto SCRAPER_HTTP_MAX_CONNECTIONS (10).
+            timeout (float): Tiempo máximo por petición, en segundos.
+            transport (httpx.AsyncBaseTransport, optional): Transporte alternativo
+                (por ejemplo, uno de pruebas).
+            verify (bool): Si se validan los certificados TLS. Solo lo apaga el
+                scraper de un sitio con una cadena incompleta (`VERIFY_TLS`).
+        """
+        self.max_connections = max(1, max_connections or max_connections_from_env())
+
+        self._headers = dict(self.DEFAULT_HEADERS)
+        if user_agent:
+            self._headers["User-Agent"] = user_agent
+        self._timeout = timeout
+        self._transport = transport
+        self._verify = verify
+        self._client: httpx.AsyncClient | None = None
+
+        # Estadísticas de la corrida
+        self.requests = 0
+        self.bytes_received = 0
+
+    async def __aenter__(self) -> "HttpFetcher":
+        self._client = httpx.AsyncClient(
+            headers=self._headers,
+            timeout=self._timeout,
+            follow_redirects=True,
+            verify=self._verify,
+            limits=httpx.Limits(max_connections=self.max_connections),
+            transport=self._transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Cierra las conexiones del pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_html(self, url: str) -> BeautifulSoup:
+        """
+        Descarga una página y la devuelve parseada.
+
+        Raises:
+            httpx.HTTPError: Si la petición falla o responde con un código de error.
+            NeedsBrowserError: Si la respuesta no es HTML.
+        """
+        return self._parse(url, await self._get(url))
+
+    async def get_html_if_modified(
+        self, url: str, cache: ListingCache | None
+    ) -> BeautifulSoup | None:
+        """
+        GET condicional con los validadores (ETag / Last-Modified) de la caché.
+
+        Returns:
+            BeautifulSoup | None: La página parseada, o None si el servidor
+                respondió 304 (el listado no cambió desde la corrida anterior).
+        """
+        if cache is None:
+            return await self.get_html(url)
+
+        response = await self._get(url, cache.conditional_headers(url))
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            metrics.increment("http.not_modified")
+            return None
+
+        soup = self._parse(url, response)
+        cache.remember_validators(
+            url, response.headers.get("etag"), response.headers.get("last-modified")
+        )
+        return soup
+
+    async def _get(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        if self._client is None:
+            raise RuntimeError("El HttpFetcher debe usarse dentro de 'async with'.")
+
+        response = await self._client.get(url, headers=headers)
+
+        # Bytes tal como llegaron por la red (comprimidos si el servidor usa gzip)
+        received = response.num_bytes_downloaded
+        self.requests += 1
+        self.bytes_received += received
+        metrics.increment("http.requests")
+        metrics.increment("http.bytes_received", received)
+
+        logger.debug(f"GET {url} -> {response.status_code} ({received} B)")
+        return response
+
+    @staticmethod
+    def _parse(url: str, response: httpx.Response) -> BeautifulSoup:
+        response.raise_for_status()
+
+        content_type = response.headers.get("content-type", "text/html")
+        if "html" not in content_type:
+            raise NeedsBrowserError(f"{url} respondió {content_type}, no HTML.")
+
+        return BeautifulSoup(response.text, "html.parser")
+
+
+def inner_text(element: Tag) -> str:
+    """
+    Texto de un elemento con los <br> como saltos de línea, como `innerText`.
+
+    Los espacios en blanco del HTML se colapsan en uno solo, igual que al
+    renderizar; solo los <br> producen saltos de línea.
+    """
+    parts: list[str] = []
+    for node in element.descendants:
+        if isinstance(node, Comment):
+            continue
+        if isinstance(node, NavigableString):
+            parts.append(re.sub(r"\s+", " ", str(node)))
+        elif isinstance(node, Tag) and node.name == "br":
+            parts.append("\n")
+    return "".join(parts)
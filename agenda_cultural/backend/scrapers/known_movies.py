@@ -0,0 +1,83 @@
+"""
+Funciones ya guardadas en la base de datos, para el scraping incremental.
+
+Antes de la fase de detalle, el servicio de scraping lee de la BD las funciones
+futuras de cada centro y se las entrega a su scraper como un `KnownMovies`:
+
+- Por `source_url`: si una página de detalle ya está en la BD, no hace falta
+  cargarla; se devuelve la copia guardada.
+- Por firma `(center, title, date)`: si la función ya existe, se reutiliza su
+  póster en lugar de volver a consultar TMDB.
+
+Cada cierto tiempo conviene ignorar lo conocido y recorrerlo todo (por ejemplo,
+si un centro corrigió una sede). Esa corrida completa ocurre el día de la semana
+SCRAPER_FULL_REFRESH_WEEKDAY (0 = lunes ... 6 = domingo; por defecto 6) o
+cuando se define SCRAPER_FULL_REFRESH=true.
+"""
+
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from agenda_cultural.backend.models import Movie
+
+Signature = tuple[str, str, datetime]
+
+
+def full_refresh_due(now: datetime) -> bool:
+    """Indica si esta corrida debe ignorar lo conocido y recorrer todo."""
+    if os.getenv("SCRAPER_FULL_REFRESH", "false").lower() == "true":
+        return True
+    weekday = os.getenv("SCRAPER_FULL_REFRESH_WEEKDAY", "6")
+    return weekday.isdigit() and now.weekday() == int(weekday)
+
+
+@dataclass
+class KnownMovies:
+    """Funciones futuras de un centro que ya están en la base de datos."""
+
+    by_url: dict[str, list[Movie]] = field(default_factory=dict)
+    by_signature: dict[Signature, Movie] = field(default_factory=dict)
+    full_refresh: bool = False
+
+    @classmethod
+    def from_movies(cls, movies: list[Movie]) -> "KnownMovies":
+        """Indexa las películas de la BD por URL de origen y por firma."""
+        by_url: defaultdict[str, list[Movie]] = defaultdict(list)
+        by_signature: dict[Signature, Movie] = {}
+
+        for stored in movies:
+            # Copias sin id: lo que devuelva el scraper nunca es una fila de la BD
+            movie = Movie(
+                title=stored.title,
+                location=stored.location,
+                date=stored.date,
+                center=stored.center,
+                poster_url=stored.poster_url,
+                poster_path=stored.poster_path,
+                source_url=stored.source_url,
+            )
+            if movie.source_url:
+                by_url[movie.source_url].append(movie)
+            by_signature[(movie.center, movie.title, movie.date)] = movie
+
+        return cls(by_url=dict(by_url), by_signature=by_signature)
+
+    def movies_for_url(self, url: str) -> list[Movie] | None:
+        """Las funciones guardadas de una página de detalle, o None si es nueva."""
+        if self.full_refresh:
+            return None
+        return self.by_url.get(url)
+
+    def movie_for_signature(
+        self, center: str, title: str, date: datetime
+    ) -> Movie | None:
+        """La función guardada con esa firma, o None si es nueva."""
+        if self.full_refresh:
+            return None
+        return self.by_signature.get((center, title, date))
+
+
+# Sin datos de la BD (por ejemplo, al depurar un scraper aislado) nada es conocido
+NO_KNOWN_MOVIES = KnownMovies()
@@ -0,0 +1,210 @@
+"""
+Caché persistente de validadores HTTP para los listados de cartelera.
+
+La mayoría de noches la agenda mensual del LUM, el listado de Bibliocine de la
+BNP y la página de cine del CCPUCP no cambian. Para no repetir el detalle (ni
+las consultas a TMDB) de un listado idéntico, la caché guarda por URL:
+
+- Los validadores HTTP (`ETag` y `Last-Modified`), para hacer GET condicionales
+  desde el motor HTTP y recibir un 304 sin descargar la página.
+- Un hash del contenido relevante del listado (lo que el scraper extrae de él,
+  no el HTML crudo, que suele traer tokens o marcas de tiempo que cambian).
+- Las películas extraídas la última vez que ese listado se procesó.
+
+Si el listado no cambió, el scraper reutiliza esas películas (descartando las que
+ya pasaron) y se salta la fase de detalle. Solo se guarda un listado cuyo detalle
+se extrajo sin fallos, y una entrada con más de SCRAPER_CACHE_MAX_AGE_DAYS (7)
+días no se reutiliza: el detalle se vuelve a extraer y la entrada se renueva.
+Los validadores de una respuesta se guardan junto con su hash y sus películas
+(`store`): si el detalle falla, la próxima corrida no manda un GET condicional
+que el servidor respondería con un 304 sobre películas de otra versión.
+
+El archivo vive en SCRAPER_CACHE_PATH (.cache/listing_cache.json) y se desactiva
+con SCRAPER_LISTING_CACHE=off. Al grabar o reproducir HAR la caché no se usa,
+para que la corrida sea completa.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, TypedDict
+
+from agenda_cultural.backend.log_config import get_task_logger
+from agenda_cultural.backend.models import Movie
+
+logger = get_task_logger("listing_cache", "scraping.log")
+
+
+class CacheEntry(TypedDict, total=False):
+    """Lo que se recuerda de un listado entre corridas."""
+
+    etag: str
+    last_modified: str
+    content_hash: str
+    movies: list[dict[str, Any]]
+    updated_at: str
+
+
+def content_hash(data: Any) -> str:
+    """Hash estable (SHA-256) de cualquier estructura serializable a JSON."""
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def listing_cache_enabled() -> bool:
+    """La caché se usa salvo que se desactive o se esté grabando/reproduciendo HAR."""
+    if os.getenv("SCRAPER_LISTING_CACHE", "on").lower() in ("off", "0", "false"):
+        return False
+    return os.getenv("SCRAPER_MODE", "live").lower() not in ("record", "replay")
+
+
+def listing_cache_max_age() -> timedelta:
+    """Antigüedad máxima de una entrada reutilizable: SCRAPER_CACHE_MAX_AGE_DAYS (7)."""
+    try:
+        return timedelta(days=float(os.getenv("SCRAPER_CACHE_MAX_AGE_DAYS", "7")))
+    except ValueError:
+        return timedelta(days=7)
+
+
+def is_fresh(entry: CacheEntry) -> bool:
+    """True si la entrada se guardó hace menos de SCRAPER_CACHE_MAX_AGE_DAYS."""
+    try:
+        updated_at = datetime.fromisoformat(entry["updated_at"])
+    except (KeyError, ValueError):
+        return False
+    return datetime.now() - updated_at <= listing_cache_max_age()
+
+
+class ListingCache:
+    """Caché de listados respaldada por un archivo JSON."""
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(
+            path or os.getenv("SCRAPER_CACHE_PATH", ".cache/listing_cache.json")
+        ).expanduser()
+        self._entries: dict[str, CacheEntry] | None = None
+        # Validadores de respuestas cuyo listado aún no se guardó (`store`)
+        self._pending_validators: dict[str, CacheEntry] = {}
+
+    @property
+    def entries(self) -> dict[str, CacheEntry]:
+        """Entradas de la caché, leídas del disco la primera vez que se piden."""
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> dict[str, CacheEntry]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Caché de listados ilegible ({self.path}): {e}")
+            return {}
+
+    def save(self) -> None:
+        """Escribe la caché completa en disco."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, ensure_ascii=False, indent=1))
+
+    # --- Validadores HTTP ---
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Cabeceras If-None-Match / If-Modified-Since para un GET condicional."""
+        entry = self.entries.get(url, {})
+        headers: dict[str, str] = {}
+        # Sin películas guardadas (o ya vencidas) un 304 no serviría de nada:
+        # pedimos la página
+        if not entry.get("movies") or not is_fresh(entry):
+            return headers
+        if etag := entry.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := entry.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def remember_validators(
+        self, url: str, etag: str | None, last_modified: str | None
+    ) -> None:
+        """
+        Anota los validadores de la última respuesta 200 del listado. Quedan
+        pendientes hasta que `store` guarde las películas de esa respuesta.
+        """
+        validators: CacheEntry = {}
+        if etag:
+            validators["etag"] = etag
+        if last_modified:
+            validators["last_modified"] = last_modified
+        self._pending_validators[url] = validators
+
+    # --- Contenido y películas ---
+
+    def is_unchanged(self, url: str, listing_hash: str) -> bool:
+        """
+        True si el listado tiene el mismo hash que la última vez que se procesó
+        y esa entrada aún no vence.
+        """
+        entry = self.entries.get(url)
+        return bool(
+            entry and entry.get("content_hash") == listing_hash and is_fresh(entry)
+        )
+
+    def reuse(self, url: str, now: datetime) -> list[Movie]:
+        """
+        Películas guardadas del listado, sin las que ya se proyectaron.
+
+        Args:
+            url: Listado del que se extrajeron.
+            now: Referencia para descartar funciones pasadas.
+        """
+        midnight_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        movies = [
+            self._movie_from_dict(data)
+            for data in self.entries.get(url, {}).get("movies", [])
+        ]
+        return [movie for movie in movies if movie.date >= midnight_today]
+
+    def store(self, url: str, listing_hash: str, movies: list[Movie]) -> None:
+        """
+        Guarda el hash del listado, sus películas y los validadores de la
+        respuesta de la que salieron (los anteriores ya no valen), y persiste la
+        caché.
+        """
+        entry = self.entries.setdefault(url, {})
+        entry.pop("etag", None)
+        entry.pop("last_modified", None)
+        entry.update(self._pending_validators.pop(url, {}))
+        entry["content_hash"] = listing_hash
+        entry["movies"] = [self._movie_to_dict(movie) for movie in movies]
+        entry["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        self.save()
+
+    @staticmethod
+    def _movie_to_dict(movie: Movie) -> dict[str, Any]:
+        return {
+            "title": movie.title,
+            "location": movie.location,
+            "date": movie.date.isoformat(),
+            "center": movie.center,
+            "poster_url": movie.poster_url,
+            "poster_path": movie.poster_path,
+            "source_url": movie.source_url,
+        }
+
+    @staticmethod
+    def _movie_from_dict(data: dict[str, Any]) -> Movie:
+        return Movie(
+            title=data["title"],
+            location=data["location"],
+            date=datetime.fromisoformat(data["date"]),
+            center=data["center"],
+            poster_url=data.get("poster_url"),
+            poster_path=data.get("poster_path"),
+            source_url=data.get("source_url"),
+        )
+
+
+# Instancia compartida por todos los scrapers del proceso
+listing_cache = ListingCache()
@@ -1,5 +1,6 @@
 from .scraper import LumScraper
 
-get_lum_movies = LumScraper().get_movies
+lum_scraper = LumScraper()
+get_lum_movies = lum_scraper.get_movies
 
-__all__ = ["get_lum_movies"]
+__all__ = ["get_lum_movies", "lum_scraper"]
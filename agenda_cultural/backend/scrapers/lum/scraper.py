@@ -6,6 +6,11 @@ desde la agenda oficial del LUM.
 
 TARGET URL: https://lum.cultura.pe/actividades
 
+MOTOR:
+La agenda es HTML renderizado por Drupal, así que primero se intenta con el motor
+HTTP (httpx + BeautifulSoup). Si el sitio responde con un reto anti-bot o sin los
+bloques esperados, se repite el recorrido con Playwright (con playwright-stealth).
+
 ESTRATEGIA DE NAVEGACIÓN:
 1. Identificación de Bloques: Escanea la página principal buscando bloques de actividades.
 2. Filtrado Inteligente:
@@ -18,6 +23,11 @@ El HTML del LUM tiene las siguientes particularidades:
 - Los eventos no están en contenedores <div> individuales.
 - Se presentan como una secuencia de párrafos (<p>) con etiquetas <br>.
 - Se utiliza la etiqueta <strong> como ancla principal para detectar títulos.
+- Todos los párrafos se leen en una sola llamada al navegador (texto + indicador de
+  <strong>); las heurísticas posteriores corren en Python puro sobre esa instantánea.
+  El motor HTTP construye la misma instantánea a partir del HTML descargado.
+- Si la agenda no cambió desde la corrida anterior (304 o mismo hash de la
+  instantánea) se reutilizan las películas guardadas en la caché de listados.
 
 LÓGICA HEURÍTICA:
 - Detección de Cine:
@@ -31,20 +41,35 @@ LÓGICA HEURÍTICA:
 
 import re
 from datetime import datetime
-from typing import ClassVar, Pattern, override
+from typing import ClassVar, Pattern, TypedDict, override
+from urllib.parse import urljoin
 
-from playwright.async_api import Locator, Page, async_playwright
+from playwright.async_api import BrowserContext, Locator, Page
 from playwright_stealth import Stealth
 
 from agenda_cultural.backend.constants import MAPA_MESES
 from agenda_cultural.backend.log_config import get_task_logger
 from agenda_cultural.backend.models import Movie
 from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
-from agenda_cultural.backend.services.tmdb_service import get_movie_poster
+from agenda_cultural.backend.scrapers.browser_pool import BrowserPool
+from agenda_cultural.backend.scrapers.http_engine import (
+    HttpFetcher,
+    NeedsBrowserError,
+    ScraperEngine,
+    inner_text,
+)
+from agenda_cultural.backend.scrapers.listing_cache import content_hash
 
 logger = get_task_logger("lum_scraper", "scraping.log")
 
 
+class ParagraphSnapshot(TypedDict):
+    """Texto de un párrafo de la agenda y si contiene alguna etiqueta <strong>."""
+
+    text: str
+    has_strong: bool
+
+
 class LumScraper(ScraperInterface):
     START_URL: ClassVar[str] = "https://lum.cultura.pe/actividades"
     MOVIE_KEYWORDS: ClassVar[tuple[str, ...]] = (
@@ -57,6 +82,9 @@ class LumScraper(ScraperInterface):
     CENTER_LOCATION: ClassVar[str] = (
         "Lugar de la Memoria - Bajada San Martín 151 (Miraflores)"
     )
+    SUPPORTED_ENGINES: ClassVar[frozenset[ScraperEngine]] = frozenset(
+        {ScraperEngine.HTTP, ScraperEngine.BROWSER}
+    )
 
     # Los selectores de la página principal de actividades
     EVENT_TITLE: ClassVar[str] = ".views-field-title a"
@@ -64,6 +92,14 @@ class LumScraper(ScraperInterface):
     # Los selectores de los párrafos donde está el contenido de las películas
     PARAGRAPH_SELECTOR: ClassVar[str] = ".field-item p"
 
+    # Serializa todos los párrafos de la agenda en una sola llamada al navegador
+    PARAGRAPHS_JS: ClassVar[str] = """
+        paragraphs => paragraphs.map(p => ({
+            text: p.innerText,
+            has_strong: p.querySelector("strong") !== null,
+        }))
+    """
+
     # Captura de texto entre comillas, con soporte para tipográficas y rectas
     TITLE_PATTERN: Pattern[str] = re.compile(
         r"""
@@ -133,12 +169,17 @@ class LumScraper(ScraperInterface):
     )
 
     @override
-    async def get_movies(self):
-        movies: list[Movie] = []
+    async def get_movies(
+        self,
+        browser_pool: BrowserPool | None = None,
+        http_fetcher: HttpFetcher | None = None,
+    ) -> list[Movie]:
+        if (movies_http := await self.try_http_engine(http_fetcher)) is not None:
+            return movies_http
 
-        async with Stealth().use_async(async_playwright()) as p:
-            browser, page = await self.setup_browser_and_open_page(p)
+        movies: list[Movie] = []
 
+        async with self.setup_browser_and_open_page(browser_pool) as page:
             try:
                 await page.goto(
                     self.START_URL, wait_until="domcontentloaded", timeout=60000
@@ -149,13 +190,7 @@ class LumScraper(ScraperInterface):
                 for index, block in enumerate(activity_blocks):
                     title_clean = await self._extract_activity_title(block)
 
-                    if not title_clean:
-                        continue
-
-                    if "semanal" in title_clean:
-                        continue
-
-                    if self._is_relevant_monthly_agenda(title_clean):
+                    if title_clean and self._is_candidate_agenda(title_clean):
                         # Promesa de que al hacer click, haya un cambio de página (cambio de URL)
                         async with page.expect_navigation(
                             wait_until="domcontentloaded"
@@ -169,13 +204,60 @@ class LumScraper(ScraperInterface):
                             break
 
             except Exception as e:
+                self.record_failure()
                 logger.error(f"Error en LUM Scraper: {e}", exc_info=True)
 
-            finally:
-                await browser.close()
-
         return movies
 
+    @override
+    async def get_movies_via_http(self, http_fetcher: HttpFetcher) -> list[Movie]:
+        """
+        Mismo recorrido que con el navegador, pero descargando el HTML: en lugar de
+        hacer clic en la agenda se sigue su enlace.
+        """
+        listing = await http_fetcher.get_html(self.START_URL)
+        activity_links = listing.select(self.EVENT_TITLE)
+
+        if not activity_links:
+            raise NeedsBrowserError(
+                "El listado del LUM llegó sin bloques de actividad."
+            )
+
+        for link in activity_links:
+            title_clean = link.get_text().strip().lower()
+
+            if not title_clean or not self._is_candidate_agenda(title_clean):
+                continue
+
+            agenda_url = urljoin(self.START_URL, str(link.get("href", "")))
+            agenda = await http_fetcher.get_html_if_modified(
+                agenda_url, self.active_listing_cache
+            )
+
+            if agenda is None:
+                # 304 Not Modified: la agenda es la misma de la corrida anterior
+                if movies := self.reuse_unchanged_listing(agenda_url):
+                    return movies
+                continue
+
+            paragraphs = [
+                ParagraphSnapshot(
+                    text=inner_text(paragraph),
+                    has_strong=paragraph.find("strong") is not None,
+                )
+                for paragraph in agenda.select(self.PARAGRAPH_SELECTOR)
+            ]
+
+            if movies := self._movies_from_snapshot(paragraphs, agenda_url):
+                return movies
+
+        return []
+
+    @override
+    async def prepare_context(self, context: BrowserContext) -> None:
+        """Aplica las evasiones anti-bot de playwright-stealth al contexto del pool."""
+        await Stealth().apply_stealth_async(context)
+
     async def _extract_activity_title(self, block: Locator) -> str | None:
         """
         Extrae y normaliza el título del bloque de actividad.
@@ -190,6 +272,10 @@ class LumScraper(ScraperInterface):
 
         return title_text.strip().lower()
 
+    def _is_candidate_agenda(self, title: str) -> bool:
+        """Descarta las agendas semanales y se queda con las mensuales vigentes."""
+        return "semanal" not in title and self._is_relevant_monthly_agenda(title)
+
     def _is_relevant_monthly_agenda(self, title: str) -> bool:
         """
         Determina si una agenda es vigente (mes actual o futuro) basándose en su título.
@@ -205,7 +291,7 @@ class LumScraper(ScraperInterface):
                 if year_match := re.search(r"20\d{2}", title):
                     year = int(year_match.group())
 
-                    now = datetime.now()
+                    now = self.reference_now()
 
                     # Normaliza ambas fechas al día 1 para comparar solo AÑO y MES
                     # evitando problemas si hoy es día 30 y el mes objetivo tiene 28 días
@@ -219,15 +305,48 @@ class LumScraper(ScraperInterface):
     async def _extract_movies_from_agenda(self, page: Page) -> list[Movie]:
         """
         Extrae las películas de la agenda mensual que aún no se proyectan.
-        Para ello revisa cada párrafo en búsqueda del título del metraje y los limpia de posible ruido.
+
+        Toma una instantánea de todos los párrafos en un único viaje al navegador
+        y delega el análisis a `_extract_movies_from_paragraphs`.
+
+        Retorna una lista con los objetos Movie.
+        """
+        paragraphs: list[ParagraphSnapshot] = await page.eval_on_selector_all(
+            self.PARAGRAPH_SELECTOR, self.PARAGRAPHS_JS
+        )
+        return self._movies_from_snapshot(paragraphs, page.url)
+
+    def _movies_from_snapshot(
+        self, paragraphs: list[ParagraphSnapshot], source_url: str
+    ) -> list[Movie]:
+        """
+        Si la instantánea de la agenda es idéntica a la de la corrida anterior,
+        reutiliza sus películas; si no, la analiza y la guarda en la caché.
+        """
+        listing_hash = content_hash(paragraphs)
+        if (
+            cached := self.reuse_unchanged_listing(source_url, listing_hash)
+        ) is not None:
+            return cached
+
+        movies = self._extract_movies_from_paragraphs(paragraphs, source_url)
+        self.remember_listing(source_url, listing_hash, movies)
+        self.collect_partial(*movies)
+        return movies
+
+    def _extract_movies_from_paragraphs(
+        self, paragraphs: list[ParagraphSnapshot], source_url: str
+    ) -> list[Movie]:
+        """
+        Revisa cada párrafo de la instantánea en búsqueda del título del metraje
+        y lo limpia de posible ruido. No toca el navegador.
 
         Retorna una lista con los objetos Movie.
         """
-        paragraphs = await page.locator(self.PARAGRAPH_SELECTOR).all()
         movies_found: list[Movie] = []
 
         for paragraph in paragraphs:
-            lines = await self._extract_clean_lines(paragraph)
+            lines = self._extract_clean_lines(paragraph)
 
             if not lines:
                 continue
@@ -253,10 +372,11 @@ class LumScraper(ScraperInterface):
 
             try:
                 if movie := self._build_movie_from_lines(
-                    lines, title_index, date_index, page.url
+                    lines, title_index, date_index, source_url
                 ):
                     movies_found.append(movie)
             except Exception as e:
+                self.record_failure()
                 logger.error(f"Error procesando líneas de parrafo: {e}")
 
         return movies_found
@@ -266,7 +386,8 @@ class LumScraper(ScraperInterface):
     ) -> Movie | None:
         """
         Ensambla el objeto Movie a partir de las líneas de texto y los índices identificados.
-        Realiza la limpieza de título, parseo de fecha y obtención de póster.
+        Realiza la limpieza de título y el parseo de fecha (el póster de las
+        funciones nuevas se resuelve después, en la etapa de pósters).
         """
         raw_title = lines[title_index]
         raw_date = lines[date_index]
@@ -284,14 +405,17 @@ class LumScraper(ScraperInterface):
             return None
 
         clean_title = self._clean_title(raw_title)
-        movie_poster = get_movie_poster(clean_title)
 
+        # Si la función ya está en la BD se reutiliza su póster; si no, lo resuelve
+        # la etapa de pósters del pipeline, después del scraping
+        known = self.known_movie(clean_title, movie_date)
         return Movie(
             title=clean_title,
             location=self.CENTER_LOCATION,
             date=movie_date,
             center=self.CENTER_SLUG,
-            poster_url=movie_poster,
+            poster_url=known.poster_url if known else None,
+            poster_path=known.poster_path if known else None,
             source_url=source_url,
         )
 
@@ -386,18 +510,16 @@ class LumScraper(ScraperInterface):
 
         return -1  # No se encontró nada que parezca una película
 
-    async def _extract_clean_lines(self, paragraph: Locator) -> list[str] | None:
+    def _extract_clean_lines(self, paragraph: ParagraphSnapshot) -> list[str] | None:
         """
         Extrae las líneas de texto de un párrafo si contiene un elemento <strong>.
 
         Retorna None si el párrafo no tiene elemento <strong>.
         """
-        if await paragraph.locator("strong").count() == 0:
+        if not paragraph["has_strong"]:
             return None
 
-        full_text = await paragraph.inner_text()
-
-        lines = [line.strip() for line in full_text.split("\n") if line.strip()]
+        lines = [line.strip() for line in paragraph["text"].split("\n") if line.strip()]
 
         return lines if lines else None
 
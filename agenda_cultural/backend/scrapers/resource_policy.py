@@ -0,0 +1,152 @@
+"""
+Políticas declarativas de carga de recursos para los scrapers.
+
+Los scrapers solo leen texto, pero por defecto Chromium descarga todas las
+imágenes, fuentes, hojas de estilo, videos y scripts de analítica de cada página.
+Una `ResourcePolicy` describe qué peticiones se abortan (por tipo de recurso o
+por patrón de URL) y si el contexto debe ejecutar JavaScript. Se instala sobre el
+contexto mediante `BrowserContext.route` y devuelve un `ResourceStats` con las
+peticiones bloqueadas y una estimación de los bytes ahorrados.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+from playwright.async_api import BrowserContext, Response, Route
+
+
+@dataclass
+class ResourceStats:
+    """Contabilidad de peticiones de un contexto con política de recursos."""
+
+    # Tamaño medio aproximado por tipo de recurso (bytes). Una petición abortada
+    # nunca llega a tener tamaño real, así que el ahorro se estima con esta tabla.
+    ESTIMATED_BYTES: ClassVar[dict[str, int]] = {
+        "image": 80_000,
+        "media": 500_000,
+        "font": 40_000,
+        "stylesheet": 30_000,
+        "script": 60_000,
+    }
+    DEFAULT_ESTIMATED_BYTES: ClassVar[int] = 10_000
+
+    blocked_by_type: Counter[str] = field(default_factory=Counter)
+    loaded_requests: int = 0
+    loaded_bytes: int = 0
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked_by_type.values())
+
+    @property
+    def estimated_bytes_saved(self) -> int:
+        return sum(
+            self.ESTIMATED_BYTES.get(resource_type, self.DEFAULT_ESTIMATED_BYTES)
+            * count
+            for resource_type, count in self.blocked_by_type.items()
+        )
+
+    def record_blocked(self, resource_type: str) -> None:
+        self.blocked_by_type[resource_type] += 1
+
+    def record_response(self, response: Response) -> None:
+        """Suma el tamaño declarado (Content-Length) de una respuesta recibida."""
+        self.loaded_requests += 1
+        if content_length := response.headers.get("content-length"):
+            if content_length.isdigit():
+                self.loaded_bytes += int(content_length)
+
+    def summary(self) -> str:
+        """Resumen legible para el log."""
+        by_type = ", ".join(
+            f"{resource_type}={count}"
+            for resource_type, count in self.blocked_by_type.most_common()
+        )
+        return (
+            f"{self.blocked_requests} peticiones bloqueadas ({by_type or 'ninguna'}), "
+            f"~{self.estimated_bytes_saved // 1024} KB ahorrados (estimado), "
+            f"{self.loaded_requests} respuestas cargadas "
+            f"({self.loaded_bytes // 1024} KB declarados)."
+        )
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """
+    Política declarativa de recursos de un scraper.
+
+    Attributes:
+        blocked_resource_types: Tipos de recurso de Playwright a abortar
+            ("image", "media", "font", "stylesheet", "script", ...).
+        blocked_url_patterns: Expresiones regulares; cualquier URL que coincida
+            se aborta sin importar su tipo (analítica, píxeles, chats, etc.).
+        javascript_enabled: Si es False el contexto se crea con JavaScript
+            deshabilitado (útil para sitios renderizados en el servidor).
+    """
+
+    blocked_resource_types: frozenset[str] = frozenset()
+    blocked_url_patterns: tuple[str, ...] = ()
+    javascript_enabled: bool = True
+
+    def context_options(self) -> dict[str, bool]:
+        """Opciones que se deben pasar a `Browser.new_context`."""
+        return {"java_script_enabled": self.javascript_enabled}
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Decide si una petición debe abortarse según la política."""
+        if resource_type in self.blocked_resource_types:
+            return True
+        return any(re.search(pattern, url) for pattern in self.blocked_url_patterns)
+
+    async def install(self, context: BrowserContext) -> ResourceStats:
+        """
+        Registra el enrutamiento de peticiones sobre el contexto.
+
+        Returns:
+            ResourceStats: Estadísticas que se irán llenando mientras el contexto viva.
+        """
+        stats = ResourceStats()
+        context.on("response", stats.record_response)
+
+        if not self.blocked_resource_types and not self.blocked_url_patterns:
+            return stats
+
+        async def handle_route(route: Route) -> None:
+            request = route.request
+            if self.should_block(request.url, request.resource_type):
+                stats.record_blocked(request.resource_type)
+                await route.abort("blockedbyclient")
+            else:
+                await route.fallback()
+
+        await context.route("**/*", handle_route)
+        return stats
+
+
+# Dominios de analítica, publicidad y widgets que nunca aportan texto útil
+TRACKING_URL_PATTERNS: tuple[str, ...] = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"facebook\.(net|com)/.*(tr|sdk|plugins)",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"youtube\.com/embed",
+    r"maps\.googleapis\.com",
+)
+
+# Política por defecto: solo texto, pero con CSS y JS (necesarios para hacer clic)
+TEXT_ONLY_POLICY = ResourcePolicy(
+    blocked_resource_types=frozenset({"image", "media", "font"}),
+    blocked_url_patterns=TRACKING_URL_PATTERNS,
+)
+
+# Política para sitios renderizados en el servidor: sin JS ni estilos
+STATIC_SITE_POLICY = ResourcePolicy(
+    blocked_resource_types=frozenset({"image", "media", "font", "stylesheet"}),
+    blocked_url_patterns=TRACKING_URL_PATTERNS,
+    javascript_enabled=False,
+)
@@ -2,46 +2,89 @@
 Orquestador del flujo de trabajo de actualización de datos (Scraping Pipeline).
 
 Este módulo coordina la secuencia de ejecución para mantener la base de datos al día:
-1. Depuración de funciones que ya se proyectaron.
-2. Extracción de nueva información (Scraping).
-3. Guardar las nuevas funciones en la base de datos, si es que llega a encontrar alguna.
+1. Extracción de nueva información (Scraping). A la vez, la limpieza de las
+   funciones que ya se proyectaron corre en segundo plano sobre el motor
+   asíncrono de la BD.
+2. Guardar las funciones encontradas en el spool local (`write_spool`).
+3. Enviar el spool a la base de datos como un diff por centro (nuevas,
+   actualizadas y retiradas) en una sola transacción, cuando la limpieza ya
+   terminó. Solo se retiran funciones de los centros que terminaron sin timeout
+   ni error.
+4. Completar los pósters de las funciones nuevas (títulos únicos, en paralelo).
+5. Copiar los pósters al espejo local (WebP/AVIF), si POSTER_MIRROR_DIR está definido.
+
+Los pasos 1 y 2 se solapan: cada centro guarda sus películas por lotes a medida
+que las extrae, sin esperar al centro más lento. Hasta el paso 3 no se escribe
+en la BD remota (salvo la limpieza), así que una caída del túnel no pierde la
+corrida.
 """
 
+import asyncio
+
+from . import metrics
 from .services import (
-    cleanup_past_movies,
-    sync_movies_to_db,
-    fetch_all_movies,
+    cleanup_past_movies_async,
+    enrich_posters,
+    mark_complete_centers,
+    mirror_posters,
+    ship_spool,
+    spool_movies,
+    start_spool_run,
+    fetch_all_outcomes,
 )
 from .log_config import get_task_logger
 
 logger = get_task_logger("scraper_orchestrator", "scraping.log")
 
 
+async def _cleanup_in_background() -> None:
+    """Limpieza concurrente con el scraping: si falla, la corrida sigue."""
+    try:
+        await cleanup_past_movies_async()
+    except Exception as e:
+        logger.warning(f"No se pudo limpiar las funciones pasadas: {e}")
+
+
 async def run_scraping_pipeline():
     """
     Ejecuta el ciclo completo de actualización de la base de datos.
 
-    Maneja el flujo de limpieza, scraping y guardado. Si ocurre un error
-    crítico en cualquiera de las etapas, lo registra y detiene el flujo
+    Maneja el flujo de scraping (con la limpieza en paralelo), spool, envío a la
+    BD, pósters y su espejo local.
+    Si ocurre un error crítico en cualquiera de las etapas, lo registra y detiene el flujo
     para evitar corrupción de datos.
     """
-    try:
-        cleanup_past_movies()
+    metrics.reset()
+    cleanup = asyncio.create_task(_cleanup_in_background())
 
-        movies_scraped = await fetch_all_movies()
+    try:
+        start_spool_run()
+        outcomes = await fetch_all_outcomes(sink=spool_movies)
+        mark_complete_centers(outcomes)
+        await cleanup
 
-        new_movies_count = sync_movies_to_db(movies_scraped)
+        found_count = sum(outcome.found for outcome in outcomes)
+        new_movies_count = await ship_spool()
 
         if new_movies_count > 0:
             logger.info(
-                f"Se añadieron {new_movies_count} películas (de {len(movies_scraped)} encontradas)."
+                f"Se añadieron {new_movies_count} películas (de {found_count} encontradas); "
+                f"{metrics.get('db.updated')} actualizadas y "
+                f"{metrics.get('db.retired')} retiradas."
             )
         else:
             logger.info(
-                f"De las {len(movies_scraped)} películas encontradas, todas ya están en la BD. No se agregaron nuevas películas."
+                f"De las {found_count} películas encontradas, todas ya están en la BD. No se agregaron nuevas películas."
             )
 
+        await enrich_posters()
+        await mirror_posters()
+
     except Exception as e:
         logger.critical(
             f"Error crítico en el orquestador de scraping: {e}", exc_info=True
         )
+
+    finally:
+        cleanup.cancel()
+        logger.info(f"Métricas de la ejecución: {metrics.format_summary()}")
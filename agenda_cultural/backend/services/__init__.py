@@ -6,15 +6,41 @@ para que sean consumidas fácilmente por el orquestador u otros módulos,
 ocultando la complejidad de la estructura interna de archivos.
 """
 
-from .scraper_service import fetch_all_movies
+from .scraper_service import (
+    ScraperOutcome,
+    ScraperStatus,
+    fetch_all_movies,
+    fetch_all_outcomes,
+)
+from .poster_service import enrich_posters
+from .poster_mirror import mirror_posters
+from .write_spool import (
+    mark_complete_centers,
+    ship_spool,
+    spool_movies,
+    start_spool_run,
+)
 from .database_service import (
     sync_movies_to_db,
+    sync_movies_to_db_async,
     cleanup_past_movies,
+    cleanup_past_movies_async,
 )
 
 
 __all__ = [
+    "ScraperOutcome",
+    "ScraperStatus",
     "fetch_all_movies",
+    "fetch_all_outcomes",
+    "enrich_posters",
+    "mirror_posters",
+    "mark_complete_centers",
+    "ship_spool",
+    "spool_movies",
+    "start_spool_run",
     "sync_movies_to_db",
+    "sync_movies_to_db_async",
     "cleanup_past_movies",
+    "cleanup_past_movies_async",
 ]
@@ -3,18 +3,44 @@ Servicios de manipulación de datos (Base de Datos).
 
 Este módulo gestiona las operaciones CRUD (Create, Read, Update, Delete)
 relacionadas con las películas. Sus responsabilidades son:
-1. Limpieza: Borrar funciones pasadas para no llenar la DB de basura.
-2. Actualización: Guardar nuevas películas aplicando lógica de desduplicación.
+1. Limpieza: Sacar de la BD las funciones pasadas para no llenarla de basura. En
+   Postgres se retiran meses enteros (`movie_partitions`); en SQLite, filas.
+2. Consulta: Entregar a los scrapers las funciones futuras ya guardadas, para que
+   no vuelvan a cargar su detalle (scraping incremental).
+3. Actualización: Guardar nuevas películas; la restricción única de la BD
+   descarta los duplicados (INSERT ... ON CONFLICT DO NOTHING).
+4. Pósters: Listar las funciones futuras sin póster y completarlas en bloque.
+5. Espejo de pósters: Listar las URLs de pósters en uso y reescribirlas a la copia local.
+6. Envío: Aplicar lo acumulado en el spool local como un diff por centro
+   (inserciones, actualizaciones y funciones retiradas) en una sola transacción.
+   En Postgres, los meses que falten se crean antes, en una transacción corta
+   aparte (`_prepare_partitions`).
+
+Las funciones que usa el pipeline de scraping tienen una versión `*_async` que
+corre sobre el motor asíncrono de Reflex (`rx.asession`), para no bloquear el
+event loop mientras los scrapers siguen trabajando.
 """
 
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 import reflex as rx
-from sqlmodel import Session, delete, select
+from sqlalchemy import Column, DateTime, MetaData, String, Table, and_, insert, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, col, delete, select, update
 
+from agenda_cultural.backend import metrics
 from agenda_cultural.backend.log_config import get_task_logger
 from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.scrapers.known_movies import Signature
+from agenda_cultural.backend.services.movie_partitions import (
+    ensure_partitions,
+    is_partitioned,
+    retire_past_partitions,
+)
 
 # Usamos el logger 'database_service' pero guardamos en el mismo archivo 'scraping.log'
 # para tener la historia completa en un solo lugar.
@@ -22,6 +48,26 @@ from agenda_cultural.backend.models import Movie
 # interacción con la BD. Lo mejor es ver en un mismo archivo log si esos 2 pasos fueron éxitosos.
 logger = get_task_logger("database_service", "scraping.log")
 
+# Filas por INSERT (8 columnas: muy por debajo del límite de parámetros de Postgres)
+INSERT_CHUNK = 1000
+
+# Campos que el diff compara en las funciones que ya existen
+DIFF_FIELDS = ("location", "source_url", "poster_url", "poster_path")
+
+# Desde cuántas firmas de centros parciales conviene cruzarlas en la BD con una
+# tabla temporal en lugar de traer su rango de fechas completo
+TEMP_TABLE_MIN_SIGNATURES = 2000
+
+# Tabla temporal (de la conexión) con las firmas scrapeadas
+_scraped_signature = Table(
+    "scraped_signature",
+    MetaData(),
+    Column("center", String, nullable=False),
+    Column("title", String, nullable=False),
+    Column("date", DateTime, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
 
 def cleanup_past_movies():
     """
@@ -29,71 +75,545 @@ def cleanup_past_movies():
 
     Compara la fecha de la función con la hora actual de Lima.
     Si la función ya ocurrió, se borra para mantener la base de datos ligera.
+    Con la tabla particionada se retiran, en cambio, los meses ya cerrados.
     """
 
     logger.info("Iniciando limpieza de funciones pasadas en DB...")
     with rx.session() as session:
-        # Obtenemos hora actual en Lima y quitamos info de zona horaria (naive)
-        # para que coincida con el formato de la base de datos SQL.
-        now_clean = datetime.now(ZoneInfo("America/Lima")).replace(tzinfo=None)
+        _retire_past_movies(session)
+        session.commit()
+
+
+async def cleanup_past_movies_async() -> int:
+    """
+    Versión asíncrona de `cleanup_past_movies`, para correr junto al scraping.
+
+    Returns:
+        int: Filas borradas (0 con la tabla particionada).
+    """
+    logger.info("Iniciando limpieza de funciones pasadas en DB...")
+    deleted = await _run_in_asession(_retire_past_movies)
+    logger.info(f"Limpieza terminada: {deleted} funciones pasadas borradas.")
+    return deleted
+
+
+async def _run_in_asession[T](work: Callable[..., T], *args) -> T:
+    """
+    Ejecuta `work(session, *args)` en una sesión asíncrona y confirma al final.
+
+    `run_sync` pasa a `work` una sesión síncrona sobre la conexión del driver
+    asíncrono (asyncpg en Postgres, aiosqlite en SQLite), así que las consultas
+    son las mismas que en la versión síncrona pero el event loop no se bloquea
+    mientras la BD responde. Las conexiones salen del pool del motor asíncrono
+    de Reflex (ver `async_db_url` en rxconfig).
+    """
+    async with rx.asession() as asession:
+        result = await asession.run_sync(work, *args)
+        await asession.commit()
+    return result
+
+
+def _retire_past_movies(session: Session) -> int:
+    """
+    Saca de la cartelera las funciones que ya pasaron (sin commit).
+
+    Con la tabla particionada (Postgres) se desenganchan los meses cerrados y
+    no se borra ninguna fila; si no, se borran las funciones pasadas.
+
+    Returns:
+        int: Filas borradas (0 con particiones).
+    """
+    # Obtenemos hora actual en Lima y quitamos info de zona horaria (naive)
+    # para que coincida con el formato de la base de datos SQL.
+    now_clean = datetime.now(ZoneInfo("America/Lima")).replace(tzinfo=None)
+
+    if is_partitioned(session):
+        retire_past_partitions(session, now_clean)
+        return 0
+
+    statement = delete(Movie).where(col(Movie.date) < now_clean)
+    return session.exec(statement).rowcount
+
+
+def get_known_movies(centers: list[str]) -> dict[str, list[Movie]]:
+    """
+    Obtiene las funciones futuras ya guardadas de los centros indicados.
+
+    Args:
+        centers (list[str]): Slugs de los centros culturales (Movie.center).
+
+    Returns:
+        dict[str, list[Movie]]: Funciones de hoy en adelante agrupadas por centro.
+    """
+    with rx.session() as session:
+        return _known_movies(session, centers)
+
 
-        statement = delete(Movie).where(Movie.date < now_clean)  # ty: ignore[unsupported-operator, invalid-argument-type]
-        session.exec(statement)
+async def get_known_movies_async(centers: list[str]) -> dict[str, list[Movie]]:
+    """Versión asíncrona de `get_known_movies` (no bloquea el event loop)."""
+    return await _run_in_asession(_known_movies, centers)
+
+
+def _known_movies(session: Session, centers: list[str]) -> dict[str, list[Movie]]:
+    known: dict[str, list[Movie]] = {center: [] for center in centers}
+    now_clean = datetime.now(ZoneInfo("America/Lima")).replace(tzinfo=None)
+
+    statement = select(Movie).where(
+        col(Movie.center).in_(centers),
+        col(Movie.date) >= now_clean,
+    )
+    for movie in session.exec(statement).all():
+        known[movie.center].append(movie)
+    return known
+
+
+def get_movies_without_poster() -> list[Movie]:
+    """
+    Obtiene las funciones de hoy en adelante que aún no tienen póster.
+
+    Returns:
+        list[Movie]: Funciones futuras con `poster_url` vacío.
+    """
+    with rx.session() as session:
+        return _movies_without_poster(session)
+
+
+async def get_movies_without_poster_async() -> list[Movie]:
+    """Versión asíncrona de `get_movies_without_poster` (no bloquea el event loop)."""
+    return await _run_in_asession(_movies_without_poster)
+
+
+def _movies_without_poster(session: Session) -> list[Movie]:
+    now_clean = datetime.now(ZoneInfo("America/Lima")).replace(tzinfo=None)
+
+    statement = select(Movie).where(
+        col(Movie.poster_url).is_(None),
+        col(Movie.date) >= now_clean,
+    )
+    return list(session.exec(statement).all())
+
+
+def update_movie_posters(ids_by_poster: dict[tuple[str, str], list[int]]) -> int:
+    """
+    Asigna los pósters resueltos en una sola transacción (un UPDATE por póster).
+
+    Args:
+        ids_by_poster (dict[tuple[str, str], list[int]]): (ruta en TMDB, URL
+            por defecto) del póster -> ids de las funciones que lo usan.
+
+    Returns:
+        int: Número de funciones actualizadas.
+    """
+    if not ids_by_poster:
+        return 0
+
+    with rx.session() as session:
+        updated = _update_movie_posters(session, ids_by_poster)
         session.commit()
+    return updated
+
+
+async def update_movie_posters_async(
+    ids_by_poster: dict[tuple[str, str], list[int]],
+) -> int:
+    """Versión asíncrona de `update_movie_posters` (no bloquea el event loop)."""
+    if not ids_by_poster:
+        return 0
+    return await _run_in_asession(_update_movie_posters, ids_by_poster)
 
 
-def _get_existing_signatures(session: Session) -> set[tuple]:
-    """Obtiene firmas (Cine, Título, Fecha) para comparación rápida."""
-    statement = select(Movie.center, Movie.title, Movie.date)
-    results = session.exec(statement).all()
-    return {(center, title, date) for center, title, date in results}
+def _update_movie_posters(
+    session: Session, ids_by_poster: dict[tuple[str, str], list[int]]
+) -> int:
+    updated = 0
+    for (poster_path, poster_url), ids in ids_by_poster.items():
+        statement = (
+            update(Movie)
+            .where(col(Movie.id).in_(ids))
+            .values(poster_path=poster_path, poster_url=poster_url)
+        )
+        updated += session.exec(statement).rowcount
+    return updated
 
 
-def _filter_new_movies(scraped_movies: list[Movie], session: Session) -> list[Movie]:
-    """Filtra las películas scrapeadas para quedarse solo con las nuevas que no están
-    en la base de datos.
+def get_poster_urls() -> set[str]:
+    """
+    Obtiene las URLs de póster distintas que usa alguna función guardada.
 
     Returns:
-        list: Lista con las películas nuevas que se encontraron.
+        set[str]: URLs de póster (remotas o del espejo local).
     """
-    existing_signatures = _get_existing_signatures(session)
-    new_movies: list[Movie] = []
+    with rx.session() as session:
+        return _poster_urls(session)
+
 
-    for movie in scraped_movies:
-        signature = (movie.center, movie.title, movie.date)
-        if signature not in existing_signatures:
-            new_movies.append(movie)
+async def get_poster_urls_async() -> set[str]:
+    """Versión asíncrona de `get_poster_urls` (no bloquea el event loop)."""
+    return await _run_in_asession(_poster_urls)
 
-    return new_movies
 
+def _poster_urls(session: Session) -> set[str]:
+    statement = (
+        select(Movie.poster_url).where(col(Movie.poster_url).is_not(None)).distinct()
+    )
+    return set(session.exec(statement).all())
 
-def _save_new_movies_to_db(new_movies: list[Movie], session: Session) -> int:
-    """Guarda las nuevas películas en la base de datos, si es que las hubiese.
+
+def replace_poster_urls(new_by_old: dict[str, str]) -> int:
+    """
+    Reemplaza URLs de póster en una sola transacción (un UPDATE por URL).
+
+    Args:
+        new_by_old (dict[str, str]): URL actual -> URL nueva.
 
     Returns:
-        int: Número de películas nuevas guardadas en la base de datos.
+        int: Número de funciones actualizadas.
     """
-    if not new_movies:
+    if not new_by_old:
         return 0
 
-    session.add_all(new_movies)
-    session.commit()
-    return len(new_movies)
+    with rx.session() as session:
+        updated = _replace_poster_urls(session, new_by_old)
+        session.commit()
+    return updated
+
+
+async def replace_poster_urls_async(new_by_old: dict[str, str]) -> int:
+    """Versión asíncrona de `replace_poster_urls` (no bloquea el event loop)."""
+    if not new_by_old:
+        return 0
+    return await _run_in_asession(_replace_poster_urls, new_by_old)
+
+
+def _replace_poster_urls(session: Session, new_by_old: dict[str, str]) -> int:
+    updated = 0
+    for old_url, new_url in new_by_old.items():
+        statement = (
+            update(Movie)
+            .where(col(Movie.poster_url) == old_url)
+            .values(poster_url=new_url)
+        )
+        updated += session.exec(statement).rowcount
+    return updated
+
+
+def _insert_statement(session: Session):
+    """`INSERT` del dialecto de la sesión, con soporte de ON CONFLICT."""
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(Movie)
+    return postgresql_insert(Movie)
+
+
+def _prepare_partitions(session: Session, movies: list[Movie]) -> None:
+    """
+    Con la tabla particionada, crea (sin commit) los meses que falten para
+    `movies`. Se confirma aparte, antes de insertar: crear una partición toma un
+    bloqueo ACCESS EXCLUSIVE sobre `movie` que dura hasta el commit, y así no se
+    mantiene durante todo el envío.
+    """
+    if movies and is_partitioned(session):
+        now_clean = datetime.now(ZoneInfo("America/Lima")).replace(tzinfo=None)
+        ensure_partitions(session, now_clean, max(movie.date for movie in movies))
+
+
+def _insert_new_movies(session: Session, movies: list[Movie]) -> int:
+    """
+    INSERT ... ON CONFLICT DO NOTHING de las películas (sin commit), en sentencias
+    de a lo sumo INSERT_CHUNK filas. Devuelve cuántas se insertaron.
+
+    Con la tabla particionada, los meses ya deben existir (`_prepare_partitions`).
+    """
+    columns = [column.name for column in Movie.__table__.columns if column.name != "id"]
+    rows = [{name: getattr(movie, name) for name in columns} for movie in movies]
+
+    inserted = 0
+    for start in range(0, len(rows), INSERT_CHUNK):
+        statement = (
+            _insert_statement(session)
+            .values(rows[start : start + INSERT_CHUNK])
+            .on_conflict_do_nothing(index_elements=["center", "title", "date"])
+            .returning(Movie.id)
+        )
+        inserted += len(session.exec(statement).all())
+    return inserted
 
 
 def sync_movies_to_db(scraped_movies: list[Movie]) -> int:
     """
     Sincroniza la lista de películas obtenidas con la base de datos.
-    Garantiza que no se inserten duplicados.
+
+    La BD garantiza que no haya duplicados: la firma (centro, título, fecha) es
+    única y el `INSERT ... ON CONFLICT DO NOTHING` descarta las que ya existen,
+    sin leer la tabla antes. Las insertadas y descartadas se suman a las
+    métricas `db.inserted` y `db.skipped`.
 
     Returns:
         int: Número de películas nuevas guardadas en la base de datos.
     """
+    if not scraped_movies:
+        return 0
+
+    with rx.session() as session:
+        _prepare_partitions(session, scraped_movies)
+        session.commit()
+        inserted = _insert_new_movies(session, scraped_movies)
+        session.commit()
+
+    return _report_sync(scraped_movies, inserted)
+
+
+async def sync_movies_to_db_async(scraped_movies: list[Movie]) -> int:
+    """Versión asíncrona de `sync_movies_to_db` (no bloquea el event loop)."""
+    if not scraped_movies:
+        return 0
+
+    await _run_in_asession(_prepare_partitions, scraped_movies)
+    inserted = await _run_in_asession(_insert_new_movies, scraped_movies)
+    return _report_sync(scraped_movies, inserted)
+
+
+def _report_sync(scraped_movies: list[Movie], inserted: int) -> int:
+    skipped = len(scraped_movies) - inserted
+    metrics.increment("db.inserted", inserted)
+    metrics.increment("db.skipped", skipped)
+    logger.debug(f"Lote guardado: {inserted} insertadas, {skipped} ya existían.")
+    return inserted
+
+
+@dataclass
+class CenterChanges:
+    """Cambios aplicados a las funciones futuras de un centro (el changelog)."""
+
+    center: str
+    inserted: list[Signature] = field(default_factory=list)
+    updated: list[Signature] = field(default_factory=list)
+    deleted: list[Signature] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"+{len(self.inserted)} nuevas, ~{len(self.updated)} actualizadas, "
+            f"-{len(self.deleted)} retiradas"
+        )
+
+
+def _changed_fields(stored: Movie, scraped: Movie) -> dict[str, str | None]:
+    """Campos de la fila guardada que el scraping trae distintos."""
+    changes: dict[str, str | None] = {}
+    for name in DIFF_FIELDS:
+        value = getattr(scraped, name)
+        # Un póster vacío no borra el que completó la etapa de pósters
+        if value is None and name in ("poster_url", "poster_path"):
+            continue
+        if value != getattr(stored, name):
+            changes[name] = value
+    return changes
+
+
+def _joined_with_scraped(session: Session, movies: list[Movie]) -> list[Movie]:
+    """
+    Filas de la BD con la firma de alguna de `movies`, cruzadas en la BD.
+
+    Las firmas se cargan en una tabla temporal (de a INSERT_CHUNK) y se hace un
+    JOIN por (center, title, date), que usa la restricción única como índice.
+    """
+    connection = session.connection()
+    _scraped_signature.create(connection)
+    try:
+        rows = [
+            {"center": movie.center, "title": movie.title, "date": movie.date}
+            for movie in movies
+        ]
+        for start in range(0, len(rows), INSERT_CHUNK):
+            connection.execute(
+                insert(_scraped_signature), rows[start : start + INSERT_CHUNK]
+            )
+        signature = _scraped_signature.c
+        statement = select(Movie).join(
+            _scraped_signature,
+            and_(
+                col(Movie.center) == signature.center,
+                col(Movie.title) == signature.title,
+                col(Movie.date) == signature.date,
+            ),
+        )
+        return list(session.exec(statement).all())
+    finally:
+        _scraped_signature.drop(connection)
+
+
+def _stored_movies(
+    session: Session,
+    movies_by_center: dict[str, list[Movie]],
+    complete_centers: set[str],
+    now: datetime,
+) -> dict[Signature, Movie]:
+    """
+    Las filas de la BD contra las que se compara lo scrapeado, por firma.
+
+    La consulta se acota a lo que trae el lote, así que escala con él y no con
+    la tabla:
+    - Centros completos: todas sus funciones futuras (hacen falta para saber
+      cuáles se retiran).
+    - Centros parciales: solo su rango `date BETWEEN min AND max` del lote o, si
+      suman TEMP_TABLE_MIN_SIGNATURES firmas o más, el cruce exacto con una
+      tabla temporal.
+    Los centros sin funciones en el lote no se consultan.
+    """
+    complete = [
+        c for c, movies in movies_by_center.items() if movies and c in complete_centers
+    ]
+    partial = {
+        center: movies
+        for center, movies in movies_by_center.items()
+        if movies and center not in complete_centers
+    }
+    partial_count = sum(len(movies) for movies in partial.values())
+    use_temp_table = partial_count >= TEMP_TABLE_MIN_SIGNATURES
+
+    conditions = []
+    if complete:
+        conditions.append(and_(col(Movie.center).in_(complete), col(Movie.date) >= now))
+    if not use_temp_table:
+        for center, movies in partial.items():
+            dates = [movie.date for movie in movies]
+            conditions.append(
+                and_(
+                    col(Movie.center) == center,
+                    col(Movie.date).between(min(dates), max(dates)),
+                )
+            )
+
+    stored: list[Movie] = []
+    if conditions:
+        stored.extend(session.exec(select(Movie).where(or_(*conditions))).all())
+    if use_temp_table:
+        movies = [movie for movies in partial.values() for movie in movies]
+        stored.extend(_joined_with_scraped(session, movies))
+
+    return {(movie.center, movie.title, movie.date): movie for movie in stored}
+
+
+@dataclass
+class ShipResult:
+    """Lo que hizo un envío: el changelog por centro y los totales."""
+
+    changes: dict[str, CenterChanges]
+    inserted: int = 0
+    attempted: int = 0
+    updated: int = 0
+    retired: int = 0
+
+
+def ship_movies_to_db(
+    movies_by_center: dict[str, list[Movie]], complete_centers: set[str]
+) -> ShipResult:
+    """
+    Aplica en una sola transacción el diff entre lo scrapeado y la BD.
+
+    Pensado para una BD remota de alta latencia: una sesión, la lectura de las
+    filas a comparar (acotada al lote, ver `_stored_movies`), los INSERT (de a
+    INSERT_CHUNK), un UPDATE en bloque, un DELETE de las retiradas y un solo
+    commit. Si algo falla no queda nada a medias. Las funciones pasadas no se
+    tocan: de eso se encarga `cleanup_past_movies`. Los meses que falten en la
+    tabla particionada se crean antes, en su propia transacción.
+
+    Por centro se insertan las funciones nuevas y se actualizan las que cambiaron
+    de sala, URL o póster. Solo en los centros de `complete_centers` (corrida
+    completa, sin timeout ni error) se retiran las funciones futuras que ya no
+    aparecen: de un scraping parcial no se puede deducir que se cancelaron.
+
+    Args:
+        movies_by_center: Funciones scrapeadas de cada centro.
+        complete_centers: Centros cuyo scraping terminó bien.
+
+    Returns:
+        ShipResult: Changelog por centro y totales. `inserted` cuenta las filas
+            que devolvió el INSERT (RETURNING), no las que se intentaron.
+    """
     with rx.session() as session:
-        # 1. Identificar lo nuevo
-        new_movies_to_save = _filter_new_movies(scraped_movies, session)
+        _prepare_partitions(session, _all_movies(movies_by_center))
+        session.commit()
+        result = _apply_diff(session, movies_by_center, complete_centers)
+        session.commit()
+    return _report_ship(result)
+
+
+async def ship_movies_to_db_async(
+    movies_by_center: dict[str, list[Movie]], complete_centers: set[str]
+) -> ShipResult:
+    """Versión asíncrona de `ship_movies_to_db` (no bloquea el event loop)."""
+    await _run_in_asession(_prepare_partitions, _all_movies(movies_by_center))
+    result = await _run_in_asession(_apply_diff, movies_by_center, complete_centers)
+    return _report_ship(result)
+
+
+def _all_movies(movies_by_center: dict[str, list[Movie]]) -> list[Movie]:
+    return [movie for movies in movies_by_center.values() for movie in movies]
+
+
+def _apply_diff(
+    session: Session,
+    movies_by_center: dict[str, list[Movie]],
+    complete_centers: set[str],
+) -> ShipResult:
+    """El diff de `ship_movies_to_db`, sin commit."""
+    result = ShipResult({center: CenterChanges(center) for center in movies_by_center})
+
+    now_clean = datetime.now(ZoneInfo("America/Lima")).replace(tzinfo=None)
+    stored_by_signature = _stored_movies(
+        session, movies_by_center, complete_centers, now_clean
+    )
+
+    to_insert: list[Movie] = []
+    updates: list[dict] = []
+    retired_ids: list[int] = []
+    for center, scraped_movies in movies_by_center.items():
+        changes = result.changes[center]
+        scraped_signatures: set[Signature] = set()
+        for movie in scraped_movies:
+            signature = (movie.center, movie.title, movie.date)
+            scraped_signatures.add(signature)
+            stored = stored_by_signature.get(signature)
+            if stored is None:
+                to_insert.append(movie)
+                changes.inserted.append(signature)
+            elif fields := _changed_fields(stored, movie):
+                updates.append({"id": stored.id, **fields})
+                changes.updated.append(signature)
+
+        if center not in complete_centers:
+            continue
+        if not scraped_movies:
+            # Una cartelera vacía suele ser un sitio caído, no cancelaciones
+            logger.warning(
+                f"[{center}] Sin funciones en el scraping: no se retira nada."
+            )
+            continue
+        for signature, stored in stored_by_signature.items():
+            if signature[0] == center and signature not in scraped_signatures:
+                retired_ids.append(stored.id)
+                changes.deleted.append(signature)
+
+    result.inserted = _insert_new_movies(session, to_insert) if to_insert else 0
+    result.attempted = len(to_insert)
+    if updates:
+        session.exec(update(Movie), params=updates)
+        result.updated = len(updates)
+    if retired_ids:
+        session.exec(delete(Movie).where(col(Movie.id).in_(retired_ids)))
+        result.retired = len(retired_ids)
+    return result
 
-        # 2. Guardar
-        count = _save_new_movies_to_db(new_movies_to_save, session)
 
-        return count
+def _report_ship(result: ShipResult) -> ShipResult:
+    metrics.increment("db.inserted", result.inserted)
+    metrics.increment("db.skipped", result.attempted - result.inserted)
+    metrics.increment("db.updated", result.updated)
+    metrics.increment("db.retired", result.retired)
+    logger.info(
+        f"Envío a la BD: {result.inserted} insertadas, {result.updated} "
+        f"actualizadas, {result.retired} retiradas."
+    )
+    for center_changes in result.changes.values():
+        logger.info(f"[{center_changes.center}] {center_changes.summary()}")
+    return result
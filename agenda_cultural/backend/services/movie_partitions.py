@@ -0,0 +1,210 @@
+"""
+Particiones mensuales de la tabla `movie` en Postgres.
+
+En producción (RDS) la tabla está particionada por rango de `date`, un mes por
+partición (`movie_y2026m10`), desde la migración `e4b7d91a2c6f`. Así:
+1. Retención: en vez de borrar fila por fila las funciones pasadas (que hincha
+   la tabla y carga al VACUUM), los meses ya cerrados se desenganchan enteros
+   con `DETACH PARTITION`. Quedan como tablas sueltas: el historial se conserva
+   fuera de la cartelera. Con MOVIE_PARTITION_RETENTION=drop se borran.
+2. Consultas: la cartelera, las funciones conocidas y el diff filtran por
+   `date >= ahora`, así que Postgres solo recorre el mes en curso y los futuros
+   (poda de particiones).
+3. Meses nuevos: antes de insertar se crean las particiones que falten hasta la
+   función más lejana del lote, y siempre MOVIE_PARTITIONS_AHEAD (3) meses por
+   delante. No hay partición DEFAULT: una fila sin mes daría error. Crear una
+   partición bloquea `movie` hasta el commit, así que `database_service` lo hace
+   en una transacción corta propia, antes del envío.
+
+Una partición "existe" solo si está enganchada a `movie` (`pg_inherits`): una
+tabla suelta con el nombre del mes (un mes desenganchado) se vuelve a enganchar.
+
+El modelo `Movie` declara solo `id` como PK (en SQLite debe ser la PK entera
+para autoincrementar) y no conoce las particiones. Alembic no compara PKs, y
+`include_in_autogenerate` (en alembic/env.py) excluye del autogenerate las tablas
+de cada mes, que si no aparecerían como tablas a borrar.
+
+En SQLite (desarrollo y tests) no hay particiones y la limpieza sigue borrando
+filas (ver `database_service`).
+"""
+
+import os
+import re
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from agenda_cultural.backend.log_config import get_task_logger
+
+logger = get_task_logger("movie_partitions", "scraping.log")
+
+# Nombre de la tabla de un mes, enganchada o ya desenganchada: movie_y2026m10
+PARTITION_NAME = re.compile(r"movie_y\d{4}m\d{2}")
+
+
+def partitions_ahead() -> int:
+    """Meses futuros con partición creada: MOVIE_PARTITIONS_AHEAD (3)."""
+    try:
+        return max(0, int(os.getenv("MOVIE_PARTITIONS_AHEAD", "3")))
+    except ValueError:
+        return 3
+
+
+def drop_retired_partitions() -> bool:
+    """Si los meses cerrados se borran (`drop`) en vez de desengancharse."""
+    return os.getenv("MOVIE_PARTITION_RETENTION", "detach").lower() == "drop"
+
+
+def month_start(date: datetime) -> datetime:
+    """Primer instante del mes de `date`."""
+    return datetime(date.year, date.month, 1)
+
+
+def next_month(month: datetime) -> datetime:
+    """Primer instante del mes siguiente a `month` (que debe ser inicio de mes)."""
+    if month.month == 12:
+        return datetime(month.year + 1, 1, 1)
+    return datetime(month.year, month.month + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Nombre de la partición del mes: `movie_y2026m10`."""
+    return f"movie_y{month.year:04d}m{month.month:02d}"
+
+
+def months_between(first: datetime, last: datetime) -> list[datetime]:
+    """Inicios de mes desde el de `first` hasta el de `last`, ambos incluidos."""
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def is_partition_table(name: str | None) -> bool:
+    """Si `name` es la tabla de un mes de `movie` (enganchada o no)."""
+    return name is not None and PARTITION_NAME.fullmatch(name) is not None
+
+
+def _partition_bounds(month: datetime) -> str:
+    return f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month(month):%Y-%m-%d}')"
+
+
+def create_partition_sql(month: datetime) -> str:
+    """`CREATE TABLE ... PARTITION OF movie` para el mes."""
+    return f"CREATE TABLE {partition_name(month)} PARTITION OF movie {_partition_bounds(month)}"
+
+
+def attach_partition_sql(month: datetime) -> str:
+    """`ALTER TABLE movie ATTACH PARTITION` de la tabla suelta del mes."""
+    return (
+        f"ALTER TABLE movie ATTACH PARTITION {partition_name(month)} "
+        f"{_partition_bounds(month)}"
+    )
+
+
+def include_in_autogenerate(
+    object_: Any, name: str | None, type_: str, reflected: bool, compare_to: Any
+) -> bool:
+    """
+    Filtro `include_object` de Alembic: deja fuera las tablas de cada mes, que
+    no están en los modelos y el autogenerate propondría borrar.
+    """
+    return not (
+        type_ == "table"
+        and reflected
+        and compare_to is None
+        and is_partition_table(name)
+    )
+
+
+def is_partitioned(session: Session) -> bool:
+    """Si la tabla `movie` de la BD de la sesión está particionada."""
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    query = text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('movie')"
+    )
+    return session.connection().execute(query).first() is not None
+
+
+def attached_partitions(session: Session) -> list[str]:
+    """Nombres de las particiones enganchadas a `movie`."""
+    rows = session.connection().execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass('movie')"
+        )
+    )
+    return [row[0] for row in rows]
+
+
+def table_exists(session: Session, name: str) -> bool:
+    """Si hay una tabla `name`, enganchada a `movie` o no."""
+    query = text("SELECT to_regclass(:name) IS NOT NULL")
+    return session.connection().execute(query, {"name": name}).scalar() is True
+
+
+def ensure_partitions(session: Session, now: datetime, until: datetime) -> list[str]:
+    """
+    Crea (sin commit) las particiones que falten del mes en curso hasta `until`,
+    y como mínimo MOVIE_PARTITIONS_AHEAD meses por delante. Si ya están todas
+    enganchadas no ejecuta DDL ni bloquea la tabla.
+
+    Returns:
+        list[str]: Particiones creadas o vueltas a enganchar.
+    """
+    last = month_start(now)
+    for _ in range(partitions_ahead()):
+        last = next_month(last)
+
+    attached = set(attached_partitions(session))
+    added: list[str] = []
+    for month in months_between(now, max(last, until)):
+        name = partition_name(month)
+        if name in attached:
+            continue
+        if table_exists(session, name):
+            logger.warning(
+                f"{name} existe pero no está enganchada: se vuelve a enganchar."
+            )
+            session.connection().execute(text(attach_partition_sql(month)))
+        else:
+            session.connection().execute(text(create_partition_sql(month)))
+        added.append(name)
+
+    if added:
+        logger.info(f"Particiones de movie agregadas: {', '.join(added)}")
+    return added
+
+
+def retire_past_partitions(session: Session, now: datetime) -> list[str]:
+    """
+    Desengancha (o borra) sin commit las particiones de meses ya cerrados.
+
+    Las funciones pasadas del mes en curso siguen en su partición hasta que el
+    mes termine; las consultas de la cartelera ya las excluyen por fecha.
+
+    Returns:
+        list[str]: Particiones retiradas.
+    """
+    current = partition_name(month_start(now))
+    retired = sorted(
+        name
+        for name in attached_partitions(session)
+        # El nombre lleva año y mes con ceros, así que se ordena como la fecha
+        if is_partition_table(name) and name < current
+    )
+    for name in retired:
+        session.connection().execute(text(f"ALTER TABLE movie DETACH PARTITION {name}"))
+        if drop_retired_partitions():
+            session.connection().execute(text(f"DROP TABLE {name}"))
+
+    if retired:
+        action = "borradas" if drop_retired_partitions() else "desenganchadas"
+        logger.info(f"Particiones de meses cerrados {action}: {', '.join(retired)}")
+    return retired
@@ -0,0 +1,179 @@
+"""
+Caché persistente de pósters de TMDB (título -> ruta del póster).
+
+Cada noche se repiten casi los mismos títulos, y los que no tienen póster en TMDB
+se volvían a buscar todos los días. La caché guarda en un SQLite local:
+
+- Aciertos (título con póster) con un TTL largo, TMDB_CACHE_HIT_TTL_DAYS (90).
+- Fallos definitivos (TMDB respondió, pero sin póster) con un TTL corto,
+  TMDB_CACHE_MISS_TTL_DAYS (7), por si el póster aparece más adelante.
+
+Los errores de red o HTTP no se guardan: se reintenta en la siguiente corrida.
+La clave es el título normalizado (sin tildes, signos ni mayúsculas), así
+"Juliana", "JULIANA" y "“Juliana”" comparten entrada. Cuando hay más de
+TMDB_CACHE_MAX_ENTRIES entradas se descartan las usadas hace más tiempo.
+
+El archivo vive en TMDB_CACHE_PATH (.cache/poster_cache.sqlite) y se desactiva
+con TMDB_CACHE=off.
+"""
+
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.log_config import get_task_logger
+
+logger = get_task_logger("poster_cache", "scraping.log")
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def normalize_title(title: str) -> str:
+    """Clave de la caché: minúsculas, sin tildes ni signos y con espacios simples."""
+    decomposed = unicodedata.normalize("NFKD", title.casefold())
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w\s]", " ", without_accents).split())
+
+
+def poster_cache_enabled() -> bool:
+    """La caché se usa salvo que se desactive con TMDB_CACHE=off."""
+    return os.getenv("TMDB_CACHE", "on").lower() not in ("off", "0", "false")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class PosterCache:
+    """Caché de pósters respaldada por un archivo SQLite."""
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        hit_ttl_days: float | None = None,
+        miss_ttl_days: float | None = None,
+        max_entries: int | None = None,
+    ):
+        self.path = Path(
+            path or os.getenv("TMDB_CACHE_PATH", ".cache/poster_cache.sqlite")
+        ).expanduser()
+        self.hit_ttl = DAY_SECONDS * (
+            hit_ttl_days or _env_number("TMDB_CACHE_HIT_TTL_DAYS", 90)
+        )
+        self.miss_ttl = DAY_SECONDS * (
+            miss_ttl_days or _env_number("TMDB_CACHE_MISS_TTL_DAYS", 7)
+        )
+        self.max_entries = max_entries or int(
+            _env_number("TMDB_CACHE_MAX_ENTRIES", 5000)
+        )
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Conexión al SQLite, abierta (y con la tabla creada) la primera vez."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS posters (
+                    key TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    poster_url TEXT,
+                    expires_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+        return self._connection
+
+    def lookup(self, title: str) -> tuple[bool, str | None]:
+        """
+        Busca un título en la caché.
+
+        Returns:
+            tuple[bool, str | None]: (encontrado, ruta del póster). Un fallo
+                guardado devuelve (True, None): no hace falta consultar TMDB.
+        """
+        key = normalize_title(title)
+        now = time.time()
+        try:
+            row = self.connection.execute(
+                "SELECT poster_url, expires_at FROM posters WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                metrics.increment("poster_cache.miss")
+                return False, None
+
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE posters SET last_used = ? WHERE key = ?", (now, key)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Caché de pósters ilegible ({self.path}): {e}")
+            return False, None
+
+        metrics.increment("poster_cache.hit")
+        return True, row[0]
+
+    def store(self, title: str, poster_url: str | None) -> None:
+        """Guarda el resultado definitivo de TMDB (None = sin póster)."""
+        now = time.time()
+        ttl = self.hit_ttl if poster_url else self.miss_ttl
+        try:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO posters VALUES (?, ?, ?, ?, ?)",
+                    (normalize_title(title), title, poster_url, now + ttl, now),
+                )
+                self._evict()
+        except sqlite3.Error as e:
+            logger.warning(f"No se pudo escribir la caché de pósters: {e}")
+
+    def _evict(self) -> None:
+        """Descarta las entradas vencidas y, si sobran, las menos usadas."""
+        self.connection.execute(
+            "DELETE FROM posters WHERE expires_at < ?", (time.time(),)
+        )
+        evicted = self.connection.execute(
+            """
+            DELETE FROM posters WHERE key IN (
+                SELECT key FROM posters ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        if evicted > 0:
+            metrics.increment("poster_cache.evicted", evicted)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM posters").fetchone()[0]
+
+    def close(self) -> None:
+        """Cierra la conexión al SQLite."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def hit_rate_summary() -> str | None:
+    """Resumen de aciertos de la corrida para el log, o None si no se consultó."""
+    hits = metrics.get("poster_cache.hit")
+    lookups = hits + metrics.get("poster_cache.miss")
+    if not lookups:
+        return None
+    return (
+        f"Caché de pósters: {hits} de {lookups} títulos sin consultar TMDB "
+        f"({100 * hits / lookups:.0f}%)."
+    )
+
+
+# Instancia compartida por el servicio de TMDB
+poster_cache = PosterCache()
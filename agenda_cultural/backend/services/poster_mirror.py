@@ -0,0 +1,274 @@
+"""
+Espejo local de pósters: variantes WebP/AVIF servidas como archivos estáticos.
+
+Cada tarjeta enlazaba directamente el JPEG w342 de TMDB. Después de la etapa de
+pósters, esta etapa:
+1. Lee de la BD los `poster_url` remotos distintos.
+2. Descarga cada uno una sola vez; el índice `index.json` recuerda qué URL
+   remota ya se copió y con qué hash, así que la noche siguiente no se repite.
+3. Genera variantes redimensionadas a los anchos POSTER_MIRROR_WIDTHS (185,342)
+   en WebP y, si Pillow lo soporta, en AVIF. La ruta depende del contenido
+   (`<aa>/<sha256>/w342.webp`), por lo que el mismo póster nunca se duplica y
+   Nginx puede cachearlo para siempre.
+4. Reescribe `Movie.poster_url` a la ruta local (POSTER_MIRROR_URL + ruta).
+5. Borra los pósters que ya no usa ninguna función.
+
+Se activa definiendo POSTER_MIRROR_DIR, normalmente `public_web/posters`, que
+Nginx sirve en POSTER_MIRROR_URL (/posters) junto al frontend exportado.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import shutil
+from pathlib import Path
+
+import httpx
+from PIL import Image, UnidentifiedImageError, features
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.log_config import get_task_logger
+from agenda_cultural.backend.services.database_service import (
+    get_poster_urls_async,
+    replace_poster_urls_async,
+)
+
+logger = get_task_logger("poster_mirror", "scraping.log")
+
+# Descargas simultáneas (las imágenes salen de la CDN de TMDB, no de la API)
+DOWNLOAD_CONCURRENCY = 4
+
+
+def poster_mirror_dir() -> Path | None:
+    """Carpeta del espejo (POSTER_MIRROR_DIR), o None si la etapa está apagada."""
+    path = os.getenv("POSTER_MIRROR_DIR", "").strip()
+    return Path(path) if path else None
+
+
+def poster_mirror_widths() -> tuple[int, ...]:
+    """Anchos de las variantes, de menor a mayor: POSTER_MIRROR_WIDTHS (185,342)."""
+    raw = os.getenv("POSTER_MIRROR_WIDTHS", "185,342")
+    widths = sorted({int(w) for w in raw.split(",") if w.strip().isdigit()})
+    return tuple(widths) or (185, 342)
+
+
+def mirror_srcset(poster_url: str) -> str | None:
+    """`srcset` de las variantes WebP de un póster del espejo, o None si es remoto."""
+    prefix = os.getenv("POSTER_MIRROR_URL", "/posters").rstrip("/")
+    if not poster_url.startswith(f"{prefix}/"):
+        return None
+    folder = poster_url.rsplit("/", 1)[0]
+    return ", ".join(
+        f"{folder}/w{width}.webp {width}w" for width in poster_mirror_widths()
+    )
+
+
+class PosterMirror:
+    """Pósters copiados en disco, direccionados por el hash de su contenido."""
+
+    def __init__(
+        self,
+        root: Path | str,
+        url_prefix: str | None = None,
+        widths: tuple[int, ...] | None = None,
+    ):
+        self.root = Path(root)
+        self.url_prefix = (
+            url_prefix or os.getenv("POSTER_MIRROR_URL", "/posters")
+        ).rstrip("/")
+        self.widths = widths or poster_mirror_widths()
+        self.formats = ["webp"] + (["avif"] if features.check("avif") else [])
+        self.index_path = self.root / "index.json"
+        self._index: dict[str, str] | None = None
+
+    # --- Índice URL remota -> hash ---
+
+    @property
+    def index(self) -> dict[str, str]:
+        """URL remota -> hash del contenido, leído del disco la primera vez."""
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def _load_index(self) -> dict[str, str]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            return json.loads(self.index_path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Índice del espejo de pósters ilegible: {e}")
+            return {}
+
+    def save_index(self) -> None:
+        """Escribe el índice en disco."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path.write_text(json.dumps(self.index, indent=1, sort_keys=True))
+
+    # --- Rutas ---
+
+    def variant_dir(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def local_url(self, digest: str) -> str:
+        """URL de la variante por defecto: la más ancha, en WebP."""
+        return f"{self.url_prefix}/{digest[:2]}/{digest}/w{self.widths[-1]}.webp"
+
+    def digest_of(self, poster_url: str) -> str | None:
+        """Hash de una URL local del espejo, o None si no es del espejo."""
+        if not poster_url.startswith(f"{self.url_prefix}/"):
+            return None
+        parts = poster_url[len(self.url_prefix) + 1 :].split("/")
+        return parts[1] if len(parts) == 3 else None
+
+    def is_mirrored(self, digest: str) -> bool:
+        """True si ya están en disco todas las variantes de ese contenido."""
+        folder = self.variant_dir(digest)
+        return all(
+            (folder / f"w{width}.{fmt}").exists()
+            for width in self.widths
+            for fmt in self.formats
+        )
+
+    # --- Variantes ---
+
+    def write_variants(self, content: bytes) -> str:
+        """
+        Genera las variantes de una imagen y devuelve el hash de su contenido.
+
+        Raises:
+            UnidentifiedImageError: Si los bytes no son una imagen.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        if self.is_mirrored(digest):
+            return digest
+
+        folder = self.variant_dir(digest)
+        folder.mkdir(parents=True, exist_ok=True)
+        with Image.open(io.BytesIO(content)) as original:
+            image = original.convert("RGB")
+
+        for width in self.widths:
+            # Nunca se agranda: si el original es más chico, se usa tal cual
+            variant = image
+            if image.width > width:
+                height = round(image.height * width / image.width)
+                variant = image.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt in self.formats:
+                target = folder / f"w{width}.{fmt}"
+                # Se escribe aparte y se renombra: Nginx nunca ve un archivo a medias
+                partial = target.with_suffix(f".{fmt}.part")
+                variant.save(partial, format=fmt.upper(), quality=80)
+                partial.replace(target)
+
+        return digest
+
+    # --- Limpieza ---
+
+    def collect_garbage(self, referenced: set[str]) -> int:
+        """
+        Borra los pósters cuyo hash ya no usa ninguna función.
+
+        Returns:
+            int: Número de pósters (carpetas de variantes) borrados.
+        """
+        removed = 0
+        for folder in self.root.glob("??/*"):
+            if folder.is_dir() and folder.name not in referenced:
+                shutil.rmtree(folder)
+                removed += 1
+        for prefix in self.root.glob("??"):
+            if prefix.is_dir() and not any(prefix.iterdir()):
+                prefix.rmdir()
+
+        self._index = {
+            url: digest for url, digest in self.index.items() if digest in referenced
+        }
+        return removed
+
+
+async def _download(client: httpx.AsyncClient, url: str) -> bytes | None:
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+    except httpx.HTTPStatusError as e:
+        logger.warning(f"Error HTTP {e.response.status_code} al copiar póster {url}")
+    except httpx.RequestError as e:
+        logger.warning(f"Error de conexión al copiar póster {url}: {e}")
+    return None
+
+
+async def mirror_posters(mirror: PosterMirror | None = None) -> int:
+    """
+    Copia en local los pósters remotos y apunta las funciones a las copias.
+
+    Args:
+        mirror (PosterMirror, optional): Espejo a usar. Por defecto, el de
+            POSTER_MIRROR_DIR; si no está definido la etapa no hace nada.
+
+    Returns:
+        int: Número de funciones cuyo `poster_url` pasó a ser local.
+    """
+    if mirror is None:
+        root = poster_mirror_dir()
+        if root is None:
+            return 0
+        mirror = PosterMirror(root)
+
+    remote_urls = {
+        url for url in await get_poster_urls_async() if url.startswith("http")
+    }
+    digests: dict[str, str] = {}
+    pending: list[str] = []
+    for url in remote_urls:
+        digest = mirror.index.get(url)
+        if digest and mirror.is_mirrored(digest):
+            digests[url] = digest
+        else:
+            pending.append(url)
+    metrics.increment("poster_mirror.reused", len(digests))
+
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    async def copy(client: httpx.AsyncClient, url: str) -> None:
+        async with semaphore:
+            content = await _download(client, url)
+        if content is None:
+            metrics.increment("poster_mirror.failed")
+            return
+        try:
+            # Pillow es CPU: fuera del event loop
+            digests[url] = await asyncio.to_thread(mirror.write_variants, content)
+        except (UnidentifiedImageError, OSError) as e:
+            metrics.increment("poster_mirror.failed")
+            logger.warning(f"No se pudo convertir el póster {url}: {e}")
+            return
+        metrics.increment("poster_mirror.downloaded")
+
+    if pending:
+        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            await asyncio.gather(*(copy(client, url) for url in pending))
+
+    mirror.index.update(digests)
+    rewritten = await replace_poster_urls_async(
+        {url: mirror.local_url(digest) for url, digest in digests.items()}
+    )
+
+    # Lo que queda referenciado después de reescribir (incluye lo ya local)
+    referenced = {
+        digest
+        for url in await get_poster_urls_async()
+        if (digest := mirror.digest_of(url)) is not None
+    }
+    removed = mirror.collect_garbage(referenced)
+    mirror.save_index()
+
+    metrics.increment("poster_mirror.removed", removed)
+    logger.info(
+        f"Espejo de pósters: {len(remote_urls)} remotos, {len(pending)} descargados "
+        f"o intentados, {rewritten} funciones apuntan a la copia local, "
+        f"{removed} pósters sin uso borrados."
+    )
+    return rewritten
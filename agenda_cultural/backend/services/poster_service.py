@@ -0,0 +1,108 @@
+"""
+Etapa de pósters del pipeline de scraping.
+
+Los scrapers guardan las funciones nuevas sin póster. Después del scraping, esta
+etapa:
+1. Lee de la BD las funciones futuras que siguen sin póster.
+2. Agrupa sus títulos por título normalizado: una película que se proyecta cinco
+   veces (o en dos centros) se consulta una sola vez.
+3. Resuelve los títulos únicos en paralelo, con a lo sumo TMDB_CONCURRENCY (4)
+   consultas en vuelo.
+4. Asigna los pósters encontrados en bloque, en una sola transacción: la ruta
+   de TMDB (para el `srcset`) y la URL del tamaño por defecto.
+"""
+
+import asyncio
+import os
+from collections import defaultdict
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.log_config import get_task_logger
+from agenda_cultural.backend.services.database_service import (
+    get_movies_without_poster_async,
+    update_movie_posters_async,
+)
+from agenda_cultural.backend.services.poster_cache import (
+    hit_rate_summary,
+    normalize_title,
+)
+from agenda_cultural.backend.services.tmdb_service import (
+    close_tmdb_client,
+    get_image_config,
+    get_movie_poster,
+)
+
+logger = get_task_logger("poster_service", "scraping.log")
+
+
+def tmdb_concurrency() -> int:
+    """Consultas a TMDB en vuelo a la vez: TMDB_CONCURRENCY (4)."""
+    try:
+        return max(1, int(os.getenv("TMDB_CONCURRENCY", "4")))
+    except ValueError:
+        return 4
+
+
+async def enrich_posters(concurrency: int | None = None) -> int:
+    """
+    Completa el póster de las funciones futuras que no lo tienen.
+
+    Args:
+        concurrency (int, optional): Consultas simultáneas a TMDB. Por defecto
+            TMDB_CONCURRENCY.
+
+    Returns:
+        int: Número de funciones a las que se asignó póster.
+    """
+    movies = await get_movies_without_poster_async()
+    if not movies:
+        return 0
+
+    # Título normalizado -> (primer título tal como aparece, ids de sus funciones)
+    titles: dict[str, str] = {}
+    ids_by_title: defaultdict[str, list[int]] = defaultdict(list)
+    for movie in movies:
+        key = normalize_title(movie.title)
+        titles.setdefault(key, movie.title)
+        if movie.id is not None:
+            ids_by_title[key].append(movie.id)
+
+    semaphore = asyncio.Semaphore(concurrency or tmdb_concurrency())
+
+    async def resolve(key: str) -> tuple[str, str | None]:
+        async with semaphore:
+            return key, await get_movie_poster(titles[key])
+
+    try:
+        resolved = await asyncio.gather(*(resolve(key) for key in titles))
+        image_config = await get_image_config()
+    finally:
+        await close_tmdb_client()
+
+    ids_by_poster: defaultdict[tuple[str, str], list[int]] = defaultdict(list)
+    for key, poster_path in resolved:
+        if poster_path:
+            poster = (poster_path, image_config.poster_url(poster_path))
+            ids_by_poster[poster].extend(ids_by_title[key])
+
+    filled = await update_movie_posters_async(dict(ids_by_poster))
+
+    metrics.increment("posters.unique_titles", len(titles))
+    metrics.increment("posters.filled", filled)
+    logger.info(
+        f"Pósters: {len(movies)} funciones sin póster, {len(titles)} títulos únicos, "
+        f"{filled} funciones completadas."
+    )
+    if tmdb_requests := metrics.get("tmdb.requests"):
+        logger.info(
+            f"TMDB: {tmdb_requests} consultas, latencia p50 "
+            f"{metrics.percentile('tmdb.latency_ms', 50):.0f} ms / p95 "
+            f"{metrics.percentile('tmdb.latency_ms', 95):.0f} ms, "
+            f"{metrics.get('tmdb.throttled')} limitadas (429), "
+            f"{metrics.get('tmdb.retried')} reintentos, "
+            f"{metrics.get('tmdb.failed')} fallidas."
+        )
+    if poster_summary := hit_rate_summary():
+        logger.info(poster_summary)
+
+    return filled
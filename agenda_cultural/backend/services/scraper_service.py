@@ -3,52 +3,356 @@ Servicio de ejecución concurrente de scrapers.
 
 Este módulo se encarga de:
 1. Orquestar la ejecución paralela de todos los scrapers definidos en el sistema.
-2. Reportar el posible error que pueda mostrar uno o más scrapers, sin que este afecte a los demás.
-3. Unificar los resultados en una única lista maestra de películas.
+2. Compartir un único pool de navegadores entre todos los scrapers, en lugar de
+   lanzar un Chromium por centro cultural, y un único cliente HTTP para los
+   scrapers que pueden leer su sitio sin navegador.
+3. Entregar a cada scraper las funciones que ya están en la BD, para que solo
+   cargue el detalle de las nuevas (con una corrida completa periódica).
+4. Dar a cada centro un tiempo máximo (y a la corrida entera un plazo global):
+   si se agota, el scraper se cancela, se cierra su contexto y se conservan las
+   películas que alcanzó a extraer.
+5. Reportar el resultado de cada scraper (completo, incompleto por páginas que
+   fallaron, sin tiempo o con error), sin que un fallo afecte a los demás.
+6. Unificar los resultados en una única lista maestra de películas.
 """
 
 import asyncio
-from agenda_cultural.backend.scrapers import all_scrapers
+import os
+import time
+from collections.abc import Callable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+from zoneinfo import ZoneInfo
+
+from agenda_cultural.backend import metrics
+
+from agenda_cultural.backend.scrapers import (
+    BrowserPool,
+    HttpFetcher,
+    ScraperInterface,
+    all_scrapers,
+)
+from agenda_cultural.backend.scrapers.known_movies import (
+    NO_KNOWN_MOVIES,
+    KnownMovies,
+    Signature,
+    full_refresh_due,
+)
 from agenda_cultural.backend.models import Movie
 from agenda_cultural.backend.log_config import get_task_logger
+from agenda_cultural.backend.services.database_service import get_known_movies_async
 
 logger = get_task_logger("scraper_service", "scraping.log")
 
 
-async def fetch_all_movies() -> list[Movie]:
+class ScraperStatus(StrEnum):
+    """Cómo terminó un scraper en la corrida."""
+
+    OK = "ok"
+    # Terminó, pero el scraper registró fallos: faltan películas del centro
+    PARTIAL = "partial"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+# Recibe un lote de películas, lo guarda y devuelve cuántas eran nuevas
+MovieSink = Callable[[list[Movie]], int]
+
+
+@dataclass
+class ScraperOutcome:
     """
-    Ejecuta todos los scrapers disponibles en paralelo y unifica los resultados.
+    Resultado de un scraper: estado, películas (parciales si hubo timeout) y duración.
+
+    `failures` cuenta los fallos técnicos que registró el scraper (páginas que no
+    cargaron); solo un resultado OK, sin fallos, es la cartelera completa.
+
+    Con un sink, las películas se entregan por lotes a medida que llegan y no se
+    acumulan en `movies`; `found` y `saved` cuentan las extraídas y las nuevas.
+    """
+
+    center: str
+    status: ScraperStatus
+    movies: list[Movie] = field(default_factory=list)
+    elapsed: float = 0.0
+    error: BaseException | None = None
+    found: int = 0
+    saved: int = 0
+    failures: int = 0
+
+
+class _BatchWriter:
+    """Acumula las películas de un centro y las entrega al sink cada `batch_size`."""
+
+    def __init__(self, slug: str, sink: MovieSink | None, batch_size: int):
+        self.slug = slug
+        self.sink = sink
+        self.batch_size = batch_size
+        self.kept: list[Movie] = []
+        self.pending: list[Movie] = []
+        self.emitted: set[Signature] = set()
+        self.found = 0
+        self.saved = 0
+
+    def add(self, movie: Movie) -> None:
+        signature = (movie.center, movie.title, movie.date)
+        if signature in self.emitted:
+            return
+        self.emitted.add(signature)
+        self.found += 1
 
-    Utiliza asyncio.gather para concurrencia. Si un scraper individual falla,
-    se captura la excepción y se registran los errores sin detener el resto
-    del proceso.
+        if self.sink is None:
+            self.kept.append(movie)
+            return
+        self.pending.append(movie)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Entrega al sink lo pendiente (un commit por lote)."""
+        if self.sink is None or not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        self.saved += self.sink(batch)
+        metrics.increment(f"sync.{self.slug}.batches")
+
+    def outcome(
+        self,
+        status: ScraperStatus,
+        elapsed: float,
+        error: BaseException | None = None,
+        failures: int = 0,
+    ) -> ScraperOutcome:
+        return ScraperOutcome(
+            self.slug,
+            status,
+            self.kept,
+            elapsed,
+            error,
+            found=self.found,
+            saved=self.saved,
+            failures=failures,
+        )
+
+
+def sync_batch_size() -> int:
+    """Películas por commit al guardar en streaming: SCRAPER_SYNC_BATCH (25)."""
+    try:
+        return max(1, int(os.getenv("SCRAPER_SYNC_BATCH", "25")))
+    except ValueError:
+        return 25
+
+
+def pipeline_timeout() -> float:
+    """Plazo global (segundos) de la fase de scraping: SCRAPER_PIPELINE_TIMEOUT."""
+    try:
+        return float(os.getenv("SCRAPER_PIPELINE_TIMEOUT", "900"))
+    except ValueError:
+        return 900.0
+
+
+async def prime_known_movies(scrapers: list[ScraperInterface]) -> None:
+    """
+    Carga de la BD las funciones futuras de cada centro y se las asigna a su scraper.
+
+    Si la BD no está disponible se sigue sin datos conocidos (se recorre todo).
+    """
+    now = datetime.now(ZoneInfo("America/Lima")).replace(tzinfo=None)
+
+    if full_refresh_due(now):
+        logger.info("Corrida completa: se ignoran las funciones ya guardadas en la BD.")
+        for scraper in scrapers:
+            scraper.known_movies = KnownMovies(full_refresh=True)
+        return
+
+    try:
+        known = await get_known_movies_async(
+            [scraper.CENTER_SLUG for scraper in scrapers]
+        )
+    except Exception as e:
+        logger.warning(f"No se pudieron leer las funciones guardadas en la BD: {e}")
+        known = {}
+
+    for scraper in scrapers:
+        stored = known.get(scraper.CENTER_SLUG, [])
+        scraper.known_movies = (
+            KnownMovies.from_movies(stored) if stored else NO_KNOWN_MOVIES
+        )
+        logger.info(
+            f"[{scraper.CENTER_SLUG}] {len(stored)} funciones futuras en la BD."
+        )
+
+
+async def run_scraper(
+    scraper: ScraperInterface,
+    browser_pool: BrowserPool | None,
+    http_fetcher: HttpFetcher | None,
+    deadline: float,
+    sink: MovieSink | None = None,
+    batch_size: int | None = None,
+) -> ScraperOutcome:
+    """
+    Ejecuta un scraper dentro de su tiempo máximo y sin pasar del plazo global.
+
+    Las películas se consumen con `iter_movies` a medida que el scraper las
+    extrae. Si se recibe un `sink`, se le entregan por lotes de `batch_size`
+    (SCRAPER_SYNC_BATCH) y lo que quede al final del centro, termine como termine:
+    un centro lento o roto no retrasa el guardado de lo que ya se obtuvo.
+
+    Al agotarse el tiempo, `asyncio.timeout` cancela la tarea: los `async with`
+    del scraper cierran su contexto del navegador y se conservan también las
+    películas que registró con `collect_partial` y aún no se habían consumido.
+
+    Args:
+        scraper: Scraper a ejecutar.
+        browser_pool: Pool de navegadores compartido de la corrida.
+        http_fetcher: Cliente HTTP compartido de la corrida.
+        deadline: Plazo global, en el reloj del event loop (`loop.time()`).
+        sink: Función que guarda un lote de películas (p. ej. `sync_movies_to_db`).
+            Sin sink, las películas se devuelven en el resultado.
+        batch_size: Películas por lote. Por defecto SCRAPER_SYNC_BATCH.
 
     Returns:
-        list[Movie]: Lista combinada de todas las películas encontradas.
+        ScraperOutcome: Estado, películas y duración del scraper.
+    """
+    slug = scraper.CENTER_SLUG or type(scraper).__name__
+    writer = _BatchWriter(slug, sink, batch_size or sync_batch_size())
+    loop = asyncio.get_running_loop()
+    budget = scraper.time_budget()
+    center_deadline = loop.time() + budget
+    start = time.perf_counter()
+    scraper.reset_partial_results()
+
+    try:
+        async with asyncio.timeout_at(min(center_deadline, deadline)) as timeout:
+            async with aclosing(
+                scraper.iter_movies(browser_pool, http_fetcher)
+            ) as movies:
+                async for movie in movies:
+                    writer.add(movie)
+        writer.flush()
+
+    except TimeoutError as e:
+        elapsed = time.perf_counter() - start
+        if not timeout.expired():
+            # Un TimeoutError del propio scraper es un fallo, no nuestro plazo
+            return _failed(writer, e, elapsed)
+
+        for movie in scraper.partial_results:
+            writer.add(movie)
+        writer.flush()
+
+        reason = (
+            f"su tiempo máximo ({budget:.0f} s)"
+            if center_deadline <= deadline
+            else "el plazo global de la corrida"
+        )
+        metrics.increment(f"outcome.{slug}.timeout")
+        metrics.increment(f"outcome.{slug}.partial_movies", writer.found)
+        logger.warning(
+            f"[{slug}] Cancelado al agotar {reason} tras {elapsed:.1f} s; "
+            f"se conservan {writer.found} películas parciales."
+        )
+        return writer.outcome(ScraperStatus.TIMEOUT, elapsed, failures=scraper.failures)
+
+    except Exception as e:
+        return _failed(writer, e, time.perf_counter() - start)
+
+    elapsed = time.perf_counter() - start
+    if scraper.failures:
+        # Lo extraído se guarda, pero no cuenta como la cartelera completa
+        metrics.increment(f"outcome.{slug}.partial")
+        logger.warning(
+            f"[{slug}] {writer.found} películas en {elapsed:.1f} s, con "
+            f"{scraper.failures} fallo(s): el centro queda incompleto."
+        )
+        return writer.outcome(ScraperStatus.PARTIAL, elapsed, failures=scraper.failures)
+
+    metrics.increment(f"outcome.{slug}.ok")
+    logger.info(f"[{slug}] {writer.found} películas en {elapsed:.1f} s.")
+    return writer.outcome(ScraperStatus.OK, elapsed)
+
+
+def _failed(
+    writer: _BatchWriter, error: BaseException, elapsed: float
+) -> ScraperOutcome:
+    """Registra un scraper que terminó con una excepción y guarda lo ya obtenido."""
+    metrics.increment(f"outcome.{writer.slug}.error")
+    logger.error(f"[{writer.slug}] Falló el scraper tras {elapsed:.1f} s: {error}")
+    try:
+        writer.flush()
+    except Exception as e:
+        logger.error(f"[{writer.slug}] No se pudo guardar el último lote: {e}")
+    return writer.outcome(ScraperStatus.ERROR, elapsed, error)
+
+
+async def fetch_all_outcomes(
+    sink: MovieSink | None = None,
+    batch_size: int | None = None,
+) -> list[ScraperOutcome]:
+    """
+    Ejecuta todos los scrapers en paralelo y devuelve el resultado de cada uno.
+
+    Todos los scrapers reciben el mismo `BrowserPool`, que reparte contextos
+    aislados sobre uno o pocos navegadores, y el mismo `HttpFetcher`. Chromium se
+    lanza de forma perezosa, así que si todos los centros se resuelven por HTTP
+    no llega a arrancar. Cada scraper corre con su tiempo máximo y todos
+    comparten el plazo global SCRAPER_PIPELINE_TIMEOUT.
+
+    Args:
+        sink: Si se indica, cada centro guarda sus películas por lotes a medida
+            que llegan (ver `run_scraper`) en lugar de acumularlas.
+        batch_size: Películas por lote. Por defecto SCRAPER_SYNC_BATCH.
+
+    Returns:
+        list[ScraperOutcome]: Un resultado por scraper, en el orden de `all_scrapers`.
     """
+    await prime_known_movies(all_scrapers)
 
-    # Expresión generadora para recorrer la lista de funciones (all_scrapers).
-    # La variable temporal 'scraper' toma cada función y al añadirle '()' la ejecutamos.
-    # El asterisco '*' desempaqueta estas tareas iniciadas para que asyncio.gather las procese.
-    # La variable 'results' almacena una lista de listas de películas por cada centro cultural. Por ejemplo:
-    # results = [
-    #   [Movie(1), Movie(2), Movie(3)],  # Éxito: Películas del primer centro cultural
-    #   TimeoutError(...),               # Fallo: Excepción en el segundo centro cultural
-    #   [Movie(1)]                       # Éxito: Películas del tercer centro cutlural
-    # ]
-    results: list[list[Movie] | BaseException] = await asyncio.gather(
-        *(scraper() for scraper in all_scrapers),
-        return_exceptions=True,
+    async with (
+        BrowserPool() as browser_pool,
+        HttpFetcher(user_agent=ScraperInterface.USER_AGENT) as http_fetcher,
+    ):
+        deadline = asyncio.get_running_loop().time() + pipeline_timeout()
+        outcomes = await asyncio.gather(
+            *(
+                run_scraper(
+                    scraper, browser_pool, http_fetcher, deadline, sink, batch_size
+                )
+                for scraper in all_scrapers
+            )
+        )
+
+    logger.info(
+        f"Pool de navegadores: {browser_pool.launches} lanzamiento(s) de Chromium, "
+        f"{browser_pool.contexts} contexto(s) entregados."
+    )
+    logger.info(
+        f"Motor HTTP: {http_fetcher.requests} peticiones, "
+        f"{http_fetcher.bytes_received // 1024} KB recibidos."
     )
+    logger.info(
+        "Resultado por centro: "
+        + ", ".join(
+            f"{outcome.center}={outcome.status} ({outcome.found})"
+            for outcome in outcomes
+        )
+    )
+    return outcomes
+
 
-    movies_scraped: list[Movie] = []
+async def fetch_all_movies() -> list[Movie]:
+    """
+    Ejecuta todos los scrapers disponibles en paralelo y unifica los resultados.
 
-    # Procesamos la lista mixta de resultados (pueden ser listas o excepciones)
-    for result in results:
-        if isinstance(result, list):
-            movies_scraped.extend(result)
+    Los scrapers que agotaron su tiempo aportan sus películas parciales; los que
+    fallaron aportan las que alcanzaron a emitir, sin detener el resto del proceso.
 
-        elif isinstance(result, Exception):
-            logger.error(f"Falló uno de los scrapers: {result}")
+    Returns:
+        list[Movie]: Lista combinada de todas las películas encontradas.
+    """
+    outcomes = await fetch_all_outcomes()
 
-    return movies_scraped
+    return [movie for outcome in outcomes for movie in outcome.movies]
@@ -3,16 +3,57 @@ Servicio de integración con la API de The Movie Database (TMDB).
 
 Permite obtener el póster de la películas mediante búsqueda por el título.
 Maneja la autenticación y los posibles errores de red.
+
+Del póster se guarda la ruta de TMDB (`/abc.jpg`), no una URL fija: los tamaños
+disponibles se leen de /configuration (`get_image_config`), se guardan en
+TMDB_CONFIG_PATH (.cache/tmdb_configuration.json) y se refrescan cada
+TMDB_CONFIG_TTL_DAYS (3) días. Con ellos el frontend arma un `srcset` y cada
+dispositivo descarga el tamaño más chico que le sirve. El scraper y la app
+corren en máquinas distintas, así que cada uno mantiene su propia copia: en la
+app la refresca una tarea de fondo del backend (`keep_image_config_fresh`) y las
+páginas solo leen el archivo, sin esperar a TMDB.
+
+Las consultas son asíncronas y comparten un único `httpx.AsyncClient` por event
+loop (conexiones keep-alive y HTTP/2 si el paquete opcional `h2` está instalado),
+así que un scraper que espera a TMDB no detiene a los demás. Cada consulta suma
+su latencia a las métricas de la corrida (`tmdb.requests` y una medición por
+consulta en `tmdb.latency_ms`, de la que se leen p50 y p95).
+
+Antes de consultar TMDB se mira la caché persistente de pósters
+(`poster_cache`), que también recuerda los títulos sin póster.
+
+Todas las consultas pasan por un limitador compartido (token bucket) con
+TMDB_RATE_LIMIT peticiones por segundo y ráfagas de TMDB_RATE_BURST. Un 429
+pausa el limitador el tiempo que indica `Retry-After`, y los 5xx y errores de
+red se reintentan con backoff exponencial y jitter (TMDB_MAX_RETRIES veces).
+Las métricas `tmdb.throttled`, `tmdb.retried` y `tmdb.failed` permiten subir
+TMDB_CONCURRENCY sin perder pósters en silencio.
 """
 
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from email.utils import parsedate_to_datetime
+
 import httpx
 
+from agenda_cultural.backend import metrics
 from agenda_cultural.backend.config import (
     TMDB_BASE_URL,
     TMDB_IMAGE_BASE_URL,
+    TMDB_POSTER_SIZE,
     TMDB_TOKEN,
 )
 from agenda_cultural.backend.log_config import get_task_logger
+from agenda_cultural.backend.services.poster_cache import (
+    poster_cache,
+    poster_cache_enabled,
+)
 
 # Usamos 'scraping.log' para centralizar todo el flujo del proceso en un solo lugar.
 logger = get_task_logger("tmdb_service", "scraping.log")
@@ -24,21 +65,275 @@ if not TMDB_TOKEN:
     )
 
 
-def get_movie_poster(title: str) -> str | None:
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """
+    Limitador asíncrono de peticiones por segundo, compartido por todas las
+    consultas del proceso.
+
+    Se recargan `rate` fichas por segundo hasta un máximo de `capacity`; cada
+    petición consume una y, si no hay, espera a la siguiente. `pause` bloquea el
+    bucket entero (por ejemplo, tras un 429 con `Retry-After`).
     """
-    Busca una película por su título en TMDB y devuelve la URL absoluta de su póster.
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = max(rate, 0.001)
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Espera hasta poder hacer una petición y consume su ficha."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Nadie hace peticiones durante `seconds` (se suma a una pausa en curso)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+@dataclass
+class RetryPolicy:
+    """Reintentos ante 429, 5xx y errores de red, con backoff exponencial y jitter."""
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        """Espera antes del reintento `attempt` (0, 1, 2...): jitter completo."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def retry_after(self, response: httpx.Response, attempt: int) -> float:
+        """Segundos indicados por `Retry-After` (número o fecha HTTP), o el backoff."""
+        header = response.headers.get("Retry-After", "").strip()
+        if header.isdigit():
+            return min(float(header), self.max_delay)
+        if header:
+            try:
+                moment = parsedate_to_datetime(header)
+                return min(max(moment.timestamp() - time.time(), 0.0), self.max_delay)
+            except (TypeError, ValueError):
+                pass
+        return self.delay(attempt)
+
+
+# Limitador y política compartidos por todas las consultas (los tests los sustituyen)
+rate_limiter = TokenBucket(
+    rate=_env_number("TMDB_RATE_LIMIT", 20), capacity=_env_number("TMDB_RATE_BURST", 10)
+)
+retry_policy = RetryPolicy(
+    max_retries=int(_env_number("TMDB_MAX_RETRIES", 3)),
+    base_delay=_env_number("TMDB_BACKOFF_BASE", 0.5),
+)
+
+# HTTP/2 solo si está instalado `h2` (httpx[http2]); si no, HTTP/1.1 con keep-alive
+HTTP2_AVAILABLE: bool = importlib.util.find_spec("h2") is not None
+
+# Cliente compartido y el event loop al que pertenece (un AsyncClient no se
+# puede usar desde otro loop)
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _shared_client() -> httpx.AsyncClient:
+    """Devuelve el cliente del event loop actual, creándolo la primera vez."""
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=TMDB_BASE_URL,
+            http2=HTTP2_AVAILABLE,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_tmdb_client() -> None:
+    """Cierra el cliente compartido. Se llama al terminar la fase de scraping."""
+    global _client, _client_loop
+
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+@dataclass
+class ImageConfig:
+    """Base de imágenes y tamaños de póster publicados por /configuration de TMDB."""
+
+    base_url: str = TMDB_IMAGE_BASE_URL
+    poster_sizes: list[str] = field(
+        default_factory=lambda: ["w92", "w154", "w185", "w342", "w500", "w780"]
+    )
+
+    def poster_url(self, poster_path: str, size: str = TMDB_POSTER_SIZE) -> str:
+        """URL absoluta de un póster en el tamaño pedido (p. ej. "w342")."""
+        return f"{self.base_url}{size}{poster_path}"
+
+    def srcset_widths(self, max_width: int | None = None) -> list[int]:
+        """Anchos en píxeles ("wNNN") hasta `max_width`, de menor a mayor."""
+        limit = max_width or int(_env_number("TMDB_POSTER_MAX_WIDTH", 342))
+        widths = {
+            int(size[1:])
+            for size in self.poster_sizes
+            if size.startswith("w") and size[1:].isdigit()
+        }
+        return sorted(width for width in widths if width <= limit)
+
+    def srcset(self, poster_path: str, max_width: int | None = None) -> str:
+        """Atributo `srcset` con un candidato por tamaño ("<url> 185w, ...")."""
+        return ", ".join(
+            f"{self.poster_url(poster_path, f'w{width}')} {width}w"
+            for width in self.srcset_widths(max_width)
+        )
+
+
+def _image_config_path() -> Path:
+    return Path(
+        os.getenv("TMDB_CONFIG_PATH", ".cache/tmdb_configuration.json")
+    ).expanduser()
+
+
+def _image_config_ttl() -> float:
+    """Segundos que vale la configuración guardada: TMDB_CONFIG_TTL_DAYS (3)."""
+    return 24 * 60 * 60 * _env_number("TMDB_CONFIG_TTL_DAYS", 3)
+
+
+def load_image_config() -> ImageConfig:
+    """
+    Configuración de imágenes guardada en disco (aunque esté vencida), o la de
+    por defecto si nunca se descargó. No hace peticiones.
+    """
+    path = _image_config_path()
+    if not path.exists():
+        return ImageConfig()
+    try:
+        data = json.loads(path.read_text())
+        return ImageConfig(base_url=data["base_url"], poster_sizes=data["poster_sizes"])
+    except (OSError, KeyError, TypeError, json.JSONDecodeError) as e:
+        logger.warning(f"Configuración de imágenes de TMDB ilegible ({path}): {e}")
+        return ImageConfig()
+
+
+async def get_image_config() -> ImageConfig:
+    """
+    Configuración de imágenes de TMDB, refrescada desde /configuration cuando la
+    guardada tiene más de TMDB_CONFIG_TTL_DAYS días. Si TMDB no responde se usa
+    la guardada (o la de por defecto).
+    """
+    path = _image_config_path()
+    if path.exists() and time.time() - path.stat().st_mtime < _image_config_ttl():
+        return load_image_config()
+    if not TMDB_TOKEN or os.getenv("SCRAPER_MODE", "").lower() == "replay":
+        return load_image_config()
+
+    headers = {"accept": "application/json", "Authorization": f"Bearer {TMDB_TOKEN}"}
+    try:
+        response = await _request_with_retries("/configuration", headers=headers)
+        response.raise_for_status()
+        images = response.json()["images"]
+        config = ImageConfig(
+            base_url=images["secure_base_url"], poster_sizes=images["poster_sizes"]
+        )
+    except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"No se pudo leer /configuration de TMDB: {e}")
+        return load_image_config()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(config)))
+    return config
+
+
+async def keep_image_config_fresh() -> None:
+    """
+    Tarea de fondo del backend de la app (`register_lifespan_task`): refresca la
+    configuración guardada al arrancar y luego cada TMDB_CONFIG_TTL_DAYS días.
+    """
+    while True:
+        await get_image_config()
+        await close_tmdb_client()
+        await asyncio.sleep(_image_config_ttl())
+
+
+def _as_poster_path(poster: str) -> str:
+    """Ruta de TMDB de un póster; la caché puede traer URLs completas antiguas."""
+    if poster.startswith("http"):
+        return "/" + poster.rsplit("/", 1)[-1]
+    return poster
+
+
+async def get_movie_poster(title: str) -> str | None:
+    """
+    Busca una película por su título en TMDB y devuelve la ruta de su póster.
 
     Args:
         title (str): Título de la película a buscar.
 
     Returns:
-        str | None: URL de la imagen si se encuentra, o None si falla/no existe.
+        str | None: Ruta de la imagen en TMDB (p. ej. "/abc.jpg") si se
+            encuentra, o None si falla/no existe. La URL se arma con
+            `ImageConfig.poster_url`.
     """
     # Chequeo rápido (Fail Fast): Si no hay token, salimos silenciosamente
     # porque ya avisamos en el log al inicio del archivo.
     if not TMDB_TOKEN:
         return None
 
+    # Al reproducir un HAR (SCRAPER_MODE=replay) la corrida no debe salir a la red
+    if os.getenv("SCRAPER_MODE", "").lower() == "replay":
+        return None
+
+    if poster_cache_enabled():
+        found, cached_poster = poster_cache.lookup(title)
+        if found:
+            return _as_poster_path(cached_poster) if cached_poster else None
+
+    answered, poster_path = await _search_poster(title)
+
+    # Solo se guarda una respuesta de TMDB; un error se reintenta la próxima vez
+    if answered and poster_cache_enabled():
+        poster_cache.store(title, poster_path)
+    return poster_path
+
+
+async def _search_poster(title: str) -> tuple[bool, str | None]:
+    """
+    Consulta /search/movie en TMDB.
+
+    Returns:
+        tuple[bool, str | None]: (TMDB respondió, ruta del póster). Un error de
+            red o HTTP devuelve (False, None).
+    """
     headers = {"accept": "application/json", "Authorization": f"Bearer {TMDB_TOKEN}"}
 
     params = {
@@ -48,37 +343,80 @@ def get_movie_poster(title: str) -> str | None:
         "page": 1,
     }
 
-    url = f"{TMDB_BASE_URL}/search/movie"
-
     try:
-        # Usamos el cliente como Context Manager para asegurar que se cierre la conexión
-        with httpx.Client() as client:
-            response = client.get(url, headers=headers, params=params, timeout=10.0)
+        response = await _request_with_retries(
+            "/search/movie", headers=headers, params=params
+        )
 
-            # Si hay error (40X o 50X), lanzamos excepción para capturarla abajo
-            response.raise_for_status()
+        # Si hay error (40X o 50X), lanzamos excepción para capturarla abajo
+        response.raise_for_status()
 
-            data = response.json()
-            results = data.get("results", [])
+        data = response.json()
+        results = data.get("results", [])
 
-            if results:
-                # Tomamos el primer resultado como la mejor coincidencia
-                best_match = results[0]
-                poster_path = best_match.get("poster_path")
+        if results:
+            # Tomamos el primer resultado como la mejor coincidencia
+            best_match = results[0]
+            poster_path = best_match.get("poster_path")
 
-                if poster_path:
-                    return f"{TMDB_IMAGE_BASE_URL}{poster_path}"
+            if poster_path:
+                return True, poster_path
 
-            # Si llegamos aquí, la búsqueda fue exitosa pero no trajo resultados o imagen
-            logger.warning(f"No se encontró póster para '{title}'")
-            return None
+        # Si llegamos aquí, la búsqueda fue exitosa pero no trajo resultados o imagen
+        logger.warning(f"No se encontró póster para '{title}'")
+        return True, None
 
     except httpx.HTTPStatusError as e:
+        metrics.increment("tmdb.failed")
         logger.error(f"Error HTTP {e.response.status_code} de TMDB para '{title}'")
-        return None
+        return False, None
     except httpx.RequestError as e:
+        metrics.increment("tmdb.failed")
         logger.error(f"Error de conexión (Red/DNS) con TMDB: {e}")
-        return None
+        return False, None
     except Exception as e:
+        metrics.increment("tmdb.failed")
         logger.error(f"Error inesperado procesando '{title}': {e}", exc_info=True)
-        return None
+        return False, None
+
+
+async def _request_with_retries(path: str, **kwargs) -> httpx.Response:
+    """
+    GET a TMDB respetando el limitador compartido.
+
+    Un 429 pausa el limitador según `Retry-After`; un 5xx o un error de red se
+    reintenta tras un backoff con jitter. Agotados los reintentos se devuelve la
+    última respuesta (o se relanza el último error de red).
+    """
+    attempt = 0
+    while True:
+        await rate_limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = await _shared_client().get(path, **kwargs)
+        except httpx.RequestError:
+            if attempt >= retry_policy.max_retries:
+                raise
+            delay = retry_policy.delay(attempt)
+        else:
+            if response.status_code == 429:
+                metrics.increment("tmdb.throttled")
+                # La espera la hace el limitador, para todas las consultas a la vez
+                rate_limiter.pause(retry_policy.retry_after(response, attempt))
+                delay = 0.0
+            elif response.status_code >= 500:
+                delay = retry_policy.delay(attempt)
+            else:
+                return response
+
+            if attempt >= retry_policy.max_retries:
+                return response
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            metrics.increment("tmdb.requests")
+            metrics.observe("tmdb.latency_ms", elapsed_ms)
+            logger.debug(f"TMDB {path}: {elapsed_ms:.0f} ms")
+
+        metrics.increment("tmdb.retried")
+        attempt += 1
+        await asyncio.sleep(delay)
@@ -0,0 +1,357 @@
+"""
+Spool local de escrituras: la corrida no depende del túnel hasta el final.
+
+En producción la BD (RDS) se alcanza por un túnel SSH de alta latencia. Guardar
+cada lote por separado suponía varias idas y vueltas por lote, y si el túnel se
+caía se perdía la corrida entera. Con el spool:
+1. Los scrapers entregan sus lotes a `spool_movies`, que los escribe en un
+   SQLite local (SCRAPER_SPOOL_PATH, .cache/write_spool.sqlite). Cada lote se
+   confirma en disco, así que sobrevive a una caída del proceso.
+2. Cada corrida (`start_spool_run`) numera sus filas y, al terminar el scraping,
+   anota qué centros terminaron bien (`mark_complete_centers`).
+3. `ship_spool` envía lo acumulado a la BD como un diff por centro, en una sola
+   transacción (por el motor asíncrono, sin bloquear el event loop), y vacía
+   el spool. De
+   los centros completos solo cuenta su última corrida: lo que ya no aparece se
+   retira de la BD. El changelog de cada envío se agrega como una línea JSON a
+   SCRAPER_CHANGELOG_PATH (.cache/changelog.jsonl) para invalidar cachés.
+4. Si el envío falla porque la BD no responde (TRANSIENT_SHIP_ERRORS) se
+   reintenta SCRAPER_SHIP_RETRIES (3) veces con backoff. Si sigue fallando, el
+   spool se conserva y la próxima corrida lo envía junto con lo nuevo (las
+   funciones que ya pasaron se descartan al leerlo).
+
+En CI el checkout borra los archivos ignorados, así que el workflow apunta
+SCRAPER_SPOOL_PATH fuera del repositorio.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.exc import (
+    DisconnectionError,
+    InterfaceError,
+    OperationalError,
+)
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.log_config import get_task_logger
+from agenda_cultural.backend.models import Movie, get_peruvian_time
+from agenda_cultural.backend.services.database_service import (
+    CenterChanges,
+    ship_movies_to_db_async,
+)
+from agenda_cultural.backend.services.scraper_service import (
+    ScraperOutcome,
+    ScraperStatus,
+)
+
+logger = get_task_logger("write_spool", "scraping.log")
+
+COLUMNS = (
+    "center",
+    "title",
+    "date",
+    "location",
+    "poster_url",
+    "poster_path",
+    "source_url",
+    "extracted_at",
+)
+
+
+def ship_retries() -> int:
+    """Reintentos del envío a la BD: SCRAPER_SHIP_RETRIES (3)."""
+    try:
+        return max(0, int(os.getenv("SCRAPER_SHIP_RETRIES", "3")))
+    except ValueError:
+        return 3
+
+
+def changelog_path() -> Path:
+    """Archivo del changelog: SCRAPER_CHANGELOG_PATH (.cache/changelog.jsonl)."""
+    return Path(
+        os.getenv("SCRAPER_CHANGELOG_PATH", ".cache/changelog.jsonl")
+    ).expanduser()
+
+
+def append_changelog(changes: dict[str, CenterChanges]) -> None:
+    """Agrega el changelog de un envío (una línea JSON) para invalidar cachés."""
+    entry = {
+        "shipped_at": get_peruvian_time().isoformat(),
+        "centers": {
+            center: {
+                kind: [[c, title, date.isoformat()] for c, title, date in signatures]
+                for kind, signatures in asdict(center_changes).items()
+                if kind != "center"
+            }
+            for center, center_changes in changes.items()
+        },
+    }
+    path = changelog_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as file:
+        file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class WriteSpool:
+    """Películas pendientes de enviar a la BD, en un archivo SQLite local."""
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(
+            path or os.getenv("SCRAPER_SPOOL_PATH", ".cache/write_spool.sqlite")
+        ).expanduser()
+        self._connection: sqlite3.Connection | None = None
+        # Corrida a la que pertenecen los lotes que llegan (ver `start_run`)
+        self.run = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Conexión al SQLite, abierta (y con la tabla creada) la primera vez."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path)
+            # Cada commit llega al disco antes de seguir (sobrevive a un corte)
+            self._connection.execute("PRAGMA synchronous = FULL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS movies (
+                    center TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    poster_url TEXT,
+                    poster_path TEXT,
+                    source_url TEXT,
+                    extracted_at TEXT NOT NULL,
+                    run INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (center, title, date)
+                )
+                """
+            )
+            columns = {
+                row[1] for row in self._connection.execute("PRAGMA table_info(movies)")
+            }
+            if "run" not in columns:
+                # Spool creado antes de numerar las corridas
+                self._connection.execute(
+                    "ALTER TABLE movies ADD COLUMN run INTEGER NOT NULL DEFAULT 0"
+                )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS centers (
+                    center TEXT PRIMARY KEY,
+                    run INTEGER NOT NULL
+                )
+                """
+            )
+        return self._connection
+
+    def start_run(self) -> int:
+        """Abre una corrida nueva: sus lotes reemplazan a los de corridas previas."""
+        last_run = self.connection.execute(
+            "SELECT MAX(run) FROM (SELECT run FROM movies UNION ALL "
+            "SELECT run FROM centers)"
+        ).fetchone()[0]
+        self.run = (last_run or 0) + 1
+        return self.run
+
+    def mark_complete(self, centers: list[str]) -> None:
+        """Anota los centros que terminaron bien en la corrida actual."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO centers (center, run) VALUES (?, ?)",
+                [(center, self.run) for center in centers],
+            )
+
+    def append(self, movies: list[Movie]) -> int:
+        """
+        Guarda un lote en el spool (una transacción por lote).
+
+        Una función repetida reemplaza a la anterior: gana lo último scrapeado.
+
+        Returns:
+            int: Películas guardadas en el spool.
+        """
+        rows = [
+            (
+                movie.center,
+                movie.title,
+                movie.date.isoformat(),
+                movie.location,
+                movie.poster_url,
+                movie.poster_path,
+                movie.source_url,
+                movie.extracted_at.isoformat(),
+                self.run,
+            )
+            for movie in movies
+        ]
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO movies ({', '.join(COLUMNS)}, run) "
+                f"VALUES ({', '.join('?' for _ in COLUMNS)}, ?)",
+                rows,
+            )
+            return self.connection.total_changes - before
+
+    def complete_centers(self) -> dict[str, int]:
+        """Centros que terminaron bien, con la corrida en que lo hicieron."""
+        return dict(self.connection.execute("SELECT center, run FROM centers"))
+
+    def pending(self) -> tuple[int, dict[str, list[Movie]], set[str]]:
+        """
+        Lo que falta enviar, por centro y sin las funciones que ya pasaron.
+
+        De un centro cuya última corrida terminó bien solo cuenta esa corrida:
+        lo que quedó de corridas anteriores ya no aparece en su cartelera. Si
+        después hubo una corrida parcial, el centro no cuenta como completo.
+
+        Returns:
+            tuple[int, dict[str, list[Movie]], set[str]]: (último rowid leído,
+                películas por centro, centros completos). El rowid se pasa a
+                `clear` para no borrar lo que llegue mientras tanto.
+        """
+        now = get_peruvian_time()
+        rows = self.connection.execute(
+            f"SELECT rowid, run, {', '.join(COLUMNS)} FROM movies ORDER BY rowid"
+        ).fetchall()
+        last_run_by_center: dict[str, int] = {}
+        for _, run, center, *_ in rows:
+            last_run_by_center[center] = max(run, last_run_by_center.get(center, 0))
+        complete = {
+            center: run
+            for center, run in self.complete_centers().items()
+            if run >= last_run_by_center.get(center, 0)
+        }
+
+        movies_by_center: defaultdict[str, list[Movie]] = defaultdict(list)
+        for center in complete:
+            movies_by_center[center] = []
+        for _, run, *values in rows:
+            data = dict(zip(COLUMNS, values))
+            if data["center"] in complete and run != complete[data["center"]]:
+                continue
+            data["date"] = datetime.fromisoformat(data["date"])
+            data["extracted_at"] = datetime.fromisoformat(data["extracted_at"])
+            if data["date"] >= now:
+                movies_by_center[data["center"]].append(Movie(**data))
+
+        last_rowid = rows[-1][0] if rows else 0
+        return last_rowid, dict(movies_by_center), set(complete)
+
+    def clear(self, up_to_rowid: int) -> None:
+        """Quita del spool lo ya enviado (hasta `up_to_rowid` inclusive)."""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM movies WHERE rowid <= ?", (up_to_rowid,)
+            )
+            self.connection.execute("DELETE FROM centers")
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def close(self) -> None:
+        """Cierra la conexión al SQLite."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+# Instancia compartida por el pipeline (los tests la sustituyen)
+write_spool = WriteSpool()
+
+
+def start_spool_run() -> int:
+    """Numera la corrida que empieza en el spool compartido."""
+    return write_spool.start_run()
+
+
+def mark_complete_centers(outcomes: list[ScraperOutcome]) -> list[str]:
+    """
+    Anota en el spool los centros cuyo scraping terminó sin timeout, error ni
+    páginas fallidas: solo en ellos lo que ya no aparece se retira de la BD.
+    """
+    centers = [
+        outcome.center
+        for outcome in outcomes
+        if outcome.status == ScraperStatus.OK and not outcome.failures
+    ]
+    write_spool.mark_complete(centers)
+    return centers
+
+
+# Errores de una BD que no responde (conexión caída, túnel cortado, driver que no
+# contesta): vale reintentar. Los de programación o de datos se propagan sin más.
+TRANSIENT_SHIP_ERRORS = (
+    OperationalError,
+    InterfaceError,
+    DisconnectionError,
+    PoolTimeoutError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+
+def spool_movies(movies: list[Movie]) -> int:
+    """Sink del pipeline: guarda un lote en el spool local."""
+    spooled = write_spool.append(movies)
+    metrics.increment("spool.movies", spooled)
+    return spooled
+
+
+async def ship_spool(
+    spool: WriteSpool | None = None, retries: int | None = None
+) -> int:
+    """
+    Envía el spool a la BD como un diff por centro y lo vacía.
+
+    Args:
+        spool (WriteSpool, optional): Spool a enviar. Por defecto, el compartido.
+        retries (int, optional): Reintentos. Por defecto SCRAPER_SHIP_RETRIES.
+
+    Returns:
+        int: Número de películas nuevas guardadas en la base de datos.
+
+    Raises:
+        Exception: Uno de TRANSIENT_SHIP_ERRORS si la BD sigue sin responder
+            tras los reintentos, o cualquier otro error al primer intento. El
+            spool queda intacto para la próxima corrida.
+    """
+    spool = spool or write_spool
+    retries = ship_retries() if retries is None else retries
+    last_rowid, movies_by_center, complete_centers = spool.pending()
+    spooled = sum(len(movies) for movies in movies_by_center.values())
+
+    attempt = 0
+    while True:
+        try:
+            result = await ship_movies_to_db_async(movies_by_center, complete_centers)
+        except TRANSIENT_SHIP_ERRORS as e:
+            metrics.increment("spool.ship_failed")
+            if attempt >= retries:
+                logger.error(
+                    f"No se pudo enviar el spool a la BD ({e}). Quedan "
+                    f"{spooled} películas en {spool.path} para la próxima corrida."
+                )
+                raise
+            delay = 2**attempt
+            logger.warning(
+                f"Fallo al enviar el spool a la BD ({e}). Reintento en {delay} s."
+            )
+            attempt += 1
+            await asyncio.sleep(delay)
+        else:
+            spool.clear(last_rowid)
+            metrics.increment("spool.shipped", spooled)
+            append_changelog(result.changes)
+            # Las que devolvió el INSERT: una firma que otra corrida guardó
+            # entre la lectura y el INSERT se intentó, pero no es nueva
+            return result.inserted
@@ -1,17 +1,26 @@
 import reflex as rx
 
 from agenda_cultural.backend import Movie
+from agenda_cultural.state import State
+
+# Ancho que ocupa el póster: el de la tarjeta (max_width en render_movie)
+POSTER_SIZES = "16rem"
 
 
 def render_movie_poster(movie: Movie):
     """
     Renderizar el póster si existen.
     Caso contrario, utiliza un placeholder.
+
+    Con `srcset`/`sizes` el navegador elige el tamaño más chico que cubre la
+    tarjeta según la densidad de la pantalla.
     """
     return rx.cond(
         movie.poster_url,
         rx.image(
             src=movie.poster_url,
+            src_set=State.poster_srcsets[movie.poster_url],
+            sizes=POSTER_SIZES,
             loading="lazy",
             width="100%",
             height="auto",
@@ -7,7 +7,7 @@ from agenda_cultural.frontend.components import (
 )
 
 
-@rx.page("/", "Agenda cultural", on_load=State.load_movies)
+@rx.page("/", "Agenda cultural", on_load=[State.load_movies, State.load_poster_sizes])
 def home() -> rx.Component:
     return rx.box(
         navbar(),
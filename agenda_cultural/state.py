@@ -9,6 +9,12 @@ definiendo las variables reactivas y los eventos de carga.
 import reflex as rx
 
 from agenda_cultural.backend import Movie, get_task_logger
+from agenda_cultural.backend.models import get_peruvian_time
+from agenda_cultural.backend.services.poster_mirror import mirror_srcset
+from agenda_cultural.backend.services.tmdb_service import (
+    ImageConfig,
+    load_image_config,
+)
 from agenda_cultural.shared import get_all_center_keys
 
 db_logger = get_task_logger("database_core", "database.log")
@@ -18,14 +24,25 @@ class State(rx.State):
     movies: list[Movie] = []
     is_loading: bool = True
 
+    # Base y tamaños de póster de /configuration de TMDB (ver `load_poster_sizes`)
+    image_base_url: str = ImageConfig().base_url
+    poster_sizes: list[str] = ImageConfig().poster_sizes
+
     @rx.event
     def load_movies(self):
-        """Carga las películas desde la DB al iniciar la app."""
+        """
+        Carga las películas desde la DB al iniciar la app.
+        Solo las de hoy en adelante (desde la medianoche de Lima, como acepta
+        `validate_and_build_date`): con el índice por fecha es un recorrido de
+        rango que ya viene ordenado, sin leer las de días que aún no se limpiaron.
+        """
+        today = get_peruvian_time().replace(hour=0, minute=0, second=0, microsecond=0)
         try:
             with rx.session() as session:
-                self.movies: list[Movie] = list(
-                    session.exec(Movie.select().order_by(Movie.date)).all()
+                statement = (
+                    Movie.select().where(Movie.date >= today).order_by(Movie.date)
                 )
+                self.movies: list[Movie] = list(session.exec(statement).all())
         except Exception as e:
             db_logger.error(f"Error cargando las películas: {e}", exc_info=True)
             self.movies: list[Movie] = []
@@ -33,6 +50,17 @@ class State(rx.State):
         finally:
             self.is_loading = False
 
+    @rx.event
+    def load_poster_sizes(self):
+        """
+        Lee los tamaños de póster de la configuración de TMDB guardada por el
+        backend de la app (TMDB_CONFIG_PATH), sin salir a la red: la refresca
+        su tarea de fondo (`keep_image_config_fresh`), no la visita.
+        """
+        image_config = load_image_config()
+        self.image_base_url = image_config.base_url
+        self.poster_sizes = image_config.poster_sizes
+
     @rx.var
     def movies_by_center(self) -> dict[str, list[Movie]]:
         """
@@ -48,3 +76,25 @@ class State(rx.State):
             if movie.center in result:
                 result[movie.center].append(movie)
         return result
+
+    @rx.var
+    def poster_srcsets(self) -> dict[str, str]:
+        """
+        `srcset` de cada póster, indexado por su `poster_url`.
+        Los del espejo local usan sus variantes WebP; los de TMDB, los tamaños
+        de /configuration. Sin ruta conocida el póster queda solo con `src`.
+        """
+        image_config = ImageConfig(
+            base_url=self.image_base_url, poster_sizes=self.poster_sizes
+        )
+        srcsets: dict[str, str] = {}
+
+        for movie in self.movies:
+            if not movie.poster_url or movie.poster_url in srcsets:
+                continue
+            srcset = mirror_srcset(movie.poster_url)
+            if srcset is None and movie.poster_path:
+                srcset = image_config.srcset(movie.poster_path)
+            if srcset:
+                srcsets[movie.poster_url] = srcset
+        return srcsets
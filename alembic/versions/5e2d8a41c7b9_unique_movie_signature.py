@@ -0,0 +1,39 @@
+"""unique movie signature
+
+Revision ID: 5e2d8a41c7b9
+Revises: b3f1c9d27e4a
+Create Date: 2026-10-17 11:03:52.114870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2d8a41c7b9"
+down_revision: Union[str, Sequence[str], None] = "b3f1c9d27e4a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicados que dejaron corridas solapadas: se conserva la fila más antigua
+    op.execute(
+        """
+        DELETE FROM movie WHERE id NOT IN (
+            SELECT MIN(id) FROM movie GROUP BY center, title, date
+        )
+        """
+    )
+    with op.batch_alter_table("movie", schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_movie_signature", ["center", "title", "date"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("movie", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_movie_signature", type_="unique")
@@ -0,0 +1,55 @@
+"""add poster_path
+
+Revision ID: b3f1c9d27e4a
+Revises: 91567e95cda0
+Create Date: 2026-10-17 10:12:41.508213
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f1c9d27e4a"
+down_revision: Union[str, Sequence[str], None] = "91567e95cda0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TMDB_IMAGE_PREFIX = "https://image.tmdb.org/t/p/"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("movie", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("poster_path", sqlmodel.sql.sqltypes.AutoString(), nullable=True)
+        )
+
+    # Las URLs de TMDB ya guardadas (".../t/p/w342/abc.jpg") conservan su ruta
+    movie = sa.table(
+        "movie",
+        sa.column("id", sa.Integer()),
+        sa.column("poster_url", sa.String()),
+        sa.column("poster_path", sa.String()),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(movie.c.id, movie.c.poster_url).where(
+            movie.c.poster_url.like(f"{TMDB_IMAGE_PREFIX}%")
+        )
+    ).all()
+    for movie_id, poster_url in rows:
+        connection.execute(
+            movie.update()
+            .where(movie.c.id == movie_id)
+            .values(poster_path="/" + poster_url.rsplit("/", 1)[-1])
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("movie", schema=None) as batch_op:
+        batch_op.drop_column("poster_path")
@@ -0,0 +1,29 @@
+"""add movie date indexes
+
+Revision ID: c8a4e6f15d20
+Revises: 5e2d8a41c7b9
+Create Date: 2026-10-17 11:48:09.672315
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8a4e6f15d20"
+down_revision: Union[str, Sequence[str], None] = "5e2d8a41c7b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_movie_date", "movie", ["date"], unique=False)
+    op.create_index("ix_movie_center_date", "movie", ["center", "date"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_movie_center_date", table_name="movie")
+    op.drop_index("ix_movie_date", table_name="movie")
@@ -0,0 +1,121 @@
+"""partition movie by month
+
+Revision ID: e4b7d91a2c6f
+Revises: c8a4e6f15d20
+Create Date: 2026-10-17 12:31:40.208153
+
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b7d91a2c6f"
+down_revision: Union[str, Sequence[str], None] = "c8a4e6f15d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Meses por delante que se crean junto con la tabla
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, title, location, date, center, poster_url, poster_path, source_url, extracted_at"
+
+
+def _next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return datetime(month.year + 1, 1, 1)
+    return datetime(month.year, month.month + 1, 1)
+
+
+def _create_movie_table(partitioned: bool) -> None:
+    # El PK de una tabla particionada debe incluir la columna de partición
+    primary_key = "id, date" if partitioned else "id"
+    suffix = " PARTITION BY RANGE (date)" if partitioned else ""
+    op.execute(
+        f"""
+        CREATE TABLE movie (
+            id INTEGER NOT NULL DEFAULT nextval('movie_id_seq'),
+            title VARCHAR NOT NULL,
+            location VARCHAR NOT NULL,
+            date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            center VARCHAR NOT NULL,
+            poster_url VARCHAR,
+            poster_path VARCHAR,
+            source_url VARCHAR,
+            extracted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT movie_pkey PRIMARY KEY ({primary_key}),
+            CONSTRAINT uq_movie_signature UNIQUE (center, title, date)
+        ){suffix}
+        """
+    )
+
+
+def _swap_out_movie_table(old_name: str) -> None:
+    """Renombra `movie` (y sus restricciones) para crear la nueva en su lugar."""
+    op.drop_index("ix_movie_center_date", table_name="movie")
+    op.drop_index("ix_movie_date", table_name="movie")
+    op.execute(f"ALTER TABLE movie RENAME TO {old_name}")
+    op.execute(
+        f"ALTER TABLE {old_name} RENAME CONSTRAINT movie_pkey TO {old_name}_pkey"
+    )
+    op.execute(
+        f"ALTER TABLE {old_name} RENAME CONSTRAINT uq_movie_signature "
+        f"TO {old_name}_signature"
+    )
+    # Si no, el DROP de la tabla vieja se llevaría la secuencia de los id
+    op.execute("ALTER SEQUENCE movie_id_seq OWNED BY NONE")
+
+
+def _move_rows_and_drop(old_name: str) -> None:
+    op.execute(f"INSERT INTO movie ({COLUMNS}) SELECT {COLUMNS} FROM {old_name}")
+    op.execute(f"DROP TABLE {old_name}")
+    op.execute("ALTER SEQUENCE movie_id_seq OWNED BY movie.id")
+    op.create_index("ix_movie_date", "movie", ["date"], unique=False)
+    op.create_index("ix_movie_center_date", "movie", ["center", "date"], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite no tiene particiones: la limpieza sigue borrando filas
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    _swap_out_movie_table("movie_unpartitioned")
+    _create_movie_table(partitioned=True)
+
+    # Un mes por partición, desde la función más antigua hasta MONTHS_AHEAD
+    # meses después de hoy (o de la más lejana, si es posterior)
+    today = datetime.now()
+    first, last = (
+        op.get_bind()
+        .execute(sa.text("SELECT MIN(date), MAX(date) FROM movie_unpartitioned"))
+        .one()
+    )
+    month = datetime((first or today).year, (first or today).month, 1)
+    until = datetime(today.year, today.month, 1)
+    for _ in range(MONTHS_AHEAD):
+        until = _next_month(until)
+    until = max(until, last or until)
+    while month <= until:
+        op.execute(
+            f"CREATE TABLE movie_y{month.year:04d}m{month.month:02d} PARTITION OF movie "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_next_month(month):%Y-%m-%d}')"
+        )
+        month = _next_month(month)
+
+    _move_rows_and_drop("movie_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Solo vuelven las filas de las particiones enganchadas; las desenganchadas
+    # (historial) quedan como tablas sueltas
+    _swap_out_movie_table("movie_partitioned")
+    _create_movie_table(partitioned=False)
+    _move_rows_and_drop("movie_partitioned")
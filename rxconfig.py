@@ -8,6 +8,27 @@ load_dotenv()
 
 api_url = os.getenv("API_URL", "http://localhost:8000")
 
+# Drivers asíncronos del pipeline de scraping (rx.asession)
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_db_url(url: str | None) -> str | None:
+    """La misma BD que `url`, con driver asíncrono (asyncpg o aiosqlite)."""
+    if not url:
+        return None
+    scheme, _, rest = url.partition("://")
+    if scheme not in ASYNC_DRIVERS:
+        return url
+    # asyncpg no entiende `sslmode`; acepta los mismos valores en `ssl`
+    rest = rest.replace("sslmode=", "ssl=")
+    return f"{ASYNC_DRIVERS[scheme]}://{rest}"
+
+
 config = rx.Config(
     app_name="agenda_cultural",
     # Asignamos la URL dinámica
@@ -18,4 +39,6 @@ config = rx.Config(
     ],
     # Base de Datos
     db_url=os.getenv("DATABASE_URL"),
+    async_db_url=os.getenv("ASYNC_DATABASE_URL")
+    or to_async_db_url(os.getenv("DATABASE_URL")),
 )
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark de motores de scraping (HTTP vs. Playwright) por centro cultural.
+
+Cada combinación centro/motor se ejecuta en un subproceso propio para que la
+memoria de una corrida no contamine la siguiente. Por cada una se mide:
+- Tiempo de pared de `get_movies`.
+- RSS pico: el del proceso de Python y el del mayor proceso hijo (Chromium).
+- Bytes transferidos: recibidos por httpx o declarados por las respuestas
+  cargadas en el navegador.
+
+Los pósters de TMDB se desactivan (TMDB_TOKEN vacío) para medir solo el scraping.
+
+Con `--mode replay` las corridas se sirven desde el archivo HAR (ver
+`har_archive`), sin red, así que los tiempos son repetibles en cualquier máquina.
+`--pipeline` mide además `fetch_all_movies` completo con SCRAPER_ENGINE=auto.
+
+Uso:
+    uv run scripts/benchmark_engines.py                 # Todos los centros
+    uv run scripts/benchmark_engines.py --centers lum --runs 3
+    uv run scripts/benchmark_engines.py --mode replay --pipeline --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Añadir el raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agenda_cultural.backend import metrics  # noqa: E402
+from agenda_cultural.backend.scrapers import ScraperEngine, all_scrapers  # noqa: E402
+from agenda_cultural.backend.services import fetch_all_movies  # noqa: E402
+
+SCRAPERS = {scraper.CENTER_SLUG: scraper for scraper in all_scrapers}
+PIPELINE = "todos"
+
+
+async def run_worker(center: str) -> dict:
+    """Ejecuta un scraper (o el pipeline completo) una vez y mide la corrida."""
+    metrics.reset()
+
+    start = time.perf_counter()
+    if center == PIPELINE:
+        movies = await fetch_all_movies()
+    else:
+        movies = await SCRAPERS[center].get_movies()
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss está en KB en Linux
+    own_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    return {
+        "movies": len(movies),
+        "seconds": round(elapsed, 2),
+        "rss_mb": round(own_rss / 1024, 1),
+        "child_rss_mb": round(child_rss / 1024, 1),
+        "kb": sum(
+            value
+            for name, value in metrics.snapshot().items()
+            if name == "http.bytes_received" or name.endswith(".bytes_loaded")
+        )
+        // 1024,
+        "fallback": any(
+            name.endswith(".fallback") and value
+            for name, value in metrics.snapshot().items()
+        ),
+    }
+
+
+def run_in_subprocess(center: str, engine: str, mode: str) -> dict:
+    """Lanza el worker en un proceso limpio y devuelve su medición."""
+    env = {
+        **os.environ,
+        "SCRAPER_ENGINE": engine,
+        "SCRAPER_MODE": mode,
+        "TMDB_TOKEN": "",
+    }
+    completed = subprocess.run(
+        [sys.executable, __file__, "--worker", center],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[1])
+    parser.add_argument("--centers", nargs="*", default=sorted(SCRAPERS))
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--mode", choices=["live", "record", "replay"], default="live")
+    parser.add_argument("--pipeline", action="store_true")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(run_worker(args.worker))))
+        return
+
+    header = f"{'Centro':<10} {'Motor':<8} {'Películas':>9} {'Segundos':>9} {'RSS MB':>8} {'Hijo MB':>8} {'KB':>8}"
+    print(header)
+    print("-" * len(header))
+
+    combinations = [
+        (center, str(engine))
+        for center in args.centers
+        for engine in (ScraperEngine.HTTP, ScraperEngine.BROWSER)
+        if engine in SCRAPERS[center].SUPPORTED_ENGINES
+    ]
+    if args.pipeline:
+        combinations.append((PIPELINE, "auto"))
+
+    for center, engine in combinations:
+        for _ in range(args.runs):
+            result = run_in_subprocess(center, engine, args.mode)
+            if "error" in result:
+                print(f"{center:<10} {engine:<8} ❌ {result['error']}")
+                continue
+
+            print(
+                f"{center:<10} {engine:<8} {result['movies']:>9} "
+                f"{result['seconds']:>9} {result['rss_mb']:>8} "
+                f"{result['child_rss_mb']:>8} {result['kb']:>8}"
+                + ("  (respaldo)" if result["fallback"] else "")
+            )
+
+
+if __name__ == "__main__":
+    main()
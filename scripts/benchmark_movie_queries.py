@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las consultas por fecha de la tabla `movie`, sin y con índices.
+
+Siembra una BD (SQLite temporal por defecto, o la de `--db-url`) con `--rows`
+funciones de los próximos 90 días más una fracción `--past-fraction` (2%) del
+día anterior, lo que encuentra la limpieza nocturna, y mide:
+- `cleanup_past_movies`: DELETE ... WHERE date < ahora (en una transacción que
+  se deshace, para repetirla).
+- `load_movies` antes: ORDER BY date sobre toda la tabla.
+- `load_movies` ahora: WHERE date >= ahora ORDER BY date (recorrido de rango).
+- `get_known_movies`: WHERE center IN (...) AND date >= ahora.
+
+Primero sin los índices `ix_movie_date` / `ix_movie_center_date` y luego con
+ellos, mostrando el plan de cada consulta (EXPLAIN QUERY PLAN en SQLite).
+
+Uso:
+    uv run scripts/benchmark_movie_queries.py
+    uv run scripts/benchmark_movie_queries.py --rows 200000 --runs 10
+    uv run scripts/benchmark_movie_queries.py --db-url postgresql://...  # BD vacía
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy import Engine, Executable, create_engine, insert, text
+from sqlmodel import SQLModel, col, delete, select
+
+# Añadir el raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agenda_cultural.backend.models import Movie, get_peruvian_time  # noqa: E402
+
+CENTERS = ["lum", "bnp", "ccpucp", "af", "cinematografo", "mali"]
+INDEXES = [index for index in Movie.__table__.indexes]
+
+
+def seed(engine: Engine, rows: int, past_fraction: float) -> None:
+    """Crea la tabla (sin índices de fecha) y la llena con funciones aleatorias."""
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    drop_indexes(engine)
+
+    now = get_peruvian_time()
+    random.seed(42)
+    batch = []
+    with engine.begin() as connection:
+        for i in range(rows):
+            if random.random() < past_fraction:
+                offset = timedelta(minutes=-random.randint(1, 24 * 60))
+            else:
+                offset = timedelta(minutes=random.randint(0, 90 * 24 * 60))
+            batch.append(
+                {
+                    "title": f"Película {i}",
+                    "location": "Sala",
+                    "date": now + offset,
+                    "center": random.choice(CENTERS),
+                    "extracted_at": now,
+                }
+            )
+            if len(batch) == 5000:
+                connection.execute(insert(Movie), batch)
+                batch.clear()
+        if batch:
+            connection.execute(insert(Movie), batch)
+
+
+def drop_indexes(engine: Engine) -> None:
+    for index in INDEXES:
+        index.drop(engine, checkfirst=True)
+
+
+def create_indexes(engine: Engine) -> None:
+    for index in INDEXES:
+        index.create(engine, checkfirst=True)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+
+
+def queries() -> dict[str, Executable]:
+    now = get_peruvian_time()
+    return {
+        "cleanup_past_movies": delete(Movie).where(col(Movie.date) < now),
+        "load_movies (antes)": select(Movie).order_by(col(Movie.date)),
+        "load_movies (rango)": select(Movie)
+        .where(col(Movie.date) >= now)
+        .order_by(col(Movie.date)),
+        "get_known_movies": select(Movie).where(
+            col(Movie.center).in_(["lum", "bnp"]),
+            col(Movie.date) >= now,
+        ),
+    }
+
+
+def plan(engine: Engine, statement) -> str:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN" if engine.dialect.name == "sqlite" else "EXPLAIN"
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"{prefix} {compiled}")).all()
+    return " | ".join(str(row[-1]) for row in rows)
+
+
+def measure(engine: Engine, runs: int) -> dict[str, tuple[float, str]]:
+    results = {}
+    for name, statement in queries().items():
+        timings = []
+        for _ in range(runs):
+            with engine.connect() as connection:
+                transaction = connection.begin()
+                start = time.perf_counter()
+                result = connection.execute(statement)
+                if result.returns_rows:
+                    result.all()
+                timings.append((time.perf_counter() - start) * 1000)
+                transaction.rollback()
+        results[name] = (statistics.median(timings), plan(engine, statement))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de índices por fecha")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--past-fraction", type=float, default=0.02)
+    parser.add_argument("--db-url", help="BD de pruebas (se borra la tabla movie)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.db_url or f"sqlite:///{tmp}/benchmark.db")
+        print(f"🌱 Sembrando {args.rows} funciones en {engine.url.render_as_string()}")
+        seed(engine, args.rows, args.past_fraction)
+
+        before = measure(engine, args.runs)
+        create_indexes(engine)
+        after = measure(engine, args.runs)
+        engine.dispose()
+
+    print(f"\n{'Consulta':<22} {'Sin índices':>12} {'Con índices':>12}")
+    for name, (before_ms, _) in before.items():
+        after_ms, after_plan = after[name]
+        print(f"{name:<22} {before_ms:>9.1f} ms {after_ms:>9.1f} ms")
+        print(f"   antes:   {before[name][1]}")
+        print(f"   después: {after_plan}")
+
+
+if __name__ == "__main__":
+    main()
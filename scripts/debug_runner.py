@@ -3,8 +3,15 @@
 Script de debugging dinámico.
 Carga automáticamente las clases de scrapers basándose en cultural_centers.py
 y la estructura de carpetas estándar.
+
+Uso:
+    python scripts/debug_runner.py                   # Contra el sitio real
+    python scripts/debug_runner.py --mode record     # Además archiva el HAR
+    python scripts/debug_runner.py --mode replay     # Reproduce el último HAR, sin red
+    python scripts/debug_runner.py --mode replay --date 2026-01-05
 """
 
+import argparse
 import asyncio
 import importlib
 import os
@@ -154,7 +161,28 @@ async def run_debug(scraper_key: str):
         raise e
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Debugger de scrapers")
+    parser.add_argument(
+        "--mode",
+        choices=["live", "record", "replay"],
+        default=os.getenv("SCRAPER_MODE", "live"),
+        help="live: sitio real | record: archiva el HAR | replay: reproduce el HAR sin red",
+    )
+    parser.add_argument(
+        "--date", help="Fecha del HAR a grabar o reproducir (AAAA-MM-DD)"
+    )
+    return parser.parse_args()
+
+
 async def main():
+    args = parse_args()
+    os.environ["SCRAPER_MODE"] = args.mode
+    if args.date:
+        os.environ["SCRAPER_HAR_DATE"] = args.date
+    if args.mode != "live":
+        print(f"📼 Modo HAR: {args.mode}")
+
     scraper_to_run = detect_scraper()
 
     if not scraper_to_run:
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Mide cuántos bytes de pósters ahorra el `srcset` en una carga de la portada.
+
+Para cada póster de la BD (o los de `--paths`) se simula la elección del
+navegador: el slot mide lo que la tarjeta (`POSTER_SIZES`, 16rem = 256 px CSS)
+o el viewport si es más angosto, se multiplica por la densidad de la pantalla
+y se toma el candidato más chico del `srcset` que lo cubre (o el más grande).
+Los bytes de cada tamaño se piden a la CDN de TMDB (HEAD, o GET si no informa
+`Content-Length`) y se comparan con el w342 fijo que se usaba antes.
+
+Uso:
+    uv run scripts/measure_poster_transfer.py                    # 390 px, DPR 1/2/3
+    uv run scripts/measure_poster_transfer.py --viewport 360 --dpr 2 --limit 10
+    uv run scripts/measure_poster_transfer.py --paths /abc.jpg /def.jpg
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+
+# Añadir el raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agenda_cultural.backend.config import TMDB_POSTER_SIZE  # noqa: E402
+from agenda_cultural.backend.services.tmdb_service import (  # noqa: E402
+    close_tmdb_client,
+    get_image_config,
+)
+
+CARD_WIDTH_PX = 256  # 16rem, ver POSTER_SIZES en movie_card
+
+
+def chosen_width(widths: list[int], viewport: int, dpr: float) -> int:
+    """El candidato que elegiría el navegador para ese viewport y densidad."""
+    needed = min(CARD_WIDTH_PX, viewport) * dpr
+    return next((width for width in widths if width >= needed), widths[-1])
+
+
+def poster_paths_from_db(limit: int) -> list[str]:
+    import reflex as rx
+    from sqlmodel import col, select
+
+    from agenda_cultural.backend.models import Movie
+
+    with rx.session() as session:
+        statement = (
+            select(Movie.poster_path)
+            .where(col(Movie.poster_path).is_not(None))
+            .distinct()
+            .limit(limit)
+        )
+        return list(session.exec(statement).all())
+
+
+async def image_bytes(client: httpx.AsyncClient, url: str) -> int:
+    response = await client.head(url)
+    if length := response.headers.get("Content-Length"):
+        return int(length)
+    return len((await client.get(url)).content)
+
+
+async def measure(paths: list[str], viewport: int, dprs: list[float]) -> None:
+    config = await get_image_config()
+    await close_tmdb_client()
+    widths = config.srcset_widths()
+    sizes = {f"w{width}" for width in widths} | {TMDB_POSTER_SIZE}
+
+    async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+        weights: dict[tuple[str, str], int] = {}
+        for path in paths:
+            for size in sizes:
+                url = config.poster_url(path, size)
+                weights[(path, size)] = await image_bytes(client, url)
+
+    baseline = sum(weights[(path, TMDB_POSTER_SIZE)] for path in paths)
+    print(f"\n📐 Viewport {viewport} px, {len(paths)} pósters, srcset {widths}")
+    print(f"   Antes ({TMDB_POSTER_SIZE} fijo): {baseline / 1024:8.1f} KiB")
+    for dpr in dprs:
+        size = f"w{chosen_width(widths, viewport, dpr)}"
+        total = sum(weights[(path, size)] for path in paths)
+        saved = 100 * (baseline - total) / baseline if baseline else 0.0
+        print(
+            f"   DPR {dpr:g} -> {size:>5}: {total / 1024:8.1f} KiB "
+            f"({saved:+.0f}% de ahorro)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n")[1])
+    parser.add_argument("--viewport", type=int, default=390, help="Ancho CSS (px)")
+    parser.add_argument("--dpr", type=float, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--limit", type=int, default=30, help="Pósters de la BD")
+    parser.add_argument("--paths", nargs="+", help="Rutas de TMDB (sin usar la BD)")
+    args = parser.parse_args()
+
+    paths = args.paths or poster_paths_from_db(args.limit)
+    if not paths:
+        print("❌ No hay pósters con ruta de TMDB en la BD.")
+        sys.exit(1)
+
+    asyncio.run(measure(paths, args.viewport, args.dpr))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Tests unitarios para el Scraper de la Alianza Francesa.
+
+El listado se serializa en el navegador como registros planos; aquí se
+verifica la parte en Python puro que convierte esos registros en películas, y
+que `get_movies` entrega lo mismo que la extracción caja por caja: las cajas
+sin fecha se descartan (antes se construían sin fecha y `_order_movies` las
+quitaba al final).
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+from freezegun import freeze_time
+
+from agenda_cultural.backend.scrapers.alianza_francesa.scraper import (
+    AlianzaFrancesaScraper,
+)
+
+SOURCE_URL = "https://aflima.org.pe/eventos/ciclo"
+
+
+@pytest.fixture
+def scraper():
+    """Instancia del scraper (el póster se resuelve fuera del constructor)."""
+    return AlianzaFrancesaScraper()
+
+
+@freeze_time("2026-01-05 10:00:00")
+def test_build_movie_from_record_happy_path(scraper):
+    record = {
+        "title": "\n  Los cuatrocientos golpes \n",
+        "info": [
+            "Jueves 15 de enero, 7:00 p.m.",
+            "Sede (Av. Arequipa 4595, Miraflores)",
+        ],
+    }
+
+    movie = scraper._build_movie_from_record(record, SOURCE_URL)
+
+    assert movie is not None
+    assert movie.title == "Los cuatrocientos golpes"
+    assert movie.date == datetime(2026, 1, 15, 19, 0)
+    assert movie.location == "Alianza Francesa de Miraflores - Av. Arequipa 4595"
+    assert movie.center == "alianza_francesa"
+    assert movie.source_url == SOURCE_URL
+
+
+@freeze_time("2026-01-05 10:00:00")
+def test_build_movie_from_record_without_location_uses_default(scraper):
+    record = {"title": "Amélie", "info": ["Viernes 16 de enero, 6:00 p.m.", ""]}
+
+    movie = scraper._build_movie_from_record(record, SOURCE_URL)
+
+    assert movie is not None
+    assert movie.location == AlianzaFrancesaScraper.DEFAULT_LOCATION
+
+
+@freeze_time("2026-01-05 10:00:00")
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"title": None, "info": ["Jueves 15 de enero, 7:00 p.m."]},  # Sin título
+        {"title": "Amélie", "info": []},  # Sin fecha
+        {"title": "Amélie", "info": ["Fecha por confirmar"]},  # Fecha ilegible
+        {"title": "Amélie", "info": ["Jueves 1 de enero, 7:00 p.m."]},  # Ya pasó
+    ],
+)
+def test_build_movie_from_record_discards_incomplete(scraper, record):
+    assert scraper._build_movie_from_record(record, SOURCE_URL) is None
+
+
+@pytest.mark.asyncio
+@freeze_time("2026-01-05 10:00:00")
+async def test_get_movies_drops_undated_records_like_before(scraper, mocker):
+    page = mocker.AsyncMock()
+    page.url = SOURCE_URL
+    page.locator = mocker.Mock(
+        return_value=mocker.Mock(count=mocker.AsyncMock(return_value=1))
+    )
+
+    @asynccontextmanager
+    async def fake_page(browser_pool=None):
+        yield page
+
+    mocker.patch.object(scraper, "setup_browser_and_open_page", fake_page)
+    mocker.patch.object(scraper, "_enter_movie_page")
+    mocker.patch.object(
+        scraper,
+        "_extract_listing_records",
+        return_value=[
+            {
+                "title": "Sin fecha",
+                "info": ["", "Sede (Av. Arequipa 4595, Miraflores)"],
+            },
+            {"title": "Amélie", "info": ["Viernes 16 de enero, 6:00 p.m."]},
+        ],
+    )
+    scraper.reset_partial_results()
+
+    movies = await scraper.get_movies()
+
+    assert [movie.title for movie in movies] == ["Amélie"]
+    assert [movie.title for movie in scraper.partial_results] == ["Amélie"]
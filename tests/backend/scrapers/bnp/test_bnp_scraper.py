@@ -1,6 +1,11 @@
+import asyncio
+from datetime import datetime
+
 import pytest
 
+from agenda_cultural.backend.models import Movie
 from agenda_cultural.backend.scrapers.bnp.scraper import BnpScraper
+from agenda_cultural.backend.scrapers.known_movies import KnownMovies
 
 
 @pytest.fixture
@@ -111,3 +116,94 @@ def test_parse_title_and_year_invalid(scraper):
     assert scraper._parse_title_and_year("") is None
     # Solo espacios
     assert scraper._parse_title_and_year("   ") is None
+
+
+@pytest.mark.asyncio
+async def test_extract_all_movies_keeps_order_and_isolates_failures(mocker):
+    """
+    El modo concurrente debe devolver las películas en el orden del listado,
+    aunque terminen en otro orden, y descartar solo la que falla.
+    """
+    scraper = BnpScraper(detail_concurrency=3)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_extract(movie, page, click_lock):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Las primeras películas tardan más que las últimas
+        await asyncio.sleep(0.01 * (5 - movie))
+        in_flight -= 1
+        if movie == 2:
+            raise RuntimeError("Pestaña caída")
+        return [
+            Movie(
+                title=f"Película {movie}",
+                location="BNP",
+                date=datetime(2026, 1, 1),
+                center="bnp",
+            )
+        ]
+
+    mocker.patch.object(scraper, "_extract_movie_info", side_effect=fake_extract)
+
+    result = await scraper._extract_all_movies(5, page=mocker.Mock())
+
+    assert [m.title for m in result] == [
+        "Película 0",
+        "Película 1",
+        "Película 3",
+        "Película 4",
+    ]
+    assert max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_known_url_returns_every_stored_screening(mocker):
+    """
+    Una página ya guardada se compara con su URL final (después de cargar) y
+    devuelve todas sus funciones guardadas, no solo la primera.
+    """
+    url = "https://eventos.bnp.gob.pe/evento/juliana"
+    stored = [
+        Movie(
+            title="Juliana",
+            location="BNP",
+            date=datetime(2099, 1, day, 19, 0),
+            center="bnp",
+            source_url=url,
+        )
+        for day in (20, 27)
+    ]
+    scraper = BnpScraper()
+    scraper.known_movies = KnownMovies.from_movies(stored)
+
+    movie_page = mocker.AsyncMock()
+    movie_page.url = "about:blank"
+
+    async def load(state):
+        movie_page.url = url
+
+    movie_page.wait_for_load_state.side_effect = load
+    mocker.patch.object(scraper, "_open_movie_page", return_value=movie_page)
+    extract_title = mocker.patch.object(scraper, "_extract_title")
+
+    movies = await scraper._extract_movie_info(0, mocker.Mock(), asyncio.Lock())
+
+    assert [movie.date.day for movie in movies] == [20, 27]
+    extract_title.assert_not_called()
+    movie_page.close.assert_awaited_once()
+
+
+def test_detail_concurrency_from_env(monkeypatch):
+    """La concurrencia se puede configurar por variable de entorno."""
+    monkeypatch.setenv("BNP_DETAIL_CONCURRENCY", "7")
+    assert BnpScraper().detail_concurrency == 7
+    assert BnpScraper(detail_concurrency=1).detail_concurrency == 1
+
+
+def test_invalid_detail_concurrency_falls_back_to_default(monkeypatch):
+    """Un valor no numérico no rompe el import del scraper: se usa 4."""
+    monkeypatch.setenv("BNP_DETAIL_CONCURRENCY", "cuatro")
+    assert BnpScraper().detail_concurrency == 4
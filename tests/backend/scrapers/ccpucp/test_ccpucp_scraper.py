@@ -0,0 +1,156 @@
+"""
+Tests unitarios para el Scraper del Centro Cultural PUCP.
+
+Se valida la lógica "offline": parseo de fechas, limpieza de títulos,
+desduplicación de enlaces cosechados, el pool de páginas concurrentes
+(con un contexto de navegador simulado) y el recorrido por el motor HTTP
+(con la red simulada por respx).
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+import respx
+from freezegun import freeze_time
+
+from agenda_cultural.backend.scrapers.ccpucp.scraper import CcpucpScraper
+from agenda_cultural.backend.scrapers.http_engine import HttpFetcher
+from agenda_cultural.backend.scrapers.listing_cache import ListingCache
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    """Retorna una instancia limpia de CcpucpScraper (con caché de listados temporal)."""
+    ccpucp = CcpucpScraper(detail_concurrency=2)
+    ccpucp.listing_cache = ListingCache(tmp_path / "listing_cache.json")
+    return ccpucp
+
+
+@freeze_time("2026-01-05 10:00:00")
+@pytest.mark.parametrize(
+    "raw_date, expected",
+    [
+        ("lunes 12 de enero | 7:00 p.m.", datetime(2026, 1, 12, 19, 0)),
+        ("sábado 31 de enero | 4:30 pm", datetime(2026, 1, 31, 16, 30)),
+        ("lunes 12 de enero 7:00 p.m.", None),  # Sin separador de hora
+        ("12 | 7:00 pm", None),  # Fecha incompleta
+    ],
+)
+def test_parse_date_string(scraper, raw_date, expected):
+    assert scraper._parse_date_string(raw_date) == expected
+
+
+@pytest.mark.parametrize(
+    "raw_title, expected",
+    [
+        ("EL LIMPIADOR", "El limpiador"),
+        ("  LA   TETA ASUSTADA ", "La teta asustada"),
+    ],
+)
+def test_clean_title(raw_title, expected):
+    assert CcpucpScraper._clean_title(raw_title) == expected
+
+
+def test_detail_concurrency_from_env(monkeypatch):
+    monkeypatch.setenv("CCPUCP_DETAIL_CONCURRENCY", "6")
+    assert CcpucpScraper().detail_concurrency == 6
+
+    # Un valor no numérico no rompe el import del scraper: se usa 4
+    monkeypatch.setenv("CCPUCP_DETAIL_CONCURRENCY", "seis")
+    assert CcpucpScraper().detail_concurrency == 4
+
+
+def test_dedupe_links_keeps_first_occurrence():
+    """Una película listada en dos categorías solo se visita una vez."""
+    links = [
+        {"href": "https://x.pe/a", "text": "A"},
+        {"href": "https://x.pe/b", "text": "B"},
+        {"href": "https://x.pe/a", "text": "A (repetida)"},
+        {"href": "", "text": "Sin enlace"},
+    ]
+    assert CcpucpScraper._dedupe_links(links) == links[:2]
+
+
+@pytest.mark.asyncio
+async def test_visit_concurrently_reuses_pages_and_keeps_order(scraper):
+    """
+    Con 5 URLs y concurrencia 2 solo se abren 2 páginas, los resultados
+    respetan el orden de entrada y un fallo queda aislado como None.
+    """
+    context = MagicMock()
+    context.new_page = AsyncMock(
+        side_effect=lambda: MagicMock(goto=AsyncMock(), close=AsyncMock())
+    )
+    urls = [f"https://x.pe/{i}" for i in range(5)]
+
+    async def visit(page, index):
+        await asyncio.sleep(0.01 * (5 - index))
+        if index == 3:
+            raise RuntimeError("Detalle roto")
+        return index * 10
+
+    result = await scraper._visit_concurrently(context, urls, visit)
+
+    assert result == [0, 10, 20, None, 40]
+    assert context.new_page.await_count == 2
+
+
+@freeze_time("2026-01-05 10:00:00")
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_movies_via_http_walks_categories(scraper):
+    """
+    Listado -> categoría -> detalle por HTTP: se descartan las funciones con
+    entradas y las películas repetidas entre categorías se visitan una vez.
+    """
+    base = "https://centrocultural.pucp.edu.pe"
+    respx.get(scraper.START_URL).mock(
+        return_value=httpx.Response(
+            200,
+            html='<a class="subCategoryImage" href="/cine/ciclo-1.html">Ciclo</a>'
+            '<a class="subCategoryImage" href="/cine/ciclo-2.html">Ciclo 2</a>',
+        )
+    )
+    category = (
+        '<h3 class="catItemTitle"><a href="/cine/limpiador.html"> EL LIMPIADOR </a></h3>'
+        '<h3 class="catItemTitle"><a href="/cine/pagada.html">PAGADA</a></h3>'
+    )
+    respx.get(f"{base}/cine/ciclo-1.html").mock(
+        return_value=httpx.Response(200, html=category)
+    )
+    respx.get(f"{base}/cine/ciclo-2.html").mock(
+        return_value=httpx.Response(200, html=category)
+    )
+    free = respx.get(f"{base}/cine/limpiador.html").mock(
+        return_value=httpx.Response(
+            200,
+            html="<p><span><strong>FUNCIONES</strong></span><br>"
+            "<span>lunes 12 de enero | 7:00 p.m.</span></p>",
+        )
+    )
+    respx.get(f"{base}/cine/pagada.html").mock(
+        return_value=httpx.Response(
+            200,
+            html="<p><span><b>ENTRADAS</b> S/ 10</span></p>"
+            "<p><span><strong>FUNCIONES</strong></span>"
+            "<span>martes 13 de enero | 7:00 p.m.</span></p>",
+        )
+    )
+
+    async with HttpFetcher() as fetcher:
+        movies = await scraper.get_movies_via_http(fetcher)
+
+    assert [movie.title for movie in movies] == ["El limpiador"]
+    assert movies[0].date == datetime(2026, 1, 12, 19, 0)
+    assert movies[0].source_url == f"{base}/cine/limpiador.html"
+    assert free.call_count == 1
+
+    # Segunda corrida con el mismo listado: no se visita ningún detalle
+    async with HttpFetcher() as fetcher:
+        again = await scraper.get_movies_via_http(fetcher)
+
+    assert [movie.title for movie in again] == ["El limpiador"]
+    assert free.call_count == 1
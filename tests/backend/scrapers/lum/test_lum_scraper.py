@@ -9,16 +9,24 @@ de texto, sin necesidad de conectar con un navegador real.
 
 from datetime import datetime
 
+import httpx
 import pytest
+import respx
 from freezegun import freeze_time
 
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.scrapers.http_engine import HttpFetcher, NeedsBrowserError
+from agenda_cultural.backend.scrapers.known_movies import KnownMovies
+from agenda_cultural.backend.scrapers.listing_cache import ListingCache
 from agenda_cultural.backend.scrapers.lum.scraper import LumScraper
 
 
 @pytest.fixture
-def scraper():
-    """Retorna una instancia fresca de LumScraper para cada test."""
-    return LumScraper()
+def scraper(tmp_path):
+    """Retorna una instancia fresca de LumScraper (con caché de listados temporal)."""
+    lum = LumScraper()
+    lum.listing_cache = ListingCache(tmp_path / "listing_cache.json")
+    return lum
 
 
 # ==============================================================================
@@ -212,23 +220,18 @@ def test_is_relevant_monthly_agenda_no_month_in_title(scraper):
 
 # ==============================================================================
 #  BLOQUE 4: ENSAMBLAJE DE PELÍCULA (INTEGRACIÓN)
-#  Pruebas de la función _build_movie_from_lines, mockeando APIs externas.
+#  Pruebas de la función _build_movie_from_lines (el póster se resuelve después).
 # ==============================================================================
 
 
 @freeze_time("2025-10-10 10:00:00")
-def test_build_movie_from_lines_happy_path(scraper, mocker):
+def test_build_movie_from_lines_happy_path(scraper):
     """
     Happy Path:
     - Se extraen datos válidos (Título, Fecha, Hora).
     - Se infiere el año correcto (2026 siendo Oct 2025).
-    - La API de pósters responde con una URL válida.
+    - El póster queda pendiente: lo resuelve la etapa de pósters del pipeline.
     """
-    mocker_get_movie_poster = mocker.patch(
-        "agenda_cultural.backend.scrapers.lum.scraper.get_movie_poster"
-    )
-    mocker_get_movie_poster.return_value = "poster_url"
-
     lines = ["Cine: Alien", "bla bla", "20 de enero", "8:00 pm"]
     title_index = 0
     date_index = 2
@@ -240,7 +243,7 @@ def test_build_movie_from_lines_happy_path(scraper, mocker):
     assert result.location == "Lugar de la Memoria - Bajada San Martín 151 (Miraflores)"
     assert result.center == "lum"
     assert result.date == datetime(2026, 1, 20, 20, 0)
-    assert result.poster_url == "poster_url"
+    assert result.poster_url is None
     assert result.source_url == "source_url_random"
 
 
@@ -263,27 +266,125 @@ def test_build_movie_returns_none_on_invalid_date(scraper):
 
 
 @freeze_time("2025-10-10 10:00:00")
-def test_build_movie_handles_missing_poster_gracefully(scraper, mocker):
+def test_build_movie_reuses_known_poster(scraper):
     """
-    Resiliencia:
-    - Todo es válido, pero la API externa de pósters falla (retorna None).
-    - La película DEBE crearse igualmente, con poster_url=None.
+    Scraping incremental:
+    - La función ya está en la BD con su póster.
+    - Se reutiliza ese póster en lugar de dejarlo pendiente.
     """
-    mocker_get_movie_poster = mocker.patch(
-        "agenda_cultural.backend.scrapers.lum.scraper.get_movie_poster"
+    scraper.known_movies = KnownMovies.from_movies(
+        [
+            Movie(
+                title="Alien",
+                location="LUM",
+                date=datetime(2026, 1, 20, 20, 0),
+                center="lum",
+                poster_url="https://img/alien.jpg",
+            )
+        ]
     )
-    mocker_get_movie_poster.return_value = None  # Simula fallo de API
-
     lines = ["Cine: Alien", "bla bla", "20 de enero", "8:00 pm"]
-    title_index = 0
-    date_index = 2
-    source_url = "source_url_random"
 
-    result = scraper._build_movie_from_lines(lines, title_index, date_index, source_url)
+    result = scraper._build_movie_from_lines(lines, 0, 2, "source_url_random")
 
-    assert result.title == "Alien"
-    assert result.location == "Lugar de la Memoria - Bajada San Martín 151 (Miraflores)"
-    assert result.center == "lum"
-    assert result.date == datetime(2026, 1, 20, 20, 0)
-    assert result.poster_url is None
-    assert result.source_url == "source_url_random"
+    assert result.poster_url == "https://img/alien.jpg"
+
+
+# ==============================================================================
+#  BLOQUE 5: INSTANTÁNEA DE PÁRRAFOS (SIN NAVEGADOR)
+#  La agenda se lee en una sola llamada; el análisis corre sobre la instantánea.
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    "paragraph, expected",
+    [
+        # Párrafo sin <strong> -> se descarta sin mirar el texto
+        ({"text": "Cine: Alien\n20 de enero", "has_strong": False}, None),
+        # Párrafo con <strong> -> líneas limpias y sin vacíos
+        (
+            {"text": " Cine: Alien \n\n 20 de enero\n", "has_strong": True},
+            ["Cine: Alien", "20 de enero"],
+        ),
+        # Párrafo con <strong> pero vacío
+        ({"text": "  \n ", "has_strong": True}, None),
+    ],
+)
+def test_extract_clean_lines(scraper, paragraph, expected):
+    assert scraper._extract_clean_lines(paragraph) == expected
+
+
+@freeze_time("2025-10-10 10:00:00")
+def test_extract_movies_from_paragraphs(scraper):
+    """
+    Una instantánea con ruido, una película válida y una sin hora:
+    solo la película completa debe convertirse en Movie.
+    """
+    paragraphs = [
+        {"text": "Exposición permanente\nSala 1", "has_strong": True},
+        {
+            "text": "Cine en el LUM:\n“Juliana”\n(1988) 92 min.\n20 de enero\n6:00 p.m.",
+            "has_strong": True,
+        },
+        {"text": "Cine: Alien (1979)\n21 de enero", "has_strong": True},
+        {"text": "Cine: Texto sin negrita\n22 de enero\n7:00 pm", "has_strong": False},
+    ]
+
+    result = scraper._extract_movies_from_paragraphs(paragraphs, "https://lum/agenda")
+
+    assert len(result) == 1
+    assert result[0].title == "Juliana"
+    assert result[0].date == datetime(2026, 1, 20, 18, 0)
+    assert result[0].source_url == "https://lum/agenda"
+
+
+# ==============================================================================
+#  BLOQUE 6: MOTOR HTTP
+#  El mismo recorrido sin navegador: se sigue el enlace de la agenda mensual.
+# ==============================================================================
+
+
+@freeze_time("2025-10-10 10:00:00")
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_movies_via_http_follows_monthly_agenda(scraper):
+    respx.get(scraper.START_URL).mock(
+        return_value=httpx.Response(
+            200,
+            html="""
+            <div class="views-field-title"><a href="/agenda-semanal">Agenda semanal</a></div>
+            <div class="views-field-title"><a href="/agenda-octubre">Agenda Octubre 2025</a></div>
+            """,
+        )
+    )
+    respx.get("https://lum.cultura.pe/agenda-octubre").mock(
+        return_value=httpx.Response(
+            200,
+            html="""
+            <div class="field-item">
+              <p><strong>Cine en el LUM:</strong><br>“Juliana”<br>(1988) 92 min.<br>
+                 20 de octubre<br>6:00 p.m.</p>
+            </div>
+            """,
+        )
+    )
+
+    async with HttpFetcher() as fetcher:
+        movies = await scraper.get_movies_via_http(fetcher)
+
+    assert [movie.title for movie in movies] == ["Juliana"]
+    assert movies[0].date == datetime(2025, 10, 20, 18, 0)
+    assert movies[0].source_url == "https://lum.cultura.pe/agenda-octubre"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_movies_via_http_needs_browser_without_blocks(scraper):
+    """Un reto anti-bot devuelve HTML sin bloques: hay que usar Playwright."""
+    respx.get(scraper.START_URL).mock(
+        return_value=httpx.Response(200, html="<div>Checking your browser</div>")
+    )
+
+    async with HttpFetcher() as fetcher:
+        with pytest.raises(NeedsBrowserError):
+            await scraper.get_movies_via_http(fetcher)
@@ -24,7 +24,7 @@ class DummyScraper(ScraperInterface):
     los métodos de la clase abstracta ScraperInterface.
     """
 
-    async def get_movies(self) -> list[Movie]:
+    async def get_movies(self, browser_pool=None, http_fetcher=None) -> list[Movie]:
         return []
 
 
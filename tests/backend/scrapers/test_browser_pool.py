@@ -0,0 +1,102 @@
+"""
+Tests unitarios para el pool de navegadores compartido (`BrowserPool`).
+
+Se reemplaza el driver de Playwright por mocks para verificar, sin lanzar
+Chromium real, que:
+1. Varios contextos se sirven desde un único navegador.
+2. Los navegadores se reciclan tras servir el máximo de contextos.
+3. Un navegador desconectado se reemplaza por uno nuevo.
+"""
+
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agenda_cultural.backend.scrapers.browser_pool import BrowserPool
+
+# === HELPERS ===
+
+
+def make_fake_browser(connected: bool = True) -> MagicMock:
+    """Crea un navegador falso cuyo `new_context` devuelve contextos cerrables."""
+    browser = MagicMock()
+    browser.is_connected.return_value = connected
+    browser.close = AsyncMock()
+    browser.new_context = AsyncMock(
+        side_effect=lambda **_: MagicMock(close=AsyncMock())
+    )
+    return browser
+
+
+def make_pool(**kwargs) -> tuple[BrowserPool, AsyncMock]:
+    """Crea un pool con un Playwright falso ya 'iniciado'."""
+    pool = BrowserPool(**kwargs)
+    launch = AsyncMock(side_effect=lambda **_: make_fake_browser())
+    pool._playwright = MagicMock(chromium=MagicMock(launch=launch), stop=AsyncMock())
+    return pool, launch
+
+
+# === TESTS ===
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_single_browser_for_many_contexts():
+    """Tres scrapers seguidos deben compartir un único lanzamiento de Chromium."""
+    pool, launch = make_pool(size=1)
+
+    for _ in range(3):
+        async with pool.new_context(locale="es-PE") as context:
+            assert context is not None
+
+    assert launch.await_count == 1
+    assert pool.launches == 1
+    assert pool.contexts == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_browser_after_max_contexts():
+    """Tras servir `max_contexts_per_browser` contextos, el navegador se cierra y relanza."""
+    pool, launch = make_pool(size=1, max_contexts_per_browser=2)
+
+    for _ in range(3):
+        async with pool.new_context():
+            pass
+
+    assert pool.launches == 2
+    assert pool.contexts == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_disconnected_browser():
+    """Si Chromium se cae, el siguiente contexto se pide a un navegador nuevo."""
+    pool, launch = make_pool(size=1)
+
+    async with pool.new_context():
+        pass
+
+    first_browser = cast(MagicMock, pool._slots[0].browser)
+    first_browser.is_connected.return_value = False
+
+    async with pool.new_context():
+        pass
+
+    assert pool.launches == 2
+    first_browser.close.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_pool_close_releases_everything():
+    """Al cerrar el pool se cierran los navegadores y se detiene Playwright."""
+    pool, _ = make_pool(size=1)
+    playwright = cast(MagicMock, pool._playwright)
+
+    async with pool.new_context():
+        pass
+    browser = cast(MagicMock, pool._slots[0].browser)
+
+    await pool.close()
+
+    browser.close.assert_awaited_once()
+    playwright.stop.assert_awaited_once()
+    assert pool._slots == []
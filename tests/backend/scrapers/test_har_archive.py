@@ -0,0 +1,102 @@
+"""
+Tests unitarios para el archivo HAR de corridas reproducibles (`har_archive`).
+
+Se verifica, con la red simulada por respx y un directorio temporal, que:
+1. En record el tráfico del motor HTTP se archiva por centro y fecha.
+2. En replay se sirve desde el HAR y las URLs no archivadas no salen a la red.
+3. La fecha archivada hace de "hoy" al validar las funciones.
+"""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import respx
+
+from agenda_cultural.backend.scrapers import har_archive
+from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
+from agenda_cultural.backend.scrapers.http_engine import HttpFetcher
+
+# === HELPERS ===
+
+
+class DummyScraper(ScraperInterface):
+    CENTER_SLUG = "dummy"
+
+    async def get_movies(self, browser_pool=None, http_fetcher=None):
+        return []
+
+
+@pytest.fixture
+def har_env(monkeypatch, tmp_path):
+    """Apunta el archivo HAR a un directorio temporal."""
+    monkeypatch.setenv("SCRAPER_HAR_DIR", str(tmp_path))
+    monkeypatch.delenv("SCRAPER_HAR_DATE", raising=False)
+    return tmp_path
+
+
+# === TESTS ===
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_roundtrip(har_env, monkeypatch):
+    monkeypatch.setenv("SCRAPER_MODE", "record")
+    monkeypatch.setenv("SCRAPER_HAR_DATE", "2026-01-05")
+
+    with respx.mock:
+        respx.get("https://cine.pe/agenda").mock(
+            return_value=httpx.Response(200, html="<h1>Retablo</h1>")
+        )
+        transport = har_archive.http_transport("dummy")
+        async with HttpFetcher(transport=transport) as fetcher:
+            await fetcher.get_html("https://cine.pe/agenda")
+
+    assert (har_env / "dummy" / "2026-01-05.http.har").exists()
+
+    # Replay: sin respx activo, cualquier salida real fallaría
+    monkeypatch.setenv("SCRAPER_MODE", "replay")
+    monkeypatch.delenv("SCRAPER_HAR_DATE")
+
+    transport = har_archive.http_transport("dummy")
+    async with HttpFetcher(transport=transport) as fetcher:
+        soup = await fetcher.get_html("https://cine.pe/agenda")
+        assert soup.get_text() == "Retablo"
+
+        with pytest.raises(httpx.ConnectError):
+            await fetcher.get_html("https://cine.pe/otra")
+
+
+def test_replay_uses_latest_archived_date(har_env, monkeypatch):
+    monkeypatch.setenv("SCRAPER_MODE", "replay")
+    center_dir = har_env / "dummy"
+    center_dir.mkdir()
+    for name in ("2025-12-01.har", "2026-01-05.http.har", "notas.txt"):
+        (center_dir / name).write_text("{}")
+
+    assert har_archive.archive_date("dummy") == date(2026, 1, 5)
+    assert har_archive.archive_date("sin_archivo") is None
+    assert DummyScraper().reference_now() == datetime(2026, 1, 5)
+
+
+def test_replay_without_http_har_uses_browser(har_env, monkeypatch):
+    monkeypatch.setenv("SCRAPER_MODE", "replay")
+    assert har_archive.http_transport("dummy") is None
+
+
+def test_live_mode_has_no_transport(har_env, monkeypatch):
+    monkeypatch.delenv("SCRAPER_MODE", raising=False)
+    assert har_archive.http_transport("dummy") is None
+
+
+@pytest.mark.asyncio
+async def test_browser_replay_requires_archive(har_env, monkeypatch):
+    """Sin HAR del navegador, el replay falla antes de pedir un contexto."""
+    monkeypatch.setenv("SCRAPER_MODE", "replay")
+    pool = MagicMock()
+
+    with pytest.raises(FileNotFoundError):
+        async with DummyScraper().setup_browser_and_open_page(pool):
+            pass
+
+    pool.new_context.assert_not_called()
@@ -0,0 +1,157 @@
+"""
+Tests unitarios para el motor HTTP de los scrapers (`http_engine`).
+
+Se simula la red con `respx` para verificar, sin salir a internet, que:
+1. `HttpFetcher` devuelve el HTML parseado y contabiliza peticiones y bytes.
+2. `inner_text` reproduce los saltos de línea de los <br>.
+3. `try_http_engine` respeta SCRAPER_ENGINE y cae a Playwright cuando falla.
+4. Los certificados TLS se validan salvo en los centros con `VERIFY_TLS = False`.
+"""
+
+import httpx
+import pytest
+import respx
+from bs4 import BeautifulSoup
+
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
+from agenda_cultural.backend.scrapers.http_engine import (
+    HttpFetcher,
+    NeedsBrowserError,
+    ScraperEngine,
+    inner_text,
+)
+
+# === HELPERS ===
+
+
+class HttpDummyScraper(ScraperInterface):
+    """Scraper mínimo que declara el motor HTTP y lee un único título."""
+
+    CENTER_SLUG = "dummy"
+    SUPPORTED_ENGINES = frozenset({ScraperEngine.HTTP, ScraperEngine.BROWSER})
+
+    async def get_movies(self, browser_pool=None, http_fetcher=None) -> list[Movie]:
+        return []
+
+    async def get_movies_via_http(self, http_fetcher: HttpFetcher) -> list[Movie]:
+        soup = await http_fetcher.get_html("https://cine.pe/")
+        if not (titles := soup.select("h1")):
+            raise NeedsBrowserError("Sin títulos")
+        return [Movie(title=titles[0].get_text(), location="x", center="dummy")]
+
+
+# === TESTS ===
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetcher_parses_html_and_counts_bytes():
+    body = "<html><body><h1>Hola</h1></body></html>"
+    respx.get("https://cine.pe/").mock(return_value=httpx.Response(200, html=body))
+
+    async with HttpFetcher() as fetcher:
+        soup = await fetcher.get_html("https://cine.pe/")
+
+    assert soup.get_text() == "Hola"
+    assert fetcher.requests == 1
+    assert fetcher.bytes_received == len(body)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetcher_raises_on_http_error():
+    respx.get("https://cine.pe/").mock(return_value=httpx.Response(403))
+
+    async with HttpFetcher() as fetcher:
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetcher.get_html("https://cine.pe/")
+
+
+def test_max_connections_from_env(monkeypatch):
+    monkeypatch.setenv("SCRAPER_HTTP_MAX_CONNECTIONS", "3")
+    assert HttpFetcher().max_connections == 3
+
+    # Un valor no numérico no rompe el import: se usa 10
+    monkeypatch.setenv("SCRAPER_HTTP_MAX_CONNECTIONS", "muchas")
+    assert HttpFetcher().max_connections == 10
+
+
+def test_inner_text_turns_br_into_newlines():
+    soup = BeautifulSoup(
+        "<p><strong>Cine:</strong> “Retablo”<br>\n  Jueves 15 de enero<br>7:00 p.m.</p>",
+        "html.parser",
+    )
+    paragraph = soup.p
+    assert paragraph is not None
+    lines = [line.strip() for line in inner_text(paragraph).split("\n")]
+    assert lines == ["Cine: “Retablo”", "Jueves 15 de enero", "7:00 p.m."]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_try_http_engine_returns_movies(monkeypatch):
+    monkeypatch.delenv("SCRAPER_ENGINE", raising=False)
+    respx.get("https://cine.pe/").mock(
+        return_value=httpx.Response(200, html="<h1>Retablo</h1>")
+    )
+
+    movies = await HttpDummyScraper().try_http_engine()
+
+    assert movies is not None
+    assert [movie.title for movie in movies] == ["Retablo"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_try_http_engine_falls_back_when_page_needs_js(monkeypatch):
+    """En modo auto, un NeedsBrowserError devuelve None (usar Playwright)."""
+    monkeypatch.delenv("SCRAPER_ENGINE", raising=False)
+    respx.get("https://cine.pe/").mock(
+        return_value=httpx.Response(200, html="<div id='app'></div>")
+    )
+
+    assert await HttpDummyScraper().try_http_engine() is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_try_http_engine_forced_http_propagates_errors(monkeypatch):
+    monkeypatch.setenv("SCRAPER_ENGINE", "http")
+    respx.get("https://cine.pe/").mock(return_value=httpx.Response(503))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await HttpDummyScraper().try_http_engine()
+
+
+@pytest.mark.asyncio
+async def test_try_http_engine_skipped_in_browser_mode(monkeypatch):
+    monkeypatch.setenv("SCRAPER_ENGINE", "browser")
+    assert await HttpDummyScraper().try_http_engine() is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_tls_opt_out_uses_its_own_unverified_client(monkeypatch, mocker):
+    """
+    Los certificados se validan por defecto; un centro con VERIFY_TLS = False
+    usa su propio cliente sin validar, no el compartido.
+    """
+    monkeypatch.delenv("SCRAPER_ENGINE", raising=False)
+    respx.get("https://cine.pe/").mock(
+        return_value=httpx.Response(200, html="<h1>Retablo</h1>")
+    )
+    client = mocker.patch(
+        "agenda_cultural.backend.scrapers.http_engine.httpx.AsyncClient",
+        wraps=httpx.AsyncClient,
+    )
+
+    class InsecureDummyScraper(HttpDummyScraper):
+        VERIFY_TLS = False
+
+    async with HttpFetcher() as shared:
+        movies = await InsecureDummyScraper().try_http_engine(shared)
+
+    assert [movie.title for movie in movies or []] == ["Retablo"]
+    assert shared.requests == 0
+    assert [call.kwargs["verify"] for call in client.call_args_list] == [True, False]
@@ -0,0 +1,109 @@
+"""
+Tests unitarios para el scraping incremental (`known_movies`).
+
+Se valida que:
+1. Las funciones de la BD se indexan por URL de origen y por firma.
+2. En una corrida completa nada se considera conocido.
+3. El scraper separa las páginas de detalle conocidas de las nuevas y lo cuenta.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
+from agenda_cultural.backend.scrapers.known_movies import (
+    KnownMovies,
+    full_refresh_due,
+)
+
+# === HELPERS ===
+
+
+class DummyScraper(ScraperInterface):
+    CENTER_SLUG = "dummy"
+
+    async def get_movies(self, browser_pool=None, http_fetcher=None):
+        return []
+
+
+def stored_movie(title: str, url: str | None) -> Movie:
+    return Movie(
+        id=7,
+        title=title,
+        location="Sala",
+        date=datetime(2026, 1, 20, 19, 0),
+        center="dummy",
+        poster_url=f"https://img/{title}.jpg",
+        source_url=url,
+    )
+
+
+# === TESTS ===
+
+
+def test_from_movies_indexes_copies_by_url_and_signature():
+    known = KnownMovies.from_movies(
+        [stored_movie("Juliana", "https://x.pe/1"), stored_movie("Retablo", None)]
+    )
+
+    by_url_movies = known.movies_for_url("https://x.pe/1")
+    assert by_url_movies is not None
+    [by_url] = by_url_movies
+    assert by_url.title == "Juliana"
+    assert by_url.id is None  # Copia, no la fila de la BD
+    assert known.movies_for_url("https://x.pe/2") is None
+
+    signature = known.movie_for_signature(
+        "dummy", "Retablo", datetime(2026, 1, 20, 19, 0)
+    )
+    assert signature is not None
+    assert signature.poster_url == "https://img/Retablo.jpg"
+
+
+def test_full_refresh_ignores_everything():
+    known = KnownMovies.from_movies([stored_movie("Juliana", "https://x.pe/1")])
+    known.full_refresh = True
+
+    assert known.movies_for_url("https://x.pe/1") is None
+    assert (
+        known.movie_for_signature("dummy", "Juliana", datetime(2026, 1, 20, 19, 0))
+        is None
+    )
+
+
+@pytest.mark.parametrize(
+    "env, now, expected",
+    [
+        ({}, datetime(2026, 1, 18), True),  # Domingo (por defecto)
+        ({}, datetime(2026, 1, 19), False),  # Lunes
+        ({"SCRAPER_FULL_REFRESH": "true"}, datetime(2026, 1, 19), True),
+        ({"SCRAPER_FULL_REFRESH_WEEKDAY": "0"}, datetime(2026, 1, 19), True),
+        ({"SCRAPER_FULL_REFRESH_WEEKDAY": "nunca"}, datetime(2026, 1, 18), False),
+    ],
+)
+def test_full_refresh_due(monkeypatch, env, now, expected):
+    monkeypatch.delenv("SCRAPER_FULL_REFRESH", raising=False)
+    monkeypatch.delenv("SCRAPER_FULL_REFRESH_WEEKDAY", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    assert full_refresh_due(now) is expected
+
+
+def test_partition_known_urls_skips_stored_details():
+    """De 30 detalles con 28 ya guardados, solo se visitan los 2 nuevos."""
+    metrics.reset()
+    urls = [f"https://x.pe/{i}" for i in range(30)]
+    scraper = DummyScraper()
+    scraper.known_movies = KnownMovies.from_movies(
+        [stored_movie(f"Peli {i}", url) for i, url in enumerate(urls[:28])]
+    )
+
+    known, pending = scraper.partition_known_urls(urls)
+
+    assert len(known) == 28
+    assert pending == urls[28:]
+    assert metrics.get("known.dummy.skipped_details") == 28
@@ -0,0 +1,185 @@
+"""
+Tests unitarios para la caché de listados (`listing_cache`).
+
+Se valida que:
+1. Las películas y el hash de un listado sobreviven entre instancias (disco).
+2. Al reutilizar se descartan las funciones que ya pasaron.
+3. El GET condicional usa ETag / Last-Modified y un 304 se trata como "sin cambios".
+   Los validadores se guardan solo junto con las películas de su respuesta.
+4. El scraper registra en métricas los aciertos y fallos de la caché.
+5. Una corrida con fallos no guarda su listado y una entrada vencida no se reutiliza.
+"""
+
+from datetime import datetime
+
+import httpx
+import pytest
+import respx
+from freezegun import freeze_time
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
+from agenda_cultural.backend.scrapers.http_engine import HttpFetcher
+from agenda_cultural.backend.scrapers.listing_cache import ListingCache, content_hash
+
+URL = "https://cine.pe/agenda"
+
+# === HELPERS ===
+
+
+class DummyScraper(ScraperInterface):
+    CENTER_SLUG = "dummy"
+
+    async def get_movies(self, browser_pool=None, http_fetcher=None):
+        return []
+
+
+def make_movie(title: str, date: datetime) -> Movie:
+    return Movie(title=title, location="Sala", date=date, center="dummy")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ListingCache(tmp_path / "listing_cache.json")
+
+
+# === TESTS ===
+
+
+def test_content_hash_is_stable_and_order_sensitive():
+    assert content_hash([{"a": 1, "b": 2}]) == content_hash([{"b": 2, "a": 1}])
+    assert content_hash(["x", "y"]) != content_hash(["y", "x"])
+
+
+@freeze_time("2026-01-10 12:00:00")
+def test_store_persists_and_reuse_drops_past_movies(cache):
+    movies = [
+        make_movie("Pasada", datetime(2026, 1, 9, 19, 0)),
+        make_movie("Hoy", datetime(2026, 1, 10, 10, 0)),
+        make_movie("Futura", datetime(2026, 1, 20, 19, 0)),
+    ]
+    cache.store(URL, "hash-1", movies)
+
+    reloaded = ListingCache(cache.path)
+
+    assert reloaded.is_unchanged(URL, "hash-1")
+    assert not reloaded.is_unchanged(URL, "hash-2")
+    reused = reloaded.reuse(URL, datetime.now())
+    assert [movie.title for movie in reused] == ["Hoy", "Futura"]
+
+
+def test_conditional_headers_only_with_stored_movies(cache):
+    cache.remember_validators(URL, '"abc"', "Tue, 06 Jan 2026 10:00:00 GMT")
+    assert cache.conditional_headers(URL) == {}
+
+    cache.store(URL, "hash", [make_movie("A", datetime(2030, 1, 1))])
+    assert cache.conditional_headers(URL) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Tue, 06 Jan 2026 10:00:00 GMT",
+    }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetcher_returns_none_on_not_modified(cache):
+    cache.remember_validators(URL, '"v1"', None)
+    cache.store(URL, "hash", [make_movie("A", datetime(2030, 1, 1))])
+    route = respx.get(URL).mock(return_value=httpx.Response(304))
+
+    async with HttpFetcher() as fetcher:
+        assert await fetcher.get_html_if_modified(URL, cache) is None
+
+    assert route.calls.last.request.headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetcher_remembers_validators(cache):
+    respx.get(URL).mock(
+        return_value=httpx.Response(200, html="<p>Hola</p>", headers={"ETag": '"v2"'})
+    )
+
+    async with HttpFetcher() as fetcher:
+        soup = await fetcher.get_html_if_modified(URL, cache)
+
+    assert soup is not None
+    assert soup.get_text() == "Hola"
+    # Se guardan solo junto con las películas de esa respuesta
+    assert "etag" not in cache.entries.get(URL, {})
+    cache.store(URL, "hash", [make_movie("A", datetime(2030, 1, 1))])
+    assert ListingCache(cache.path).entries[URL]["etag"] == '"v2"'
+
+
+def test_validators_of_an_unstored_listing_are_not_persisted(cache):
+    """
+    Si el detalle de un listado falla no se guarda, y sus validadores tampoco,
+    aunque otro listado persista la caché: si no, un 304 devolvería las
+    películas de la versión anterior.
+    """
+    cache.store(URL, "viejo", [make_movie("A", datetime(2030, 1, 1))])
+    cache.remember_validators(URL, '"nuevo"', None)
+    cache.store("https://otro.pe/agenda", "otro", [])
+
+    reloaded = ListingCache(cache.path)
+    assert "etag" not in reloaded.entries[URL]
+    assert reloaded.conditional_headers(URL) == {}
+
+
+@freeze_time("2026-01-10 12:00:00")
+def test_scraper_reuse_counts_hits_and_misses(cache, monkeypatch):
+    monkeypatch.delenv("SCRAPER_MODE", raising=False)
+    monkeypatch.delenv("SCRAPER_LISTING_CACHE", raising=False)
+    metrics.reset()
+    scraper = DummyScraper()
+    scraper.listing_cache = cache
+
+    assert scraper.reuse_unchanged_listing(URL, "nuevo") is None
+    scraper.remember_listing(URL, "nuevo", [make_movie("A", datetime(2026, 2, 1))])
+    reused = scraper.reuse_unchanged_listing(URL, "nuevo")
+
+    assert reused is not None
+    assert [movie.title for movie in reused] == ["A"]
+    assert metrics.get("listing_cache.dummy.miss") == 1
+    assert metrics.get("listing_cache.dummy.hit") == 1
+
+
+def test_cache_disabled_while_replaying(cache, monkeypatch):
+    monkeypatch.setenv("SCRAPER_MODE", "replay")
+    scraper = DummyScraper()
+    scraper.listing_cache = cache
+
+    scraper.remember_listing(URL, "hash", [])
+
+    assert scraper.reuse_unchanged_listing(URL, "hash") is None
+    assert not cache.path.exists()
+
+
+@freeze_time("2026-01-10 12:00:00")
+def test_listing_with_failures_is_not_stored(cache, monkeypatch):
+    monkeypatch.delenv("SCRAPER_MODE", raising=False)
+    monkeypatch.delenv("SCRAPER_LISTING_CACHE", raising=False)
+    metrics.reset()
+    scraper = DummyScraper()
+    scraper.listing_cache = cache
+    scraper.reset_partial_results()
+    scraper.record_failure()  # Una página de detalle no cargó
+
+    scraper.remember_listing(URL, "hash", [make_movie("A", datetime(2026, 2, 1))])
+
+    assert URL not in cache.entries
+    assert metrics.get("listing_cache.dummy.not_stored") == 1
+
+
+def test_stale_entry_is_not_reused(cache, monkeypatch):
+    monkeypatch.setenv("SCRAPER_CACHE_MAX_AGE_DAYS", "7")
+    with freeze_time("2026-01-01 12:00:00"):
+        cache.remember_validators(URL, '"v1"', None)
+        cache.store(URL, "hash", [make_movie("A", datetime(2030, 1, 1))])
+
+    with freeze_time("2026-01-07 12:00:00"):
+        assert cache.is_unchanged(URL, "hash")
+        assert cache.conditional_headers(URL) == {"If-None-Match": '"v1"'}
+    with freeze_time("2026-01-09 12:00:00"):
+        assert not cache.is_unchanged(URL, "hash")
+        assert cache.conditional_headers(URL) == {}
@@ -0,0 +1,101 @@
+"""
+Tests unitarios para las políticas de recursos de los scrapers.
+
+Se verifica la decisión de bloqueo (por tipo y por patrón de URL), la
+contabilidad de `ResourceStats` y que el enrutamiento instalado sobre el
+contexto aborte o deje pasar las peticiones según corresponda.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agenda_cultural.backend.scrapers.resource_policy import (
+    STATIC_SITE_POLICY,
+    TEXT_ONLY_POLICY,
+    ResourcePolicy,
+    ResourceStats,
+)
+
+
+@pytest.mark.parametrize(
+    "url, resource_type, expected",
+    [
+        # Bloqueo por tipo de recurso
+        ("https://lum.cultura.pe/foto.jpg", "image", True),
+        ("https://lum.cultura.pe/fuente.woff2", "font", True),
+        # Bloqueo por patrón de URL (aunque sea un script)
+        ("https://www.googletagmanager.com/gtag/js?id=G-1", "script", True),
+        # Documentos y scripts propios pasan
+        ("https://lum.cultura.pe/actividades", "document", False),
+        ("https://eventos.bnp.gob.pe/js/app.js", "script", False),
+        # La política por defecto mantiene el CSS (necesario para hacer clic)
+        ("https://eventos.bnp.gob.pe/css/site.css", "stylesheet", False),
+    ],
+)
+def test_text_only_policy_should_block(url, resource_type, expected):
+    assert TEXT_ONLY_POLICY.should_block(url, resource_type) is expected
+
+
+def test_static_site_policy_disables_javascript_and_css():
+    """Los sitios estáticos se leen sin JavaScript y sin hojas de estilo."""
+    assert STATIC_SITE_POLICY.context_options() == {"java_script_enabled": False}
+    assert STATIC_SITE_POLICY.should_block("https://x.pe/a.css", "stylesheet")
+
+
+def test_resource_stats_estimates_bytes_saved():
+    stats = ResourceStats()
+    stats.record_blocked("image")
+    stats.record_blocked("image")
+    stats.record_blocked("font")
+    stats.record_blocked("xhr")  # Tipo sin estimación propia -> valor por defecto
+
+    assert stats.blocked_requests == 4
+    assert stats.estimated_bytes_saved == (
+        2 * ResourceStats.ESTIMATED_BYTES["image"]
+        + ResourceStats.ESTIMATED_BYTES["font"]
+        + ResourceStats.DEFAULT_ESTIMATED_BYTES
+    )
+
+
+def test_resource_stats_records_declared_response_size():
+    stats = ResourceStats()
+    stats.record_response(MagicMock(headers={"content-length": "2048"}))
+    stats.record_response(MagicMock(headers={}))  # Respuesta sin tamaño declarado
+
+    assert stats.loaded_requests == 2
+    assert stats.loaded_bytes == 2048
+
+
+@pytest.mark.asyncio
+async def test_install_routes_and_counts_blocked_requests():
+    """El handler instalado aborta lo bloqueado y deja seguir el resto."""
+    context = MagicMock(route=AsyncMock())
+    stats = await TEXT_ONLY_POLICY.install(context)
+
+    handler = context.route.await_args.args[1]
+
+    blocked = MagicMock(abort=AsyncMock(), fallback=AsyncMock())
+    blocked.request.url = "https://lum.cultura.pe/banner.png"
+    blocked.request.resource_type = "image"
+
+    allowed = MagicMock(abort=AsyncMock(), fallback=AsyncMock())
+    allowed.request.url = "https://lum.cultura.pe/actividades"
+    allowed.request.resource_type = "document"
+
+    await handler(blocked)
+    await handler(allowed)
+
+    blocked.abort.assert_awaited_once()
+    allowed.fallback.assert_awaited_once()
+    allowed.abort.assert_not_awaited()
+    assert stats.blocked_by_type == {"image": 1}
+
+
+@pytest.mark.asyncio
+async def test_install_without_rules_does_not_route():
+    """Una política vacía no registra enrutamiento (cero sobrecosto por petición)."""
+    context = MagicMock(route=AsyncMock())
+    await ResourcePolicy().install(context)
+
+    context.route.assert_not_awaited()
@@ -2,71 +2,102 @@
 Tests unitarios y de integración para el servicio de base de datos.
 
 Este módulo verifica la lógica de persistencia de datos, asegurando que:
-1. No se inserten duplicados (idempotencia).
+1. No se inserten duplicados (idempotencia), garantizado por la restricción única.
 2. Se limpien registros antiguos correctamente.
 3. La sincronización maneje tanto bases de datos vacías como pobladas.
+4. La lectura previa al diff se acote a los centros y fechas del lote.
+5. Las versiones asíncronas (aiosqlite) hagan lo mismo que las síncronas.
 
 Se utiliza una base de datos SQLite en memoria para aislar los tests del archivo real.
 """
 
 from datetime import datetime
 
+import pytest
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
+from agenda_cultural.backend import metrics
 from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.services import database_service
 from agenda_cultural.backend.services.database_service import (
-    _filter_new_movies,
+    _stored_movies,
     cleanup_past_movies,
+    cleanup_past_movies_async,
+    get_known_movies,
+    get_known_movies_async,
     sync_movies_to_db,
+    sync_movies_to_db_async,
 )
 
 
-def test_filter_new_movies_excludes_duplicates(session: Session):
+def test_sync_movies_reports_inserted_and_skipped(session: Session, mocker):
     """
-    Verifica que la función auxiliar _filter_new_movies detecte correctamente
-    las películas que ya existen en la BD basándose en (Cine, Título, Fecha).
+    Verifica que el INSERT ... ON CONFLICT DO NOTHING descarte las películas que
+    ya existen en la BD (o que vienen repetidas en el lote) basándose en
+    (Cine, Título, Fecha), y que cuente insertadas y descartadas.
     """
     # === ARRANGE (Preparar) ===
+    mocker_rx_session = mocker.patch(
+        "agenda_cultural.backend.services.database_service.rx.session"
+    )
+    mocker_rx_session.return_value.__enter__.return_value = session
+    metrics.reset()
+
     # 1. Insertamos una película "base" en la BD
-    existing_movie = Movie(
-        title="Avatar",
-        location="cineplanet",
-        center="Cineplanet",
-        date=datetime(2026, 1, 20, 18, 0),
-        url="http://example.com/avatar",
+    session.add(
+        Movie(
+            title="Avatar",
+            location="cineplanet",
+            center="Cineplanet",
+            date=datetime(2026, 1, 20, 18, 0),
+        )
     )
-    session.add(existing_movie)
     session.commit()
 
-    # 2. Preparamos los datos "scrapeados"
-    # Una película totalmente nueva
-    new_movie = Movie(
-        title="Shrek",
-        location="cineplanet",
-        center="Cineplanet",
-        date=datetime(2026, 1, 20, 20, 0),
-        url="http://example.com/shrek",
-    )
-    # Una copia exacta de la que ya existe (mismos datos clave)
+    # 2. El lote trae una copia de la existente y una nueva repetida dos veces
+    def shrek() -> Movie:
+        return Movie(
+            title="Shrek",
+            location="cineplanet",
+            center="Cineplanet",
+            date=datetime(2026, 1, 20, 20, 0),
+        )
+
     duplicate_movie = Movie(
         title="Avatar",
         location="cineplanet",
         center="Cineplanet",
         date=datetime(2026, 1, 20, 18, 0),
-        url="http://example.com/avatar",
     )
 
-    scraped_movies = [duplicate_movie, new_movie]
-
     # === ACT (Ejecutar) ===
-    # Filtramos la lista sucia
-    result = _filter_new_movies(scraped_movies, session)
+    inserted = sync_movies_to_db([duplicate_movie, shrek(), shrek()])
 
     # === ASSERT (Verificar) ===
-    # Solo debería quedar "Shrek". "Avatar" debe ser descartada.
-    assert len(result) == 1
-    assert result[0].title == "Shrek"
-    assert result[0].title != "Avatar"
+    assert inserted == 1
+    assert metrics.get("db.inserted") == 1
+    assert metrics.get("db.skipped") == 2
+    assert sorted(m.title for m in session.exec(select(Movie)).all()) == [
+        "Avatar",
+        "Shrek",
+    ]
+
+
+def test_unique_signature_is_enforced_by_the_database(session: Session):
+    """Aunque se salte el servicio, la BD no acepta dos funciones iguales."""
+    for _ in range(2):
+        session.add(
+            Movie(
+                title="Avatar",
+                location="cineplanet",
+                center="Cineplanet",
+                date=datetime(2026, 1, 20, 18, 0),
+            )
+        )
+
+    with pytest.raises(IntegrityError):
+        session.commit()
 
 
 def test_cleanup_past_movies(session: Session, mocker):
@@ -294,3 +325,124 @@ def test_sync_movies_empty_input_does_nothing(session: Session, mocker):
     assert count == 0
     # La película existente sigue ahí
     assert len(session.exec(select(Movie)).all()) == 1
+
+
+def test_get_known_movies_returns_future_movies_by_center(session: Session, mocker):
+    """
+    Verifica que los scrapers reciban solo las funciones futuras de los centros
+    pedidos, agrupadas por centro.
+    """
+    # === ARRANGE ===
+    mocker_rx_session = mocker.patch(
+        "agenda_cultural.backend.services.database_service.rx.session"
+    )
+    mocker_rx_session.return_value.__enter__.return_value = session
+
+    session.add_all(
+        [
+            Movie(
+                title="Pasada",
+                location="lum",
+                center="lum",
+                date=datetime(2000, 1, 1, 19, 0),
+                source_url="http://example.com/pasada",
+            ),
+            Movie(
+                title="Futura",
+                location="lum",
+                center="lum",
+                date=datetime(3000, 1, 1, 19, 0),
+                source_url="http://example.com/futura",
+            ),
+            Movie(
+                title="Otro centro",
+                location="af",
+                center="alianza_francesa",
+                date=datetime(3000, 1, 1, 19, 0),
+            ),
+        ]
+    )
+    session.commit()
+
+    # === ACT ===
+    known = get_known_movies(["lum", "bnp"])
+
+    # === ASSERT ===
+    assert set(known) == {"lum", "bnp"}
+    assert [movie.title for movie in known["lum"]] == ["Futura"]
+    assert known["bnp"] == []
+
+
+@pytest.mark.parametrize("temp_table_min", [1000, 1], ids=["rango", "tabla_temporal"])
+def test_stored_movies_is_scoped_to_the_batch(
+    session: Session, monkeypatch, temp_table_min: int
+):
+    """
+    Verifica que de un centro parcial solo se lean las funciones del lote (por
+    rango de fechas o por cruce con la tabla temporal) y de uno completo, todas
+    sus funciones futuras; los demás centros no se leen.
+    """
+    # === ARRANGE ===
+    monkeypatch.setattr(database_service, "TEMP_TABLE_MIN_SIGNATURES", temp_table_min)
+
+    def movie(title: str, center: str, day: int) -> Movie:
+        return Movie(
+            title=title, location="Sala", center=center, date=datetime(3000, 1, day)
+        )
+
+    session.add_all(
+        [
+            movie("En el lote", "lum", 10),
+            movie("Fuera del rango", "lum", 25),
+            movie("Completa", "bnp", 10),
+            movie("Retirada", "bnp", 28),
+            movie("Otro centro", "af", 10),
+        ]
+    )
+    session.commit()
+
+    batch = {
+        "lum": [movie("En el lote", "lum", 10), movie("Nueva", "lum", 12)],
+        "bnp": [movie("Completa", "bnp", 10)],
+    }
+
+    # === ACT ===
+    stored = _stored_movies(session, batch, {"bnp"}, datetime(2999, 1, 1))
+
+    # === ASSERT ===
+    assert sorted(title for _, title, _ in stored) == [
+        "Completa",
+        "En el lote",
+        "Retirada",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_cleanup_sync_and_known_movies(async_db: Session):
+    """
+    Verifica que las versiones asíncronas limpien, inserten sin duplicados y
+    lean las funciones conocidas sobre el motor asíncrono.
+    """
+
+    # === ARRANGE ===
+    def movie(title: str, date: datetime) -> Movie:
+        return Movie(title=title, location="Sala", center="lum", date=date)
+
+    async_db.add(movie("Pasada", datetime(2000, 1, 1, 19, 0)))
+    async_db.add(movie("Futura", datetime(3000, 1, 1, 19, 0)))
+    async_db.commit()
+
+    # === ACT ===
+    deleted = await cleanup_past_movies_async()
+    inserted = await sync_movies_to_db_async(
+        [
+            movie("Futura", datetime(3000, 1, 1, 19, 0)),
+            movie("Nueva", datetime(3000, 2, 1)),
+        ]
+    )
+    known = await get_known_movies_async(["lum"])
+
+    # === ASSERT ===
+    assert deleted == 1
+    assert inserted == 1
+    assert sorted(m.title for m in known["lum"]) == ["Futura", "Nueva"]
@@ -0,0 +1,223 @@
+"""
+Tests unitarios para las particiones mensuales de `movie` (`movie_partitions`).
+
+Con una sesión simulada se verifica que:
+1. Los meses y las sentencias de cada partición crucen bien el cambio de año.
+2. Se creen las particiones que falten del mes en curso hasta la función más
+   lejana, y se vuelva a enganchar la tabla suelta de un mes.
+3. Se desenganchen (o borren) solo los meses ya cerrados.
+4. En SQLite no haya particiones y la limpieza siga borrando filas.
+5. El autogenerate de Alembic no proponga borrar las tablas de cada mes.
+
+Con TEST_POSTGRES_URL (la CI levanta un Postgres) se corre además la migración
+y las sentencias reales contra Postgres, en un esquema propio.
+"""
+
+import importlib.util
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, text
+from sqlmodel import Session, SQLModel
+
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.services.database_service import _insert_new_movies
+from agenda_cultural.backend.services.movie_partitions import (
+    attached_partitions,
+    create_partition_sql,
+    ensure_partitions,
+    include_in_autogenerate,
+    is_partitioned,
+    month_start,
+    months_between,
+    next_month,
+    partition_name,
+    retire_past_partitions,
+    table_exists,
+)
+
+NOW = datetime(2026, 11, 15, 20, 0)
+
+PARTITIONS = "agenda_cultural.backend.services.movie_partitions"
+
+MIGRATION = (
+    Path(__file__).parents[3]
+    / "alembic"
+    / "versions"
+    / "e4b7d91a2c6f_partition_movie_by_month.py"
+)
+
+
+def executed_sql(session) -> list[str]:
+    return [
+        str(call.args[0])
+        for call in session.connection.return_value.execute.call_args_list
+    ]
+
+
+def test_months_between_crosses_year_boundary():
+    months = months_between(datetime(2026, 11, 15), datetime(2027, 1, 3))
+
+    assert months == [
+        datetime(2026, 11, 1),
+        datetime(2026, 12, 1),
+        datetime(2027, 1, 1),
+    ]
+    assert create_partition_sql(datetime(2026, 12, 1)) == (
+        "CREATE TABLE movie_y2026m12 PARTITION OF movie "
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+
+
+def test_ensure_partitions_creates_only_missing_months(mocker, monkeypatch):
+    monkeypatch.setenv("MOVIE_PARTITIONS_AHEAD", "1")
+    session = mocker.Mock()
+    mocker.patch(f"{PARTITIONS}.attached_partitions", return_value=["movie_y2026m11"])
+    # La de enero quedó suelta (desenganchada): existe, pero no cuenta
+    mocker.patch(
+        f"{PARTITIONS}.table_exists", side_effect=lambda _, name: name.endswith("01")
+    )
+
+    added = ensure_partitions(session, NOW, until=datetime(2027, 2, 10))
+
+    assert added == ["movie_y2026m12", "movie_y2027m01", "movie_y2027m02"]
+    assert [sql.split()[:5] for sql in executed_sql(session)] == [
+        ["CREATE", "TABLE", "movie_y2026m12", "PARTITION", "OF"],
+        ["ALTER", "TABLE", "movie", "ATTACH", "PARTITION"],
+        ["CREATE", "TABLE", "movie_y2027m02", "PARTITION", "OF"],
+    ]
+
+    # Con todas enganchadas no hay DDL (ni bloqueo de la tabla)
+    mocker.patch(
+        f"{PARTITIONS}.attached_partitions", return_value=added + ["movie_y2026m11"]
+    )
+    session.reset_mock()
+    assert ensure_partitions(session, NOW, until=datetime(2027, 2, 10)) == []
+    assert executed_sql(session) == []
+
+
+def test_retire_past_partitions_detaches_closed_months(mocker, monkeypatch):
+    session = mocker.Mock()
+    mocker.patch(
+        f"{PARTITIONS}.attached_partitions",
+        return_value=["movie_y2026m12", "movie_y2026m10", "movie_y2026m11"],
+    )
+
+    assert retire_past_partitions(session, NOW) == ["movie_y2026m10"]
+    assert executed_sql(session) == [
+        "ALTER TABLE movie DETACH PARTITION movie_y2026m10"
+    ]
+
+    monkeypatch.setenv("MOVIE_PARTITION_RETENTION", "drop")
+    session.reset_mock()
+    retire_past_partitions(session, NOW)
+
+    assert executed_sql(session)[-1] == "DROP TABLE movie_y2026m10"
+
+
+def test_sqlite_is_never_partitioned(session: Session):
+    assert is_partitioned(session) is False
+
+
+def test_autogenerate_ignores_month_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'autogenerate.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE movie_y2026m10 (id INTEGER)"))
+
+        def diff(**opts):
+            context = MigrationContext.configure(
+                connection, opts={"compare_type": False, **opts}
+            )
+            return compare_metadata(context, SQLModel.metadata)
+
+        assert [op[0] for op in diff()] == ["remove_table"]
+        assert diff(include_object=include_in_autogenerate) == []
+
+
+# === POSTGRES ===
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    for _ in range(count):
+        month = next_month(month)
+    return month
+
+
+@pytest.fixture
+def pg_session():
+    """
+    Sesión sobre un esquema vacío de TEST_POSTGRES_URL, con `movie` creada por
+    los modelos y particionada por la migración `e4b7d91a2c6f`.
+    """
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("Sin TEST_POSTGRES_URL no hay Postgres contra el que probar.")
+
+    schema = "movie_partitions_test"
+    admin = create_engine(url)
+    with admin.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema}"})
+
+    spec = importlib.util.spec_from_file_location("partition_migration", MIGRATION)
+    assert spec and spec.loader
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with engine.begin() as connection:
+        SQLModel.metadata.create_all(connection)
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+
+    with Session(engine) as session:
+        yield session
+
+    engine.dispose()
+    with admin.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    admin.dispose()
+
+
+def test_partitions_against_postgres(pg_session, monkeypatch):
+    monkeypatch.setenv("MOVIE_PARTITIONS_AHEAD", "3")
+    monkeypatch.delenv("MOVIE_PARTITION_RETENTION", raising=False)
+    now = datetime.now()
+    month = month_start(now)
+    migrated = [partition_name(add_months(month, n)) for n in range(4)]
+    later = [partition_name(add_months(month, n)) for n in range(4, 7)]
+
+    # La migración deja el mes en curso y los tres siguientes
+    assert is_partitioned(pg_session)
+    assert sorted(attached_partitions(pg_session)) == migrated
+
+    # Hasta la función más lejana, solo se crea lo que falta
+    farthest = add_months(month, 6).replace(day=10, hour=19)
+    assert ensure_partitions(pg_session, now, farthest) == later
+    pg_session.commit()
+    movie = Movie(title="Lejana", location="Sala", date=farthest, center="lum")
+    assert _insert_new_movies(pg_session, [movie]) == 1
+    assert (
+        pg_session.exec(text("SELECT tableoid::regclass::text FROM movie")).scalar_one()
+        == later[-1]
+    )
+    pg_session.commit()
+
+    # Un mes desenganchado con el mismo nombre se vuelve a enganchar
+    pg_session.exec(text(f"ALTER TABLE movie DETACH PARTITION {later[-1]}"))
+    pg_session.commit()
+    assert ensure_partitions(pg_session, now, farthest) == [later[-1]]
+    pg_session.commit()
+    assert ensure_partitions(pg_session, now, farthest) == []
+    assert pg_session.exec(text("SELECT count(*) FROM movie")).scalar_one() == 1
+
+    # Dos meses después, los dos primeros quedan como tablas de historial
+    assert retire_past_partitions(pg_session, add_months(month, 2)) == migrated[:2]
+    pg_session.commit()
+    assert sorted(attached_partitions(pg_session)) == migrated[2:] + later
+    assert table_exists(pg_session, migrated[0])
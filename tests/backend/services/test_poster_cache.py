@@ -0,0 +1,103 @@
+"""
+Tests unitarios para la caché persistente de pósters (`poster_cache`).
+
+Se valida que:
+1. Los títulos se normalizan (tildes, signos y mayúsculas comparten clave).
+2. Aciertos y fallos vencen con TTL distintos y la caché no pasa de su tamaño.
+3. Con la caché caliente, `get_movie_poster` no vuelve a consultar TMDB, ni
+   siquiera para los títulos sin póster; los errores de red no se guardan.
+"""
+
+import pytest
+from freezegun import freeze_time
+from httpx import ConnectError, Response
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.services.poster_cache import (
+    PosterCache,
+    hit_rate_summary,
+    normalize_title,
+)
+from agenda_cultural.backend.services.tmdb_service import get_movie_poster
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PosterCache(
+        tmp_path / "posters.sqlite", hit_ttl_days=90, miss_ttl_days=7, max_entries=3
+    )
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    "title", ["Juliana", "JULIANA", "“Juliana”", "  juliana. ", "Julianá"]
+)
+def test_normalize_title_shares_key(title):
+    assert normalize_title(title) == "juliana"
+
+
+def test_hits_and_misses_survive_reopening(cache):
+    cache.store("Retablo", "https://img/retablo.jpg")
+    cache.store("Sin póster", None)
+    cache.close()
+
+    assert cache.lookup("RETABLO") == (True, "https://img/retablo.jpg")
+    assert cache.lookup("sin poster") == (True, None)
+    assert cache.lookup("Nueva") == (False, None)
+
+
+def test_misses_expire_before_hits(cache):
+    with freeze_time("2026-01-01"):
+        cache.store("Retablo", "https://img/retablo.jpg")
+        cache.store("Sin póster", None)
+
+    with freeze_time("2026-01-20"):
+        assert cache.lookup("Retablo") == (True, "https://img/retablo.jpg")
+        assert cache.lookup("Sin póster") == (False, None)
+
+
+def test_evicts_least_recently_used(cache):
+    with freeze_time("2026-01-01") as frozen:
+        for title in ("A", "B", "C"):
+            cache.store(title, f"https://img/{title}.jpg")
+            frozen.tick()
+        cache.lookup("A")  # A pasa a ser la más reciente
+        frozen.tick()
+        cache.store("D", "https://img/D.jpg")
+
+        assert len(cache) == 3
+        assert cache.lookup("B") == (False, None)
+        assert cache.lookup("A")[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx(base_url="https://api.themoviedb.org/3")
+async def test_warm_cache_skips_tmdb(respx_mock, isolated_poster_cache):
+    metrics.reset()
+    route = respx_mock.get("/search/movie").mock(
+        side_effect=[
+            Response(200, json={"results": [{"poster_path": "/wall-e.jpg"}]}),
+            Response(200, json={"results": []}),
+        ]
+    )
+
+    first = [await get_movie_poster(title) for title in ("Wall-E", "Inédita")]
+    second = [await get_movie_poster(title) for title in ("WALL-E", "Inédita")]
+
+    assert first == second
+    assert first[1] is None
+    assert route.call_count == 2
+    assert metrics.get("poster_cache.hit") == 2
+    assert hit_rate_summary() == (
+        "Caché de pósters: 2 de 4 títulos sin consultar TMDB (50%)."
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx(base_url="https://api.themoviedb.org/3")
+async def test_network_errors_are_not_cached(respx_mock, isolated_poster_cache):
+    respx_mock.get("/search/movie").mock(side_effect=ConnectError)
+
+    assert await get_movie_poster("Wall-E") is None
+    assert isolated_poster_cache.lookup("Wall-E") == (False, None)
@@ -0,0 +1,132 @@
+"""
+Tests unitarios para el espejo local de pósters (`poster_mirror`).
+
+Con una BD SQLite temporal (motor asíncrono) y la CDN simulada se verifica que:
+1. Cada póster remoto se descarga una vez y se generan sus variantes.
+2. Las funciones pasan a apuntar a la copia local.
+3. Una segunda corrida reutiliza el índice sin volver a descargar.
+4. Los pósters que ya no usa ninguna función se borran.
+"""
+
+import io
+from datetime import datetime
+
+import httpx
+import pytest
+import respx
+from PIL import Image
+from sqlmodel import Session, select
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.services.poster_mirror import PosterMirror, mirror_posters
+
+POSTER = "https://image.tmdb.org/t/p/w342/juliana.jpg"
+
+
+@pytest.fixture
+def db(async_db: Session):
+    """La etapa usa las versiones `*_async` del servicio de base de datos."""
+    return async_db
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return PosterMirror(tmp_path / "posters", url_prefix="/posters", widths=(185, 342))
+
+
+def jpeg_bytes(width: int = 500, height: int = 750) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "crimson").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def add_movie(session: Session, center: str, poster: str | None):
+    session.add(
+        Movie(
+            title="Juliana",
+            location="Sala",
+            date=datetime(2099, 1, 20, 19, 0),
+            center=center,
+            poster_url=poster,
+        )
+    )
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_mirror_downloads_once_and_rewrites_urls(db, mirror):
+    metrics.reset()
+    route = respx.get(POSTER).mock(
+        return_value=httpx.Response(200, content=jpeg_bytes())
+    )
+    add_movie(db, "bnp", POSTER)
+    add_movie(db, "lum", POSTER)
+    add_movie(db, "af", None)
+    db.commit()
+
+    rewritten = await mirror_posters(mirror)
+
+    assert rewritten == 2
+    assert route.call_count == 1
+    [local_url] = {m.poster_url for m in db.exec(select(Movie)).all()} - {None}
+    digest = mirror.digest_of(local_url)
+    assert local_url == f"/posters/{digest[:2]}/{digest}/w342.webp"
+
+    with Image.open(mirror.variant_dir(digest) / "w185.webp") as small:
+        assert small.size == (185, 278)
+    assert mirror.is_mirrored(digest)
+    assert metrics.get("poster_mirror.downloaded") == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_mirror_reuses_index_between_runs(db, mirror):
+    route = respx.get(POSTER).mock(
+        return_value=httpx.Response(200, content=jpeg_bytes())
+    )
+    add_movie(db, "bnp", POSTER)
+    db.commit()
+    await mirror_posters(mirror)
+
+    # Otra noche: TMDB (o su caché) vuelve a dar la URL remota para una función nueva
+    add_movie(db, "lum", POSTER)
+    db.commit()
+    reloaded = PosterMirror(mirror.root, url_prefix="/posters", widths=(185, 342))
+
+    assert await mirror_posters(reloaded) == 1
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_mirror_removes_unreferenced_posters(db, mirror):
+    respx.get(POSTER).mock(return_value=httpx.Response(200, content=jpeg_bytes()))
+    orphan = mirror.write_variants(jpeg_bytes(300, 450))
+    add_movie(db, "bnp", POSTER)
+    db.commit()
+
+    await mirror_posters(mirror)
+
+    assert not mirror.variant_dir(orphan).exists()
+    assert len(list(mirror.root.glob("??/*"))) == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_mirror_keeps_remote_url_when_download_fails(db, mirror):
+    metrics.reset()
+    respx.get(POSTER).mock(return_value=httpx.Response(404))
+    add_movie(db, "bnp", POSTER)
+    db.commit()
+
+    assert await mirror_posters(mirror) == 0
+    assert db.exec(select(Movie)).one().poster_url == POSTER
+    assert metrics.get("poster_mirror.failed") == 1
+
+
+@pytest.mark.asyncio
+async def test_mirror_disabled_without_directory(monkeypatch):
+    monkeypatch.delenv("POSTER_MIRROR_DIR", raising=False)
+
+    assert await mirror_posters() == 0
@@ -0,0 +1,96 @@
+"""
+Tests unitarios para la etapa de pósters (`poster_service`).
+
+Con una BD SQLite temporal (motor asíncrono) y TMDB simulado se verifica que:
+1. Cada título normalizado se consulta una sola vez, aunque se repita.
+2. Las consultas corren en paralelo sin pasar del límite de concurrencia.
+3. Los pósters se asignan en bloque a todas las funciones del título.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlmodel import Session, select
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.services.poster_service import enrich_posters
+
+
+@pytest.fixture
+def db(async_db: Session):
+    """La etapa usa las versiones `*_async` del servicio de base de datos."""
+    return async_db
+
+
+def add_movie(
+    session: Session, title: str, center: str, poster: str | None = None, day: int = 20
+):
+    session.add(
+        Movie(
+            title=title,
+            location="Sala",
+            date=datetime(2099, 1, day, 19, 0),
+            center=center,
+            poster_url=poster,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_enrich_posters_dedupes_titles_and_bounds_concurrency(db, mocker):
+    metrics.reset()
+    for day, center in enumerate(("bnp", "bnp", "bnp", "lum"), start=20):
+        add_movie(db, "Juliana", center, day=day)
+    add_movie(db, "JULIANA", "af")
+    add_movie(db, "Retablo", "ccpucp")
+    add_movie(db, "Sin póster", "ccpucp")
+    add_movie(db, "Ya tiene", "lum", poster="https://img/ya.jpg")
+    db.commit()
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_poster(title: str) -> str | None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return None if title == "Sin póster" else f"/{title}.jpg"
+
+    tmdb = mocker.patch(
+        "agenda_cultural.backend.services.poster_service.get_movie_poster",
+        side_effect=fake_poster,
+    )
+
+    filled = await enrich_posters(concurrency=2)
+
+    assert sorted(call.args[0] for call in tmdb.await_args_list) == [
+        "Juliana",
+        "Retablo",
+        "Sin póster",
+    ]
+    assert peak == 2
+    assert filled == 6
+    posters = {
+        (movie.center, movie.title): (movie.poster_path, movie.poster_url)
+        for movie in db.exec(select(Movie)).all()
+    }
+    assert posters[("af", "JULIANA")] == (
+        "/Juliana.jpg",
+        "https://image.tmdb.org/t/p/w342/Juliana.jpg",
+    )
+    assert posters[("ccpucp", "Sin póster")] == (None, None)
+    assert metrics.get("posters.unique_titles") == 3
+
+
+@pytest.mark.asyncio
+async def test_enrich_posters_without_pending_movies_skips_tmdb(db, mocker):
+    tmdb = mocker.patch(
+        "agenda_cultural.backend.services.poster_service.get_movie_poster"
+    )
+
+    assert await enrich_posters() == 0
+    tmdb.assert_not_called()
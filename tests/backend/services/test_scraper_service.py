@@ -0,0 +1,201 @@
+"""
+Tests unitarios para el servicio de scraping (`scraper_service`).
+
+Se verifica, con scrapers simulados y sin navegador, que:
+1. Un scraper que termina a tiempo se reporta como completo.
+2. Un scraper colgado se cancela al agotar su tiempo, cierra lo que abrió y
+   conserva sus películas parciales.
+3. El plazo global corta a todos los scrapers pendientes.
+4. Un fallo se reporta como error, separado de un timeout, y las páginas que
+   fallaron dejan al centro como incompleto.
+5. Con un sink, las películas se guardan por lotes a medida que llegan, sin
+   esperar a que el centro termine.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
+from agenda_cultural.backend.services.scraper_service import (
+    ScraperStatus,
+    run_scraper,
+)
+
+# === HELPERS ===
+
+
+def make_movie(title: str) -> Movie:
+    return Movie(
+        title=title, location="Sala", date=datetime(2030, 1, 1), center="dummy"
+    )
+
+
+class DummyScraper(ScraperInterface):
+    """
+    Extrae `found` películas y luego espera `hang` segundos (o falla). Con
+    `failed`, registra ese número de páginas de detalle que no cargaron.
+    """
+
+    CENTER_SLUG = "dummy"
+    TIME_BUDGET_SECONDS = 0.1
+
+    def __init__(
+        self, found: int = 1, hang: float = 0.0, error: bool = False, failed: int = 0
+    ):
+        self.found = found
+        self.hang = hang
+        self.error = error
+        self.failed = failed
+        self.closed = False
+
+    async def get_movies(self, browser_pool=None, http_fetcher=None):
+        movies = [make_movie(f"Peli {i}") for i in range(self.found)]
+        self.collect_partial(*movies)
+        for _ in range(self.failed):
+            self.record_failure()
+        try:
+            # Equivale a un wait_for_function que nunca se cumple
+            await asyncio.sleep(self.hang)
+        finally:
+            self.closed = True
+        if self.error:
+            raise RuntimeError("sitio caído")
+        return movies
+
+
+def far_deadline() -> float:
+    return asyncio.get_running_loop().time() + 60
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv("SCRAPER_CENTER_TIMEOUT", raising=False)
+    monkeypatch.delenv("SCRAPER_TIMEOUT_DUMMY", raising=False)
+    metrics.reset()
+
+
+# === TESTS ===
+
+
+@pytest.mark.asyncio
+async def test_scraper_on_time_is_ok():
+    outcome = await run_scraper(DummyScraper(found=2), None, None, far_deadline())
+
+    assert outcome.status is ScraperStatus.OK
+    assert len(outcome.movies) == 2
+    assert metrics.get("outcome.dummy.ok") == 1
+
+
+@pytest.mark.asyncio
+async def test_hung_scraper_is_cancelled_with_partial_results():
+    scraper = DummyScraper(found=3, hang=30)
+
+    outcome = await run_scraper(scraper, None, None, far_deadline())
+
+    assert outcome.status is ScraperStatus.TIMEOUT
+    assert [movie.title for movie in outcome.movies] == ["Peli 0", "Peli 1", "Peli 2"]
+    assert scraper.closed  # Los `finally` del scraper se ejecutaron
+    assert outcome.elapsed < 5
+    assert metrics.get("outcome.dummy.timeout") == 1
+    assert metrics.get("outcome.dummy.partial_movies") == 3
+
+
+@pytest.mark.asyncio
+async def test_pipeline_deadline_cuts_pending_scrapers(monkeypatch):
+    monkeypatch.setenv("SCRAPER_TIMEOUT_DUMMY", "60")
+    deadline = asyncio.get_running_loop().time() + 0.1
+
+    outcomes = await asyncio.gather(
+        run_scraper(DummyScraper(hang=30), None, None, deadline),
+        run_scraper(DummyScraper(found=2), None, None, deadline),
+    )
+
+    assert [outcome.status for outcome in outcomes] == [
+        ScraperStatus.TIMEOUT,
+        ScraperStatus.OK,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failure_is_reported_as_error_not_timeout():
+    outcome = await run_scraper(DummyScraper(error=True), None, None, far_deadline())
+
+    assert outcome.status is ScraperStatus.ERROR
+    assert [movie.title for movie in outcome.movies] == ["Peli 0"]  # Ya emitida
+    assert isinstance(outcome.error, RuntimeError)
+    assert metrics.get("outcome.dummy.timeout") == 0
+
+
+@pytest.mark.asyncio
+async def test_swallowed_failures_leave_the_center_partial():
+    scraper = DummyScraper(found=2, failed=1)
+
+    outcome = await run_scraper(scraper, None, None, far_deadline())
+
+    assert outcome.status is ScraperStatus.PARTIAL
+    assert outcome.failures == 1
+    assert len(outcome.movies) == 2  # Lo extraído se conserva
+    assert metrics.get("outcome.dummy.partial") == 1
+    assert metrics.get("outcome.dummy.ok") == 0
+
+    # Cada corrida empieza sin los fallos de la anterior
+    scraper.failed = 0
+    assert (
+        await run_scraper(scraper, None, None, far_deadline())
+    ).status is ScraperStatus.OK
+
+
+def test_time_budget_env_overrides(monkeypatch):
+    scraper = DummyScraper()
+    assert scraper.time_budget() == 0.1
+
+    monkeypatch.setenv("SCRAPER_CENTER_TIMEOUT", "120")
+    assert scraper.time_budget() == 120
+
+    monkeypatch.setenv("SCRAPER_TIMEOUT_DUMMY", "45")
+    assert scraper.time_budget() == 45
+
+
+@pytest.mark.asyncio
+async def test_sink_commits_batches_while_the_center_is_still_running(monkeypatch):
+    monkeypatch.setenv("SCRAPER_TIMEOUT_DUMMY", "0.5")
+    batches: list[list[str]] = []
+    scraper = DummyScraper(found=5, hang=30)
+
+    def sink(batch: list[Movie]) -> int:
+        batches.append([movie.title for movie in batch])
+        return len(batch)
+
+    task = asyncio.create_task(
+        run_scraper(scraper, None, None, far_deadline(), sink=sink, batch_size=2)
+    )
+    await asyncio.sleep(0.05)
+
+    # Lotes guardados mientras el scraper sigue colgado
+    assert not scraper.closed
+    assert batches == [["Peli 0", "Peli 1"], ["Peli 2", "Peli 3"]]
+
+    outcome = await task
+    assert outcome.status is ScraperStatus.TIMEOUT
+    assert batches[-1] == ["Peli 4"]  # El resto se guarda al cancelar
+    assert (outcome.found, outcome.saved, outcome.movies) == (5, 5, [])
+    assert metrics.get("sync.dummy.batches") == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_movies_adds_final_results_without_repeating():
+    class CachedScraper(DummyScraper):
+        async def get_movies(self, browser_pool=None, http_fetcher=None):
+            streamed = await super().get_movies(browser_pool, http_fetcher)
+            # Como al reutilizar la caché: copias nuevas más una que no se registró
+            return [make_movie(movie.title) for movie in streamed] + [
+                make_movie("De la caché")
+            ]
+
+    titles = [movie.title async for movie in CachedScraper(found=2).iter_movies()]
+
+    assert titles == ["Peli 0", "Peli 1", "De la caché"]
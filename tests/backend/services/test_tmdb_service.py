@@ -5,14 +5,20 @@ variables de configuración y 'caplog' para asegurar que el log recibe
 el texto esperado.
 """
 
+import asyncio
+import time
+from email.utils import formatdate
+
 import pytest
 from httpx import ConnectError, Response
 
-from agenda_cultural.backend.config import TMDB_IMAGE_BASE_URL
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.services import tmdb_service
 from agenda_cultural.backend.services.tmdb_service import get_movie_poster
 
 
-def test_get_movie_poster_no_token(mocker):
+@pytest.mark.asyncio
+async def test_get_movie_poster_no_token(mocker):
     """
     Verifica que la función retorne None de inmediato si no hay un token configurado.
     Este es el caso de 'Fail Fast' para evitar llamadas innecesarias.
@@ -21,12 +27,13 @@ def test_get_movie_poster_no_token(mocker):
     mocker.patch("agenda_cultural.backend.services.tmdb_service.TMDB_TOKEN", None)
 
     # Act: Ejecutamos la función
-    result = get_movie_poster("El Exorcista")
+    result = await get_movie_poster("El Exorcista")
 
     # Assert: Confirmamos que no se intentó ninguna operación
     assert result is None
 
 
+@pytest.mark.asyncio
 @pytest.mark.respx(base_url="https://api.themoviedb.org/3")
 class TestTMDBApi:
     """
@@ -36,13 +43,13 @@ class TestTMDBApi:
 
     movie = "Wall-E"
 
-    def test_get_movie_poster_network_failure(self, respx_mock, caplog):
+    async def test_get_movie_poster_network_failure(self, respx_mock, caplog):
         """Prueba que un fallo crítico de red (DNS/Conexión) sea manejado sin crashear."""
         # Arrange: Simulamos una excepción de conexión de httpx
         respx_mock.get("/search/movie").mock(side_effect=ConnectError)
 
         # Act
-        result = get_movie_poster(self.movie)
+        result = await get_movie_poster(self.movie)
 
         # Assert
         assert result is None
@@ -50,7 +57,7 @@ class TestTMDBApi:
         assert any(record.levelname == "ERROR" for record in caplog.records)
 
     @pytest.mark.parametrize("status_code", [400, 401, 404, 500])
-    def test_get_movie_poster_http_errors(self, respx_mock, status_code, caplog):
+    async def test_get_movie_poster_http_errors(self, respx_mock, status_code, caplog):
         """
         Verifica que diversos errores de estado HTTP (4xx, 5xx)
         sean capturados por raise_for_status().
@@ -59,14 +66,14 @@ class TestTMDBApi:
         respx_mock.get("/search/movie").mock(return_value=Response(status_code))
 
         # Act
-        result = get_movie_poster(self.movie)
+        result = await get_movie_poster(self.movie)
 
         # Assert
         assert result is None
         assert f"Error HTTP {status_code} de TMDB para '{self.movie}'" in caplog.text
         assert any(record.levelname == "ERROR" for record in caplog.records)
 
-    def test_get_movie_poster_no_results(self, respx_mock, caplog):
+    async def test_get_movie_poster_no_results(self, respx_mock, caplog):
         """Prueba el comportamiento cuando la API responde OK pero no encuentra la película."""
         # Arrange: TMDB devuelve una lista vacía en 'results'
         mock_response = {"page": 1, "results": [], "total_pages": 1, "total_results": 0}
@@ -75,14 +82,14 @@ class TestTMDBApi:
         )
 
         # Act
-        result = get_movie_poster(self.movie)
+        result = await get_movie_poster(self.movie)
 
         # Assert
         assert result is None
         assert f"No se encontró póster para '{self.movie}'" in caplog.text
         assert any(record.levelname == "WARNING" for record in caplog.records)
 
-    def test_get_movie_poster_no_poster_path(self, respx_mock, caplog):
+    async def test_get_movie_poster_no_poster_path(self, respx_mock, caplog):
         """Prueba el caso donde existe la película pero no tiene imagen cargada (null)."""
         # Arrange: 'poster_path' viene como null (None en Python)
         mock_response = {
@@ -96,17 +103,17 @@ class TestTMDBApi:
         )
 
         # Act
-        result = get_movie_poster(self.movie)
+        result = await get_movie_poster(self.movie)
 
         # Assert
         assert result is None
         assert f"No se encontró póster para '{self.movie}'" in caplog.text
         assert any(record.levelname == "WARNING" for record in caplog.records)
 
-    def test_get_movie_poster_success(self, respx_mock):
+    async def test_get_movie_poster_success(self, respx_mock):
         """
-        Caso de éxito: Verifica que se construya correctamente la URL absoluta
-        del póster combinando la base de imágenes con el path de la API.
+        Caso de éxito: Verifica que se devuelva la ruta del póster tal como la
+        entrega la API (la URL se arma después con la configuración de imágenes).
         """
         # Arrange: Simulamos una respuesta exitosa con un path de imagen
         mock_url = "/url_test.jpg"
@@ -121,7 +128,197 @@ class TestTMDBApi:
         )
 
         # Act
-        result = get_movie_poster(self.movie)
+        result = await get_movie_poster(self.movie)
+
+        # Assert
+        assert result == mock_url
+
+    async def test_get_movie_poster_reuses_client_and_measures_latency(
+        self, respx_mock
+    ):
+        """
+        Varias consultas en el mismo event loop comparten un único AsyncClient
+        y cada una registra su propia latencia en las métricas.
+        """
+        # Arrange
+        metrics.reset()
+        respx_mock.get("/search/movie").mock(
+            return_value=Response(200, json={"results": []})
+        )
+
+        # Act
+        await get_movie_poster(self.movie)
+        client = tmdb_service._shared_client()
+        await get_movie_poster("Retablo")
+
+        # Assert
+        assert tmdb_service._shared_client() is client
+        assert metrics.get("tmdb.requests") == 2
+        assert len(metrics.samples("tmdb.latency_ms")) == 2
+        assert metrics.percentile("tmdb.latency_ms", 95) == max(
+            metrics.samples("tmdb.latency_ms")
+        )
+        assert respx_mock.calls.call_count == 2
+
+        await tmdb_service.close_tmdb_client()
+        assert client.is_closed
+
+
+def test_latency_percentiles_come_from_each_request():
+    metrics.reset()
+    for latency in range(1, 21):
+        metrics.observe("tmdb.latency_ms", latency)
+
+    assert metrics.percentile("tmdb.latency_ms", 50) == 10
+    assert metrics.percentile("tmdb.latency_ms", 95) == 19
+    assert "tmdb.latency_ms.p95=19" in metrics.format_summary()
+
+    metrics.reset()
+    assert metrics.percentile("tmdb.latency_ms", 50) is None
+
+
+# === LIMITADOR Y REINTENTOS ===
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx(base_url="https://api.themoviedb.org/3")
+async def test_get_movie_poster_waits_on_429_and_retries(respx_mock):
+    """Un 429 se cuenta como throttled y la consulta se reintenta con éxito."""
+    metrics.reset()
+    respx_mock.get("/search/movie").mock(
+        side_effect=[
+            Response(429, headers={"Retry-After": "1"}),
+            Response(200, json={"results": [{"poster_path": "/ok.jpg"}]}),
+        ]
+    )
+
+    result = await get_movie_poster("Wall-E")
+
+    assert result == "/ok.jpg"
+    assert metrics.get("tmdb.throttled") == 1
+    assert metrics.get("tmdb.retried") == 1
+    assert metrics.get("tmdb.failed") == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx(base_url="https://api.themoviedb.org/3")
+async def test_get_movie_poster_gives_up_after_retries(respx_mock, caplog):
+    """Con 5xx persistentes se agotan los reintentos y la consulta cuenta como fallida."""
+    metrics.reset()
+    route = respx_mock.get("/search/movie").mock(return_value=Response(503))
+
+    result = await get_movie_poster("Wall-E")
+
+    assert result is None
+    assert route.call_count == 3  # 1 intento + 2 reintentos (política de los tests)
+    assert metrics.get("tmdb.retried") == 2
+    assert metrics.get("tmdb.failed") == 1
+    assert "Error HTTP 503 de TMDB para 'Wall-E'" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests():
+    """Sin fichas de sobra, las peticiones salen al ritmo configurado."""
+    bucket = tmdb_service.TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+
+    for _ in range(4):
+        await bucket.acquire()
+
+    # La primera usa la ficha inicial; las otras tres esperan 1/50 s cada una
+    assert time.monotonic() - start >= 0.05
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    policy = tmdb_service.RetryPolicy(max_delay=60)
+    in_ten_seconds = formatdate(time.time() + 10, usegmt=True)
+
+    assert policy.retry_after(Response(429, headers={"Retry-After": "7"}), 0) == 7
+    assert (
+        8
+        <= policy.retry_after(Response(429, headers={"Retry-After": in_ten_seconds}), 0)
+        <= 10
+    )
+    assert policy.retry_after(Response(429, headers={"Retry-After": "600"}), 0) == 60
+
+
+# === CONFIGURACIÓN DE IMÁGENES ===
+
+
+def test_image_config_builds_srcset_up_to_max_width():
+    config = tmdb_service.ImageConfig(
+        base_url="https://img.tmdb/", poster_sizes=["w92", "w185", "w342", "original"]
+    )
+
+    assert config.poster_url("/a.jpg") == "https://img.tmdb/w342/a.jpg"
+    assert config.srcset("/a.jpg", max_width=185) == (
+        "https://img.tmdb/w92/a.jpg 92w, https://img.tmdb/w185/a.jpg 185w"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx(base_url="https://api.themoviedb.org/3")
+async def test_get_image_config_fetches_once_and_persists(respx_mock, mocker):
+    """/configuration se consulta una vez; después se lee del disco."""
+    mocker.patch("agenda_cultural.backend.services.tmdb_service.TMDB_TOKEN", "token")
+    route = respx_mock.get("/configuration").mock(
+        return_value=Response(
+            200,
+            json={
+                "images": {
+                    "secure_base_url": "https://cdn.tmdb/",
+                    "poster_sizes": ["w154", "w500"],
+                }
+            },
+        )
+    )
+
+    first = await tmdb_service.get_image_config()
+    second = await tmdb_service.get_image_config()
+
+    assert route.call_count == 1
+    assert first == second == tmdb_service.load_image_config()
+    assert second.srcset("/a.jpg") == "https://cdn.tmdb/w154/a.jpg 154w"
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx(base_url="https://api.themoviedb.org/3")
+async def test_get_image_config_falls_back_to_defaults(respx_mock, mocker):
+    mocker.patch("agenda_cultural.backend.services.tmdb_service.TMDB_TOKEN", "token")
+    respx_mock.get("/configuration").mock(return_value=Response(401))
+
+    config = await tmdb_service.get_image_config()
+
+    assert config == tmdb_service.ImageConfig()
+
+
+@pytest.mark.asyncio
+async def test_keep_image_config_fresh_refreshes_every_ttl(mocker, monkeypatch):
+    """La tarea de fondo de la app refresca al arrancar y duerme un TTL."""
+    monkeypatch.setenv("TMDB_CONFIG_TTL_DAYS", "1")
+    refresh = mocker.patch(
+        "agenda_cultural.backend.services.tmdb_service.get_image_config"
+    )
+    sleep = mocker.patch(
+        "agenda_cultural.backend.services.tmdb_service.asyncio.sleep",
+        side_effect=[None, asyncio.CancelledError],
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await tmdb_service.keep_image_config_fresh()
+
+    assert refresh.await_count == 2
+    sleep.assert_awaited_with(24 * 60 * 60)
+
+
+def test_image_config_path_expands_home(monkeypatch):
+    monkeypatch.setenv("TMDB_CONFIG_PATH", "~/tmdb_configuration.json")
+    assert "~" not in str(tmdb_service._image_config_path())
+
+
+@pytest.mark.asyncio
+async def test_cached_legacy_url_is_returned_as_path(isolated_poster_cache):
+    """Las entradas de la caché guardadas como URL completa se leen como ruta."""
+    isolated_poster_cache.store("Wall-E", "https://image.tmdb.org/t/p/w342/walle.jpg")
 
-        # Assert: Verificamos la construcción correcta del string final
-        assert result == f"{TMDB_IMAGE_BASE_URL}{mock_url}"
+    assert await get_movie_poster("Wall-E") == "/walle.jpg"
@@ -0,0 +1,241 @@
+"""
+Tests unitarios para el spool local de escrituras (`write_spool`).
+
+Con la BD en memoria se verifica que:
+1. Los lotes sobreviven entre instancias (disco) y gana lo último scrapeado.
+2. El envío guarda todo en una sola transacción (sin lo ya pasado) y vacía el
+   spool, y cuenta como nuevas solo las filas que devolvió el INSERT.
+3. El diff actualiza lo que cambió y retira lo que desapareció solo en los
+   centros completos, y deja el changelog por centro. Un scraping con páginas
+   fallidas no deja al centro completo y no retira nada.
+4. Si la BD falla, el spool se conserva y la siguiente corrida lo retoma.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlmodel import Session, select
+
+from agenda_cultural.backend import metrics
+from agenda_cultural.backend.models import Movie
+from agenda_cultural.backend.scrapers.base_scraper import ScraperInterface
+from agenda_cultural.backend.services import write_spool
+from agenda_cultural.backend.services.scraper_service import run_scraper
+from agenda_cultural.backend.services.write_spool import (
+    WriteSpool,
+    mark_complete_centers,
+    ship_spool,
+)
+
+
+@pytest.fixture
+def db(async_db: Session):
+    """El envío usa el motor asíncrono: BD temporal con aiosqlite."""
+    return async_db
+
+
+@pytest.fixture
+def spool(tmp_path):
+    spool = WriteSpool(tmp_path / "write_spool.sqlite")
+    yield spool
+    spool.close()
+
+
+def make_movie(
+    title: str,
+    date: datetime = datetime(2099, 1, 20, 19, 0),
+    center: str = "lum",
+    location: str = "Sala",
+) -> Movie:
+    return Movie(title=title, location=location, date=date, center=center)
+
+
+def test_append_persists_and_keeps_latest_version(spool):
+    assert spool.append([make_movie("Juliana"), make_movie("Retablo")]) == 2
+    spool.append([make_movie("Juliana", location="Sala 2")])
+
+    reopened = WriteSpool(spool.path)
+    _, movies_by_center, complete = reopened.pending()
+
+    movies = movies_by_center["lum"]
+    assert sorted((m.title, m.location) for m in movies) == [
+        ("Juliana", "Sala 2"),
+        ("Retablo", "Sala"),
+    ]
+    assert complete == set()
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_ship_spool_inserts_and_empties_spool(db, spool):
+    metrics.reset()
+    db.add(make_movie("Pasada", datetime(2000, 1, 1)))
+    db.add(make_movie("Juliana"))
+    db.commit()
+    spool.append(
+        [
+            make_movie("Juliana"),
+            make_movie("Retablo"),
+            make_movie("Vieja", datetime(2001, 1, 1)),
+        ]
+    )
+
+    inserted = await ship_spool(spool, retries=0)
+
+    assert inserted == 1
+    # Las funciones pasadas de la BD son cosa de la limpieza, no del envío
+    assert sorted(m.title for m in db.exec(select(Movie)).all()) == [
+        "Juliana",
+        "Pasada",
+        "Retablo",
+    ]
+    assert len(spool) == 0
+    assert metrics.get("db.inserted") == 1
+
+
+@pytest.mark.asyncio
+async def test_ship_spool_counts_rows_returned_by_insert(db, spool, mocker):
+    """Una firma que otra corrida guardó después de la lectura no cuenta como nueva."""
+    db.add(make_movie("Juliana"))
+    db.commit()
+    mocker.patch(
+        "agenda_cultural.backend.services.database_service._stored_movies",
+        return_value={},
+    )
+    spool.append([make_movie("Juliana"), make_movie("Retablo")])
+
+    assert await ship_spool(spool, retries=0) == 1
+
+
+@pytest.mark.asyncio
+async def test_ship_spool_keeps_spool_when_database_fails(db, spool, mocker):
+    spool.append([make_movie("Juliana")])
+    mocker.patch("agenda_cultural.backend.services.write_spool.asyncio.sleep")
+    real_ship = write_spool.ship_movies_to_db_async
+    ship = mocker.patch(
+        "agenda_cultural.backend.services.write_spool.ship_movies_to_db_async",
+        side_effect=OperationalError("INSERT", {}, ConnectionError("túnel caído")),
+    )
+
+    with pytest.raises(OperationalError):
+        await ship_spool(spool, retries=2)
+
+    assert ship.call_count == 3
+    assert len(spool) == 1
+
+    # La corrida siguiente retoma lo que quedó, junto con lo nuevo
+    ship.side_effect = real_ship
+    spool.append([make_movie("Retablo")])
+
+    assert await ship_spool(spool, retries=0) == 2
+    assert len(spool) == 0
+
+
+@pytest.mark.asyncio
+async def test_ship_spool_retries_dropped_connections_only(db, spool, mocker):
+    """
+    Una conexión caída que el driver entrega como OSError o un timeout también
+    se reintenta; un error de programación se propaga al primer intento.
+    """
+    spool.append([make_movie("Juliana")])
+    mocker.patch("agenda_cultural.backend.services.write_spool.asyncio.sleep")
+    real_ship = write_spool.ship_movies_to_db_async
+    failures: list[Exception] = [ConnectionResetError("reset"), asyncio.TimeoutError()]
+
+    async def flaky_ship(*args):
+        if failures:
+            raise failures.pop(0)
+        return await real_ship(*args)
+
+    ship = mocker.patch(
+        "agenda_cultural.backend.services.write_spool.ship_movies_to_db_async",
+        side_effect=flaky_ship,
+    )
+
+    assert await ship_spool(spool, retries=2) == 1
+    assert ship.call_count == 3
+    assert len(spool) == 0
+
+    spool.append([make_movie("Retablo")])
+    ship.reset_mock(side_effect=True)
+    ship.side_effect = ProgrammingError("SELECT", {}, Exception("columna"))
+    with pytest.raises(ProgrammingError):
+        await ship_spool(spool, retries=2)
+
+    assert ship.call_count == 1
+    assert len(spool) == 1
+
+
+@pytest.mark.asyncio
+async def test_ship_spool_applies_diff_only_for_complete_centers(db, spool, tmp_path):
+    db.add(make_movie("Juliana"))
+    db.add(make_movie("Cancelada"))
+    db.add(make_movie("Retablo", center="bnp"))
+    db.add(make_movie("Caída", center="bnp"))
+    db.commit()
+
+    # Corrida vieja que no llegó a enviarse: lo suyo ya no está en la cartelera
+    spool.start_run()
+    spool.append([make_movie("Olvidada")])
+
+    spool.start_run()
+    spool.append([make_movie("Juliana", location="Sala 2"), make_movie("Nueva")])
+    spool.append([make_movie("Retablo", center="bnp")])
+    spool.mark_complete(["lum"])  # bnp terminó por timeout
+
+    inserted = await ship_spool(spool, retries=0)
+
+    assert inserted == 1
+    stored = {(m.center, m.title): m.location for m in db.exec(select(Movie)).all()}
+    assert stored == {
+        ("lum", "Juliana"): "Sala 2",
+        ("lum", "Nueva"): "Sala",
+        ("bnp", "Retablo"): "Sala",
+        ("bnp", "Caída"): "Sala",
+    }
+
+    entry = json.loads((tmp_path / "changelog.jsonl").read_text())
+    lum = entry["centers"]["lum"]
+    assert [s[1] for s in lum["inserted"]] == ["Nueva"]
+    assert [s[1] for s in lum["updated"]] == ["Juliana"]
+    assert [s[1] for s in lum["deleted"]] == ["Cancelada"]
+    assert entry["centers"]["bnp"]["deleted"] == []
+
+
+class TimedOutDetailScraper(ScraperInterface):
+    """Extrae una película del LUM y pierde otra por un timeout del detalle."""
+
+    CENTER_SLUG = "lum"
+
+    async def get_movies(self, browser_pool=None, http_fetcher=None):
+        # Como los scrapers reales: el fallo se registra y no se propaga
+        self.record_failure()
+        return [make_movie("Juliana")]
+
+
+@pytest.mark.asyncio
+async def test_partial_scrape_retires_nothing(db, spool, monkeypatch):
+    monkeypatch.setattr(write_spool, "write_spool", spool)
+    db.add(make_movie("Juliana"))
+    db.add(make_movie("Retablo"))  # Su página de detalle no cargó
+    db.commit()
+
+    spool.start_run()
+    outcome = await run_scraper(
+        TimedOutDetailScraper(),
+        None,
+        None,
+        asyncio.get_running_loop().time() + 60,
+        sink=spool.append,
+    )
+
+    assert mark_complete_centers([outcome]) == []
+    await ship_spool(spool, retries=0)
+
+    assert sorted(m.title for m in db.exec(select(Movie)).all()) == [
+        "Juliana",
+        "Retablo",
+    ]
@@ -1,5 +1,8 @@
 import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 @pytest.fixture(name="session")
@@ -15,3 +18,63 @@ def session_fixture():
 
     with Session(engine) as session:
         yield session
+
+
+@pytest_asyncio.fixture(name="async_db")
+async def async_db_fixture(tmp_path, mocker):
+    """
+    Fixture para las funciones `*_async` del servicio de base de datos.
+
+    Conecta `rx.asession` a un SQLite temporal con aiosqlite (una BD en memoria
+    no se comparte entre motores) y devuelve una sesión síncrona sobre el mismo
+    archivo, para preparar datos y verificar resultados.
+    """
+    path = tmp_path / "async.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+    mocker.patch(
+        "agenda_cultural.backend.services.database_service.rx.asession",
+        side_effect=lambda: AsyncSession(engine, expire_on_commit=False),
+    )
+    sync_engine = create_engine(f"sqlite:///{path}")
+    with Session(sync_engine) as session:
+        yield session
+
+    sync_engine.dispose()
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def isolated_poster_cache(tmp_path, mocker, monkeypatch):
+    """
+    Fixture global: cada test usa una caché de pósters (y una configuración de
+    imágenes de TMDB y un changelog) vacía en un directorio temporal, para no
+    leer ni escribir la caché real del proyecto.
+    """
+    from agenda_cultural.backend.services.poster_cache import PosterCache
+
+    monkeypatch.setenv("TMDB_CONFIG_PATH", str(tmp_path / "tmdb_configuration.json"))
+    monkeypatch.setenv("SCRAPER_CHANGELOG_PATH", str(tmp_path / "changelog.jsonl"))
+    cache = PosterCache(tmp_path / "poster_cache.sqlite")
+    mocker.patch("agenda_cultural.backend.services.tmdb_service.poster_cache", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def fast_tmdb_retries(mocker):
+    """
+    Fixture global: limitador sin esperas y reintentos inmediatos para TMDB,
+    para que los tests de errores no duerman el backoff real.
+    """
+    from agenda_cultural.backend.services.tmdb_service import RetryPolicy, TokenBucket
+
+    mocker.patch(
+        "agenda_cultural.backend.services.tmdb_service.rate_limiter",
+        TokenBucket(rate=1000, capacity=1000),
+    )
+    policy = RetryPolicy(max_retries=2, base_delay=0, max_delay=0)
+    mocker.patch("agenda_cultural.backend.services.tmdb_service.retry_policy", policy)
+    return policy
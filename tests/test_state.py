@@ -5,15 +5,18 @@ Este módulo verifica la lógica de negocio que reside en el State de Reflex.
 Se prueban dos aspectos principales:
 1. Propiedades computadas (@rx.var): Transformación de datos (agrupación por cine).
 2. Manejo de eventos (@rx.event): Carga de datos, manejo de errores y estados de carga (spinners).
+3. Los tamaños de póster de TMDB que la app lee por su cuenta para el `srcset`.
 
 Nota: Se utilizan Mocks para aislar el estado de la base de datos real.
 """
 
 from datetime import datetime
 
+from freezegun import freeze_time
 from sqlmodel import Session
 
 from agenda_cultural.backend import Movie
+from agenda_cultural.backend.services.tmdb_service import ImageConfig
 from agenda_cultural.state import State
 
 
@@ -72,8 +75,8 @@ def test_movies_by_center_groups_correctly(mocker):
 
 def test_load_movies_with_movies_in_db(session: Session, mocker):
     """
-    Happy Path: Verifica que load_movies cargue datos de la DB al estado
-    y apague el indicador de carga (is_loading).
+    Happy Path: Verifica que load_movies cargue las funciones futuras de la DB
+    al estado (no las que ya pasaron) y apague el indicador de carga (is_loading).
     """
     # === ARRANGE ===
     # Mockeamos rx.session en el módulo 'state' para interceptar la conexión
@@ -85,10 +88,17 @@ def test_load_movies_with_movies_in_db(session: Session, mocker):
         title="Avatar",
         location="cineplanet",
         center="Cineplanet",
-        date=datetime(2026, 1, 20, 18, 0),
+        date=datetime(3000, 1, 20, 18, 0),
         url="http://example.com/avatar",
     )
+    past_movie = Movie(
+        title="Toy Story",
+        location="cineplanet",
+        center="Cineplanet",
+        date=datetime(2000, 1, 20, 18, 0),
+    )
     session.add(existing_movie)
+    session.add(past_movie)
     session.commit()
 
     state = State()
@@ -99,10 +109,35 @@ def test_load_movies_with_movies_in_db(session: Session, mocker):
     state.load_movies()  # ty: ignore[call-non-callable]
 
     # === ASSERT ===
-    assert len(state.movies) == 1
+    assert [movie.title for movie in state.movies] == ["Avatar"]
     assert state.is_loading is False
 
 
+@freeze_time("2026-01-10 20:00:00")  # 15:00 en Lima
+def test_load_movies_keeps_earlier_screenings_of_today(session: Session, mocker):
+    """
+    Las funciones de hoy que ya empezaron siguen en la cartelera; las de ayer no.
+    """
+    # === ARRANGE ===
+    mocker_rx_session = mocker.patch("agenda_cultural.state.rx.session")
+    mocker_rx_session.return_value.__enter__.return_value = session
+    for title, date in [
+        ("Ayer", datetime(2026, 1, 9, 19, 0)),
+        ("Esta mañana", datetime(2026, 1, 10, 10, 0)),
+        ("Esta noche", datetime(2026, 1, 10, 19, 0)),
+    ]:
+        session.add(Movie(title=title, location="Sala", center="lum", date=date))
+    session.commit()
+
+    state = State()
+
+    # === ACT ===
+    state.load_movies()  # ty: ignore[call-non-callable]
+
+    # === ASSERT ===
+    assert [movie.title for movie in state.movies] == ["Esta mañana", "Esta noche"]
+
+
 def test_load_movies_without_movies_in_db(session: Session, mocker):
     """
     Edge Case: Verifica que el sistema maneje correctamente una base de datos vacía
@@ -147,3 +182,38 @@ def test_load_movies_exception(mocker):
     assert state.is_loading is False
     # El error debió quedar registrado en los logs
     mock_logger.error.assert_called_once()
+
+
+def test_load_poster_sizes_feeds_poster_srcsets(mocker):
+    """
+    La app lee la configuración de imágenes que guardó su backend (sin consultar
+    TMDB al cargar la página) y el `srcset` de los pósters usa esos tamaños.
+    """
+    # === ARRANGE ===
+    mocker.patch(
+        "agenda_cultural.state.load_image_config",
+        return_value=ImageConfig(
+            base_url="https://cdn.tmdb/", poster_sizes=["w154", "w342", "w780"]
+        ),
+    )
+    state = State()
+    state.movies = [
+        Movie(
+            title="Wall-E",
+            location="LUM",
+            date=datetime(3000, 1, 1),
+            center="lum",
+            poster_url="https://image.tmdb.org/t/p/w342/walle.jpg",
+            poster_path="/walle.jpg",
+        )
+    ]
+
+    # === ACT ===
+    state.load_poster_sizes()  # ty: ignore[call-non-callable]
+
+    # === ASSERT ===
+    assert state.poster_srcsets == {
+        "https://image.tmdb.org/t/p/w342/walle.jpg": (
+            "https://cdn.tmdb/w154/walle.jpg 154w, https://cdn.tmdb/w342/walle.jpg 342w"
+        )
+    }